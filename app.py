@@ -1,17 +1,71 @@
+import os
+import time
+import importlib
 from flask import Flask
-from src.controllers.unzip_controller import unzip_bp
-from src.controllers.file_filter_controller import filter_bp
-from src.controllers.extraction_controller import dataset_extraction_bp
-from src.controllers.dataset_processing_controller import dataset_processing_bp
 
+# (module, blueprint attribute, url_prefix). Controller modules only import Flask and light
+# services at load time; the parsing/extraction stack is imported on first use.
+BLUEPRINTS = (
+    ("src.controllers.unzip_controller", "unzip_bp", "/api"),
+    ("src.controllers.file_filter_controller", "filter_bp", None),
+    ("src.controllers.extraction_controller", "dataset_extraction_bp", None),
+    ("src.controllers.dataset_processing_controller", "dataset_processing_bp", None),
+    ("src.controllers.symbol_query_controller", "symbol_query_bp", None),
+    ("src.controllers.results_controller", "results_bp", None),
+    ("src.controllers.profiles_controller", "profiles_bp", None),
+    ("src.controllers.stats_controller", "stats_bp", None),
+    ("src.controllers.views_controller", "views_bp", None),
+)
 
+# Modules that are deferred until first use. Preloading them before the WSGI server forks
+# its workers lets every worker share the already-imported code.
+HEAVY_MODULES = (
+    "src.services.extraction_service",
+    "src.services.stats_service",
+)
 
-app = Flask(__name__)
-app.register_blueprint(unzip_bp, url_prefix="/api")
-app.register_blueprint(filter_bp)
-app.register_blueprint(dataset_extraction_bp)
-app.register_blueprint(dataset_processing_bp)
+
+def preload_heavy_modules():
+    """
+    Imports HEAVY_MODULES eagerly and returns the import time of each in seconds.
+    """
+    timings = {}
+    for module_name in HEAVY_MODULES:
+        start = time.perf_counter()
+        importlib.import_module(module_name)
+        timings[module_name] = time.perf_counter() - start
+    return timings
+
+
+def create_app(preload=None):
+    """
+    Builds the Flask application.
+
+    Params:
+      preload (bool): Import HEAVY_MODULES before returning. Defaults to the APP_PRELOAD
+                      environment variable ("1" to enable).
+
+    Setting the APP_PROFILING environment variable to "1" enables on-demand request profiling
+    (X-Profile: 1 header or ?profile=1, results under /api/profiles).
+
+    The time spent building the app is stored in app.config["STARTUP_SECONDS"] and the
+    per-module preload cost in app.config["PRELOAD_SECONDS"].
+    """
+    start = time.perf_counter()
+    if preload is None:
+        preload = os.environ.get("APP_PRELOAD", "0") == "1"
+
+    app = Flask(__name__)
+    app.config["PROFILING_ENABLED"] = os.environ.get("APP_PROFILING", "0") == "1"
+    for module_name, blueprint_name, url_prefix in BLUEPRINTS:
+        blueprint = getattr(importlib.import_module(module_name), blueprint_name)
+        app.register_blueprint(blueprint, url_prefix=url_prefix)
+
+    app.config["PRELOAD_SECONDS"] = preload_heavy_modules() if preload else {}
+    app.config["STARTUP_SECONDS"] = time.perf_counter() - start
+    app.logger.info("App created in %.3fs (preload=%s)", app.config["STARTUP_SECONDS"], preload)
+    return app
 
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    create_app().run(debug=os.environ.get("FLASK_DEBUG", "0") == "1")
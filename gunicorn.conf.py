@@ -0,0 +1,9 @@
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "600"))  # Extraction requests can be long-running
+
+# Load the app (and its heavy modules, see APP_PRELOAD) once in the master before forking workers
+preload_app = True
+raw_env = ["APP_PRELOAD=" + os.environ.get("APP_PRELOAD", "1")]
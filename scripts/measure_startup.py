@@ -0,0 +1,58 @@
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+TOP_N = 15  # Number of most expensive imports to report
+
+STARTUP_SNIPPET = (
+    "import time; t = time.perf_counter(); "
+    "from app import create_app; app = create_app(preload={preload}); "
+    "print(time.perf_counter() - t)"
+)
+
+
+def measure(preload):
+    """
+    Starts a fresh interpreter that builds the app with `-X importtime` and returns the
+    wall-clock startup time and the cumulative import cost of the most expensive modules.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_SNIPPET.format(preload=preload)],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    imports = []
+    for line in completed.stderr.splitlines():
+        # Format: "import time: <self us> | <cumulative us> | <indented module name>"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        imports.append({
+            "module": module.strip(),
+            "top_level": len(module) - len(module.lstrip()) == 3,  # Nesting adds two spaces per level
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+
+    top_level = [
+        {key: entry[key] for key in ("module", "cumulative_ms")}
+        for entry in imports if entry["top_level"]
+    ]
+    return {
+        "preload": preload,
+        "startup_seconds": float(completed.stdout.strip().splitlines()[-1]),
+        "total_import_ms": round(sum(entry["self_ms"] for entry in imports), 3),
+        "slowest_imports": sorted(top_level, key=lambda entry: entry["cumulative_ms"], reverse=True)[:TOP_N],
+    }
+
+
+def main():
+    """
+    Reports app startup time and import cost with and without preloading the heavy modules.
+    """
+    result = {"lazy": measure(False), "preloaded": measure(True)}
+    print(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    main()
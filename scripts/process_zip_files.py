@@ -1,8 +1,12 @@
 import os
+import sys
 import zipfile
 import json
-import boto3
-import PyPDF2
+
+# Ensure the script can locate project modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROSTER_PATH = 'data/roster.csv'  # Names, Andrew IDs and emails to scrub from the pairs (optional)
 
 def unzip_repository(zip_file_path, extract_dir):
     with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
@@ -19,6 +23,8 @@ def extract_data_from_pdf(file_path):
     Returns:
         str: The extracted text, or an empty string if extraction fails.
     """
+    import PyPDF2
+
     extracted_data = ""
     try:
         # Use strict=False to be more lenient with PDF parsing.
@@ -86,7 +92,16 @@ def collect_repos_data(parent_dir, filenames=None):
     
     return data_list, pdf_data_list
 
-def pair_code_with_feedback(code_files, feedback):
+def pair_code_with_feedback(code_files, feedback, roster=None):
+    """
+    Pairs each repository's code with its feedback. Unless roster is None, both sides are first
+    scrubbed of student emails, IDs, @author names and the roster's identifiers, in parallel.
+    """
+    if roster is not None:
+        from src.services.pii_scrub_service import scrub_texts
+        code_files = scrub_texts(code_files, roster)
+        feedback = scrub_texts(feedback, roster)
+
     paired_data = []
     for code, fb in zip(code_files, feedback):
         paired_data.append({'code': code, 'feedback': fb})
@@ -98,73 +113,89 @@ def convert_to_jsonl(paired_data):
         jsonl_data += json.dumps(data) + '\n'
     return jsonl_data
 
-def upload_to_s3(bucket_name, file_name, data):
-    s3 = boto3.client('s3')
-    s3.put_object(Body=data, Bucket=bucket_name, Key=file_name)
+def upload_to_s3(bucket_name, file_name, dataset_file_path):
+    """
+    Streams the dataset file to s3://bucket_name/file_name with concurrent multipart uploads,
+    without loading it into memory.
+    """
+    from src.services.storage_service import S3Storage
+
+    return S3Storage(bucket_name).upload_file(dataset_file_path, file_name)
+
+def main():
+    """
+    Builds data/dataset.jsonl from data/raw/submissions.zip by pairing each repository's code with its
+    (PII-scrubbed) PDF feedback. Worker processes used for scrubbing re-import this module, so the
+    steps only run under the __main__ guard.
+    """
+    # Step 1: Unzip repository
+    zip_file_path = 'data/raw/submissions.zip'
+    extract_dir = 'data/raw/'
+    unzip_repository(zip_file_path, extract_dir)
+
+    code_directory = 'data/raw/extracted' 
 
-# Step 1: Unzip repository
-zip_file_path = 'data/raw/submissions.zip'
-extract_dir = 'data/raw/'
-unzip_repository(zip_file_path, extract_dir)
+    # Step 2: Extract nested zip files
+    nested_zip_files = []
+    for root, dirs, files in os.walk(code_directory):
+        for file in files:
+            if file.endswith('.zip'):
+                nested_zip_files.append(os.path.join(root, file))
+                extract_dir = os.path.dirname(os.path.join(root, file))
+                unzip_repository(os.path.join(root, file), extract_dir)
 
-code_directory = 'data/raw/extracted' 
+    for zip_file_path in nested_zip_files:
+        extract_dir = os.path.splitext(zip_file_path)[0]
+        unzip_repository(zip_file_path, extract_dir)
 
-# Step 2: Extract nested zip files
-nested_zip_files = []
-for root, dirs, files in os.walk(code_directory):
-    for file in files:
-        if file.endswith('.zip'):
-            nested_zip_files.append(os.path.join(root, file))
-            extract_dir = os.path.dirname(os.path.join(root, file))
-            unzip_repository(os.path.join(root, file), extract_dir)
 
-for zip_file_path in nested_zip_files:
-    extract_dir = os.path.splitext(zip_file_path)[0]
-    unzip_repository(zip_file_path, extract_dir)
+    # Step 3: Remove zip files
+    for zip_file_path in nested_zip_files:
+        os.remove(zip_file_path)
 
+    # Step 4: Read code files
+    code_files_with_comments = collect_repos_data(code_directory, 
+                                    filenames=['UserService.java', 'UserOperations.java', 'CyclomaticComplexityVisitor.java',]), 
 
-# Step 3: Remove zip files
-for zip_file_path in nested_zip_files:
-    os.remove(zip_file_path)
+    print (code_files_with_comments[0][0])
+    print (code_files_with_comments[0][1])
 
-# Step 4: Read code files
-code_files_with_comments = collect_repos_data(code_directory, 
-                                filenames=['UserService.java', 'UserOperations.java', 'CyclomaticComplexityVisitor.java',]), 
+    # Step 5: Pair code with feedback
+    #TODO: Combine datapoints with single line feedback (5/5)
+    from src.services.pii_scrub_service import load_roster
+    roster = load_roster(ROSTER_PATH) if os.path.exists(ROSTER_PATH) else []
+    paired_data = pair_code_with_feedback(code_files_with_comments[0][0], code_files_with_comments[0][1], roster)
 
-print (code_files_with_comments[0][0])
-print (code_files_with_comments[0][1])
+    # def convert_to_json_array(input_dict):
+    #     """
+    #     Converts a dictionary containing 'code' and 'feedback' into a JSON array format.
 
-# Step 5: Pair code with feedback
-#TODO: Combine datapoints with single line feedback (5/5)
-paired_data = pair_code_with_feedback(code_files_with_comments[0][0], code_files_with_comments[0][1])
+    #     :param input_dict: Dictionary with 'code' and 'feedback' pairs.
+    #     :return: JSON array as a string.
+    #     """
+    #     json_list = [{"code": input_dict["code"], "feedback": input_dict["feedback"]}]
+    #     return json.dumps(json_list, indent=4)
 
-# def convert_to_json_array(input_dict):
-#     """
-#     Converts a dictionary containing 'code' and 'feedback' into a JSON array format.
-    
-#     :param input_dict: Dictionary with 'code' and 'feedback' pairs.
-#     :return: JSON array as a string.
-#     """
-#     json_list = [{"code": input_dict["code"], "feedback": input_dict["feedback"]}]
-#     return json.dumps(json_list, indent=4)
+    # json_output = convert_to_json_array(paired_data)
 
-# json_output = convert_to_json_array(paired_data)
 
+    # Step 6: Convert to JSON
+    jsonl_data = convert_to_jsonl(paired_data)
 
-# Step 6: Convert to JSON
-jsonl_data = convert_to_jsonl(paired_data)
 
+    # Step 7: Create dataset file
+    dataset_file_path = 'data/dataset.jsonl'
+    with open(dataset_file_path, 'w') as f:
+        f.write(jsonl_data)
 
-# Step 7: Create dataset file
-dataset_file_path = 'data/dataset.jsonl'
-with open(dataset_file_path, 'w') as f:
-    f.write(jsonl_data)
 
 
+    # Step 7: Upload to S3
+    # bucket_name = 'your-s3-bucket-name'
+    # file_name = 'dataset.jsonl'
+    # upload_to_s3(bucket_name, file_name, dataset_file_path)
 
-# Step 7: Upload to S3
-# bucket_name = 'your-s3-bucket-name'
-# file_name = 'dataset.jsonl'
-# upload_to_s3(bucket_name, file_name, jsonl_data)
+    # Step 6: Fine-tune
 
-# Step 6: Fine-tune
+if __name__ == "__main__":
+    main()
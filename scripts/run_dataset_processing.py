@@ -4,6 +4,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 from src.services.dataset_processing_service import process_dataset
+from src.services.storage_service import get_storage
 
 # Add project root to sys.path so that imports work correctly
 sys.path.append(str(Path(__file__).resolve().parent.parent))
@@ -13,9 +14,13 @@ INPUT_FILE = "data/divisioned/unprocessed_dataset.jsonl"  # Path to the unproces
 DATASET_DIVISION = "method"  # Options: "file", "method", or "class"
 FILTER = ("out", ['getId', 'setId', 'getUsername', 'setUsername', 'getAge', 'setAge', 'toString'])  # Tuple: (filter_type, list of filters)
 DESTINATION_FOLDER = "data/processed"  # Folder to store the processed dataset
+FEATURE_THRESHOLDS = None  # e.g. {"cyclomatic_complexity": {"min": 2}, "is_trivial": {"max": 0}} (method/class only)
+WORKERS = None  # Processes to filter with; set > 1 to split large local inputs into parallel byte ranges
+# Paths above are resolved against DATASET_STORAGE_URI (local directory or s3://bucket/prefix, default ".")
 
 def main():
-    processed_dataset_path = process_dataset(INPUT_FILE, DATASET_DIVISION, FILTER, DESTINATION_FOLDER)
+    processed_dataset_path = process_dataset(INPUT_FILE, DATASET_DIVISION, FILTER, DESTINATION_FOLDER, storage=get_storage(), workers=WORKERS,
+                                             feature_thresholds=FEATURE_THRESHOLDS)
     result = {
         "message": "Processed dataset created successfully.",
         "processed_dataset_path": processed_dataset_path
@@ -0,0 +1,36 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Ensure the script can locate project modules
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.services.stats_service import dataset_stats, compute_dataset_stats
+
+DATASETS = {
+    "unprocessed": "data/divisioned/unprocessed_dataset.jsonl",
+    "processed": "data/processed/processed_dataset.jsonl",
+}
+
+def main():
+    """
+    Prints statistics of a dataset JSONL file (counts per division and submission, length and
+    line-count distributions, top names, duplicate rates) computed in one streaming pass.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("dataset", nargs="?", default="unprocessed",
+                        help="'unprocessed', 'processed' or a path to any dataset JSONL file")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute instead of using the cached report")
+    args = parser.parse_args()
+
+    dataset_file = Path(DATASETS.get(args.dataset, args.dataset))
+    if not dataset_file.exists():
+        print(f"Dataset not found: {dataset_file}")
+        return
+
+    stats = compute_dataset_stats(dataset_file) if args.no_cache else dataset_stats(dataset_file)
+    print(json.dumps(stats, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import os
 import sys
 import json
 from pathlib import Path
@@ -5,6 +6,9 @@ sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 
 from src.services.extraction_service import extract_data_from_division
+from src.services.storage_service import get_storage, STORAGE_URI_ENV
+from src.services.pii_scrub_service import ROSTER_PATH
+from src.services.view_service import load_view
 
 # Add the project root to sys.path so that imports work correctly
 sys.path.append(str(Path(__file__).resolve().parent.parent))
@@ -13,10 +17,19 @@ sys.path.append(str(Path(__file__).resolve().parent.parent))
 SOURCE_FOLDER = "data/file_filtered"         # Folder containing the raw files to process
 DEST_FOLDER = "data/divisioned"     # Folder where dataset.jsonl will be stored
 DIVISION = "method"                  # "file" or "line" or "class" or "method"
+SCRUB_PII = True                     # Redact student emails, IDs and names (roster at ROSTER_PATH, if present)
+VIEW = None                         # Selection view to extract from (e.g. "filename"), or None for every file
 
 def main():
     # Create the dataset by extracting data based on the chosen division
-    dataset_file_path = extract_data_from_division(SOURCE_FOLDER, DIVISION, DEST_FOLDER)
+    # The dataset is always written locally; it is also uploaded when DATASET_STORAGE_URI is set
+    # (e.g. s3://bucket/prefix)
+    storage = get_storage() if os.environ.get(STORAGE_URI_ENV) else None
+    roster_path = ROSTER_PATH if Path(ROSTER_PATH).exists() else None
+    selection = load_view(VIEW)["paths"] if VIEW else None
+    dataset_file_path = extract_data_from_division(SOURCE_FOLDER, DIVISION, DEST_FOLDER, storage=storage,
+                                                   scrub_pii=SCRUB_PII, roster_path=roster_path,
+                                                   selection=selection)
     
     # Print the output in JSON format
     result = {
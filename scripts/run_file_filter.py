@@ -4,13 +4,16 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from src.services.file_filtering_service import file_name_filter, file_ext_filter
+from src.services.file_filtering_service import file_ext_filter
+from src.services.view_service import create_name_view, view_file_counts, delete_views_of
 
 # Ensure the script can locate project modules
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 # Constants
 FILTER_BY_EXTENSION = False  # Toggle between filename or file extension filtering
+VIEW_NAME = "filename"  # Filename filtering saves this selection view instead of deleting files
+PARENT_VIEW = None  # Name of a view to narrow down, or None to select from the whole folder
 
 def main():
     """
@@ -20,15 +23,18 @@ def main():
         SOURCE_FOLDER = Path("data/unzipped")  # Folder where extracted files exist
         FILTER_TYPE = "in"  # 'in' to keep only matching files, 'out' to remove them
         FILTER_LIST = [".py", ".java", ".md"]  # Modify this for file extensions or filenames
+        EXCLUDE = ["target/", "build/"]  # gitignore-style patterns never copied (subtrees are skipped)
         DEST_FOLDER = Path("data/file_filtered")  # Folder to save filtered files
-        copied_files = file_ext_filter(SOURCE_FOLDER, FILTER_LIST, FILTER_TYPE, DEST_FOLDER)
+        copied_files = file_ext_filter(SOURCE_FOLDER, FILTER_LIST, FILTER_TYPE, DEST_FOLDER, exclude=EXCLUDE)
+        delete_views_of(DEST_FOLDER)  # Their path lists described the previous contents
         filter_type_desc = "file extension"
     else:
         SOURCE_FOLDER = Path("data/file_filtered")  # Folder where extracted files exist
         FILTER_TYPE = "out"  # 'in' to keep only matching files, 'out' to remove them
         FILTER_LIST = ['Main.java', 'DatabaseDriver.java', 'PostgresDriver.java']  # Modify this for file extensions or filenames
-        copied_files = file_name_filter(SOURCE_FOLDER, FILTER_LIST, FILTER_TYPE)
-        filter_type_desc = "filename"
+        view = create_name_view(VIEW_NAME, SOURCE_FOLDER, FILTER_LIST, FILTER_TYPE, parent=PARENT_VIEW)
+        copied_files = view_file_counts(view)
+        filter_type_desc = f"filename (view {VIEW_NAME})"
 
     print(f"Filtered files based on {filter_type_desc}: {copied_files}")
 
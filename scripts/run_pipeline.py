@@ -0,0 +1,30 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Ensure the script can locate project modules
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.services.pipeline_service import load_spec, run_pipeline, CACHE_FILENAME
+
+def main():
+    """
+    Runs a YAML/JSON pipeline spec as a DAG, skipping stages whose inputs and params are unchanged.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("spec", help="Path to the pipeline spec (.yaml, .yml or .json)")
+    parser.add_argument("--cache", default=None, help=f"Stage cache file (default: <spec dir>/{CACHE_FILENAME})")
+    parser.add_argument("--workers", type=int, default=None, help="Maximum number of stages run in parallel")
+    parser.add_argument("--force", action="store_true", help="Ignore the cache and rerun every stage")
+    args = parser.parse_args()
+
+    cache_file = args.cache or Path(args.spec).resolve().parent / CACHE_FILENAME
+    results = run_pipeline(load_spec(args.spec), cache_file=cache_file, max_workers=args.workers, force=args.force)
+    print(json.dumps(results, indent=2))
+
+    if any(result["status"] in ("failed", "blocked") for result in results.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
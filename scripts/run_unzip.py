@@ -5,32 +5,36 @@ import json
 # Ensure the script can locate project modules
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from src.services.unzip_service import recursive_unzip
+from src.services.unzip_service import recursive_unzip, find_archives
+from src.services.view_service import delete_views_of
 
 # Define paths
 RAW_DATA_DIR = Path("data/raw")
 UNZIPPED_DATA_DIR = Path("data/unzipped")
+INCREMENTAL = False  # True to only extract new/changed members and remove stale ones (see recursive_unzip)
 
 def main():
     """
-    Finds all zip files in data/raw and extracts them recursively into data/extracted.
+    Finds all zip and tar archives in data/raw and extracts them recursively into data/unzipped.
     """
     # Ensure the directories exist
     RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
     UNZIPPED_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-    # Collect all zip files in data/raw
-    zip_files = list(RAW_DATA_DIR.glob("*.zip"))
+    # Collect all archives in data/raw
+    zip_files = find_archives(RAW_DATA_DIR)
 
     if not zip_files:
-        print("No zip files found in data/raw.")
+        print("No zip or tar files found in data/raw.")
         return
 
     # Perform recursive extraction
-    unzipped_files = recursive_unzip(zip_files, UNZIPPED_DATA_DIR)
+    stats = {}
+    unzipped_files = recursive_unzip(zip_files, UNZIPPED_DATA_DIR, incremental=INCREMENTAL, stats=stats)
+    delete_views_of(UNZIPPED_DATA_DIR)
 
     # Print the results in JSON format
-    result = {"unzipped_files": unzipped_files}
+    result = {"unzipped_files": unzipped_files, "stats": stats}
     print(json.dumps(result, indent=2))
 
 if __name__ == "__main__":
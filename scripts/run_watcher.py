@@ -0,0 +1,39 @@
+import sys
+import argparse
+from pathlib import Path
+
+# Ensure the script can locate project modules
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.services.ingestion_service import (
+    watch_and_ingest, DEFAULT_INGESTION_CONFIG, POLL_INTERVAL_SECONDS, SETTLE_SECONDS
+)
+
+def main():
+    """
+    Watches data/raw and incrementally ingests every new or updated submission archive:
+    unzip -> file extension filter -> filename filter -> extraction, appending to the live dataset.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--division", default=DEFAULT_INGESTION_CONFIG["division"],
+                        choices=["file", "line", "method", "class"],
+                        help="Must match the division of the live dataset being appended to")
+    parser.add_argument("--ext-filter", nargs="*", default=DEFAULT_INGESTION_CONFIG["ext_filter"][1],
+                        help="File extensions to keep")
+    parser.add_argument("--exclude-names", nargs="*", default=DEFAULT_INGESTION_CONFIG["name_filter"][1],
+                        help="File names to drop")
+    parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL_SECONDS)
+    parser.add_argument("--settle", type=float, default=SETTLE_SECONDS)
+    parser.add_argument("--no-inotify", action="store_true", help="Always poll instead of using inotify")
+    args = parser.parse_args()
+
+    config = {
+        "division": args.division,
+        "ext_filter": ("in", args.ext_filter),
+        "name_filter": ("out", args.exclude_names),
+    }
+    watch_and_ingest(config, poll_interval=args.poll_interval, settle_seconds=args.settle,
+                     use_inotify=not args.no_inotify)
+
+if __name__ == "__main__":
+    main()
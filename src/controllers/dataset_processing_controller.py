@@ -1,10 +1,12 @@
 import sys
 from pathlib import Path
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from src.services.dataset_processing_service import process_dataset
+from src.services.process_cache_service import cached_process_dataset
+from src.services.dataset_processing_service import validate_feature_thresholds
+from src.controllers.download_helpers import send_dataset
 
 INPUT_FILE = "data/divisioned/unprocessed_dataset.jsonl"  # Path to the unprocessed dataset
 DESTINATION_FOLDER = "data/processed"  # Folder where the processed dataset will be stored
@@ -19,8 +21,14 @@ def dataset_processing_controller():
       - "dataset_division": One of "file", "method", or "class".
       - "filter_type": Either "in" (keep only matching records) or "out" (remove matching records).
       - "filter_list": A list of strings to match against filenames, method names, or class names.
+      - "workers" (optional): Number of processes to filter the dataset with in parallel.
+      - "feature_thresholds" (optional, "method"/"class" only): inclusive bounds on the quality
+        features stored at extraction, e.g. {"cyclomatic_complexity": {"min": 2}, "is_trivial": {"max": 0}}.
     
-    Returns the processed dataset as a downloadable file.
+    Returns the processed dataset as a downloadable file (compressed, range-capable and
+    ETag-validated, see download_helpers.send_dataset).
+    Results are memoized per (input dataset, division, filter), so repeating a request, or sending an
+    equivalent filter list, is served from the cache; the X-Process-Cache header is "hit" or "miss".
     """
     req_data = request.get_json()
     if not req_data:
@@ -29,24 +37,49 @@ def dataset_processing_controller():
     dataset_division = req_data.get("dataset_division")
     filter_type = req_data.get("filter_type")
     filter_list = req_data.get("filter_list")
+    workers = req_data.get("workers")
+    feature_thresholds = req_data.get("feature_thresholds")
 
     if not dataset_division or dataset_division not in ["file", "method", "class"]:
         return jsonify({"error": "Invalid or missing 'dataset_division' parameter"}), 400
     if filter_type not in ["in", "out"]:
         return jsonify({"error": "Invalid filter type, must be 'in' or 'out'"}), 400
-    if not isinstance(filter_list, list):
+    if not isinstance(filter_list, list) or not all(isinstance(item, str) for item in filter_list):
         return jsonify({"error": "'filter_list' must be a list of strings"}), 400
+    if workers is not None and (not isinstance(workers, int) or isinstance(workers, bool) or workers < 1):
+        return jsonify({"error": "'workers' must be a positive integer"}), 400
+    try:
+        feature_thresholds = validate_feature_thresholds(dataset_division, feature_thresholds)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid 'feature_thresholds': {e}"}), 400
 
     try:
-        processed_dataset_path = process_dataset(
-            INPUT_FILE, dataset_division, (filter_type, filter_list), DESTINATION_FOLDER
+        if not Path(INPUT_FILE).exists():
+            return jsonify({"error": "Unprocessed dataset not found, run an extraction first"}), 404
+
+        processed_dataset_path, cache_hit = cached_process_dataset(
+            INPUT_FILE, dataset_division, (filter_type, filter_list), DESTINATION_FOLDER, workers=workers,
+            feature_thresholds=feature_thresholds
         )
         processed_file = Path(processed_dataset_path)
 
         if not processed_file.exists():
             return jsonify({"error": "Processed dataset file not found"}), 500
 
-        return send_file(processed_file, as_attachment=True, mimetype="application/jsonl")
+        response = send_dataset(processed_file, processed_file.name)
+        response.headers["X-Process-Cache"] = "hit" if cache_hit else "miss"
+        return response
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+@dataset_processing_bp.route("/api/dataset/process/download", methods=["GET"])
+def dataset_processing_download_controller():
+    """
+    Downloads the last processed dataset without reprocessing it. Supports gzip/zstd
+    Accept-Encoding, Range requests and If-None-Match against the dataset's content hash.
+    """
+    processed_file = Path(DESTINATION_FOLDER) / "processed_dataset.jsonl"
+    if not processed_file.exists():
+        return jsonify({"error": "Processed dataset file not found, run a processing request first"}), 404
+    return send_dataset(processed_file, processed_file.name)
@@ -0,0 +1,23 @@
+from pathlib import Path
+from flask import request, send_file
+
+from src.services.download_service import prepare_download
+
+def send_dataset(dataset_path, download_name):
+    """
+    Sends a JSONL dataset with content negotiation (gzip/zstd), a content-hash ETag
+    (If-None-Match -> 304) and HTTP Range support for resuming interrupted transfers.
+    """
+    path, encoding, etag = prepare_download(dataset_path, request.headers.get("Accept-Encoding"))
+    response = send_file(
+        Path(path).resolve(),
+        mimetype="application/jsonl",
+        as_attachment=True,
+        download_name=download_name,
+        conditional=True,
+        etag=etag,
+    )
+    if encoding is not None and response.status_code != 304:
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
@@ -1,10 +1,13 @@
 import sys
 from pathlib import Path
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from src.services.extraction_service import extract_data_from_division
+from src.services.symbol_index_service import SYMBOL_INDEX_PATH
+from src.services.pii_scrub_service import ROSTER_PATH
+from src.services.view_service import load_view
+from src.controllers.download_helpers import send_dataset
 
 SOURCE_FOLDER = "data/file_filtered"
 DEST_FOLDER = "data/divisioned"
@@ -17,8 +20,22 @@ def dataset_extraction_controller():
     """
     Creates a dataset by processing files from SOURCE_FOLDER.
     The request JSON should include a "division" parameter (one of: "file", "line", "method", or "class").
-    The dataset is stored in DEST_FOLDER and returned as a downloadable file.
+    Optional "parse_timeout" (seconds) and "max_file_bytes" bound the work spent on any single file.
+    For the "line" division, optional "line_frequency_threshold" and "line_sampling" ("drop" or "sample")
+    suppress boilerplate lines that repeat across the corpus.
+    The dataset is stored in DEST_FOLDER and returned as a downloadable file; the number of files
+    skipped while parsing is reported in the X-Skipped-Files header (details in skip_report.jsonl).
+    "method" and "class" extractions also refresh the symbol index queried by /api/dataset/query.
+    Every file is extracted unless "view" names a selection view, e.g. "filename" as written by
+    the filename filter in the unzip -> fileext -> filename -> extraction flow (see /api/views).
+    Views are never applied implicitly, and are deleted whenever their base folder is rewritten.
+    Student emails, labelled IDs and @author names (plus everyone in ROSTER_PATH, if present) are
+    redacted from the records unless "scrub_pii" is false.
+    The download is compressed, range-capable and ETag-validated (see download_helpers.send_dataset).
     """
+    # Deferred so that importing this blueprint does not pull in the parsing stack
+    from src.services.extraction_service import extract_data_from_division, SKIP_REPORT_FILENAME
+
     req_data = request.get_json()
     if not req_data:
         return jsonify({"error": "Missing JSON request body"}), 400
@@ -26,17 +43,65 @@ def dataset_extraction_controller():
     division = req_data.get("division")
     if not division:
         return jsonify({"error": "Missing 'division' parameter in request"}), 400
+
+    extraction_options = {}
+    for key in ("parse_timeout", "max_file_bytes"):
+        if key in req_data:
+            if not isinstance(req_data[key], (int, float)) or req_data[key] <= 0:
+                return jsonify({"error": f"'{key}' must be a positive number"}), 400
+            extraction_options[key] = req_data[key]
+    if "line_frequency_threshold" in req_data:
+        threshold = req_data["line_frequency_threshold"]
+        if not isinstance(threshold, int) or threshold <= 0:
+            return jsonify({"error": "'line_frequency_threshold' must be a positive integer"}), 400
+        extraction_options["line_frequency_threshold"] = threshold
+    if "line_sampling" in req_data:
+        if req_data["line_sampling"] not in ("drop", "sample"):
+            return jsonify({"error": "Invalid 'line_sampling', must be 'drop' or 'sample'"}), 400
+        extraction_options["line_sampling"] = req_data["line_sampling"]
+    if not isinstance(req_data.get("scrub_pii", True), bool):
+        return jsonify({"error": "'scrub_pii' must be a boolean"}), 400
+    extraction_options["scrub_pii"] = req_data.get("scrub_pii", True)
+    if extraction_options["scrub_pii"] and Path(ROSTER_PATH).exists():
+        extraction_options["roster_path"] = ROSTER_PATH
+    view_name = req_data.get("view")
+    if view_name is not None:
+        try:
+            view = load_view(view_name)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 404
+        if Path(view["base"]).resolve() != Path(SOURCE_FOLDER).resolve():
+            return jsonify({"error": f"View {view['name']} does not select from {SOURCE_FOLDER}"}), 400
+        extraction_options["selection"] = view["paths"]
     
     Path(DEST_FOLDER).mkdir(parents=True, exist_ok=True)
 
     try:
-        dataset_file_path = extract_data_from_division(SOURCE_FOLDER, division, DEST_FOLDER)
+        dataset_file_path = extract_data_from_division(
+            SOURCE_FOLDER, division, DEST_FOLDER, index_path=SYMBOL_INDEX_PATH, **extraction_options
+        )
         dataset_file = Path(dataset_file_path)
 
         if not dataset_file.exists():
             return jsonify({"error": "Dataset file not found"}), 500
 
-        return send_file(dataset_file, as_attachment=True, mimetype="application/jsonl")
+        skip_report = Path(DEST_FOLDER) / SKIP_REPORT_FILENAME
+        skipped = sum(1 for _ in skip_report.open("r", encoding="utf-8")) if skip_report.exists() else 0
+
+        response = send_dataset(dataset_file, dataset_file.name)
+        response.headers["X-Skipped-Files"] = str(skipped)
+        return response
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+@dataset_extraction_bp.route("/api/dataset/extraction/download", methods=["GET"])
+def dataset_extraction_download_controller():
+    """
+    Downloads the last extracted dataset without regenerating it. Supports gzip/zstd
+    Accept-Encoding, Range requests and If-None-Match against the dataset's content hash.
+    """
+    dataset_file = Path(DEST_FOLDER) / "unprocessed_dataset.jsonl"
+    if not dataset_file.exists():
+        return jsonify({"error": "Dataset file not found, run an extraction first"}), 404
+    return send_dataset(dataset_file, dataset_file.name)
@@ -1,43 +1,63 @@
 import sys
+import shutil
 from pathlib import Path
 from flask import Blueprint, request, jsonify
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from src.services.file_filtering_service import file_ext_filter, file_name_filter
+from src.services.file_filtering_service import file_ext_filter
+from src.services.result_set_service import store_result_set, summarize_result_set, iter_tree_files
+from src.services.view_service import create_name_view, summarize_view, view_files, delete_views_of, FILENAME_VIEW
 
 filter_bp = Blueprint("filter_bp", __name__)
 
 @filter_bp.route("/api/filter/fileext", methods=["POST"])
 def filter_file_extension():
     """
-    Clears the raw unzipped folder, then filters files in data/unzipped based on their extension.
-    Filter parameters (filter_type and filter_list) are provided in the JSON request body.
-    The filtered files are saved to data/file_filtered.
+    Clears data/file_filtered, then filters files in data/unzipped based on their extension.
+    Filter parameters (filter_type and filter_list) are provided in the JSON request body; an optional
+    "exclude" list of gitignore-style patterns (e.g. ["target/", "build/"]) drops whole subtrees.
+    The filtered files are saved to data/file_filtered, and the filename views built on top of the
+    previous contents are deleted. Answers 409 while the ingestion watcher, which also writes to
+    data/file_filtered, is running.
+    Responds with a summary of the kept files; the full list is paged through
+    /api/results/<result_id>/files.
     """
     SOURCE_FOLDER = Path("data/unzipped")
     DEST_FOLDER = Path("data/file_filtered")
 
-    if not DEST_FOLDER.exists():
-        DEST_FOLDER.mkdir(parents=True)
-    
     data = request.get_json()
     if not data:
         return jsonify({"error": "Missing JSON body"}), 400
 
     filter_type = data.get("filter_type")
     filter_list = data.get("filter_list")
+    exclude = data.get("exclude", [])
 
     if filter_type not in ["in", "out"]:
         return jsonify({"error": "Invalid filter type, must be 'in' or 'out'"}), 400
     if not isinstance(filter_list, list):
         return jsonify({"error": "filter_list must be a list"}), 400
+    if not isinstance(exclude, list):
+        return jsonify({"error": "exclude must be a list"}), 400
+    # Deferred: the ingestion stack is only needed for this check
+    from src.services.ingestion_service import watcher_running
+
+    if watcher_running():
+        return jsonify({"error": "The ingestion watcher is running; stop it before filtering"}), 409
 
     try:
-        result = file_ext_filter(SOURCE_FOLDER, filter_list, filter_type, DEST_FOLDER)
+        # Start from an empty folder so the summary only counts the files kept by this run
+        if DEST_FOLDER.exists():
+            shutil.rmtree(DEST_FOLDER)
+        DEST_FOLDER.mkdir(parents=True)
+        file_ext_filter(SOURCE_FOLDER, filter_list, filter_type, DEST_FOLDER, exclude=exclude)
+        # Views list paths of the previous data/file_filtered; re-run the filename filter to rebuild them
+        delete_views_of(DEST_FOLDER)
+        result_id = store_result_set("fileext", iter_tree_files(DEST_FOLDER), DEST_FOLDER)
         return jsonify({
             "message": "File extension filtering complete",
-            "filtered_files": result
+            "summary": summarize_result_set(result_id)
         }), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -45,8 +65,15 @@ def filter_file_extension():
 @filter_bp.route("/api/filter/filename", methods=["POST"])
 def filter_filename():
     """
-    Filters files in data/file_filtered based on the filename.
-    The filtering parameters (filter_type and filter_list) are provided in the JSON request body.
+    Filters files in data/file_filtered based on the filename, without deleting anything: the result
+    is a named selection view (a manifest of the kept paths, see view_service) that extraction
+    consumes through its "view" parameter.
+    The JSON request body provides filter_type and filter_list, and optionally:
+      - "view": name of the view to create or replace (default "filename"); pass it as the "view"
+        of an extraction to apply the filter.
+      - "parent": name of an existing view to narrow down instead of the whole folder.
+    Responds with the view and a summary of its files; the full list is paged through
+    /api/results/<result_id>/files.
     """
     SOURCE_FOLDER = Path("data/file_filtered")
     
@@ -62,11 +89,20 @@ def filter_filename():
     if not isinstance(filter_list, list):
         return jsonify({"error": "filter_list must be a list"}), 400
 
+    view_name = data.get("view", FILENAME_VIEW)
+    parent = data.get("parent")
+
+    try:
+        manifest = create_name_view(view_name, SOURCE_FOLDER, filter_list, filter_type, parent=parent)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     try:
-        result = file_name_filter(SOURCE_FOLDER, filter_list, filter_type)
+        result_id = store_result_set("filename", view_files(manifest), manifest["base"])
         return jsonify({
             "message": "Filename filtering complete",
-            "filtered_files": result
+            "view": summarize_view(manifest),
+            "summary": summarize_result_set(result_id)
         }), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
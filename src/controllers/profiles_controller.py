@@ -0,0 +1,83 @@
+import sys
+from pathlib import Path
+from flask import Blueprint, request, jsonify, send_file, current_app, g, Response
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.services.profiling_service import RequestProfile, list_profiles, profile_path, profile_report
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY_PARAM = "profile"
+
+profiles_bp = Blueprint("profiles_bp", __name__)
+
+def profiling_requested():
+    """
+    A request is profiled only when PROFILING_ENABLED is set in the app config and the caller
+    asks for it with the X-Profile: 1 header or the ?profile=1 query flag.
+    """
+    if not current_app.config.get("PROFILING_ENABLED"):
+        return False
+    return request.headers.get(PROFILE_HEADER) == "1" or request.args.get(PROFILE_QUERY_PARAM) == "1"
+
+@profiles_bp.before_app_request
+def start_request_profile():
+    if request.path.startswith("/api/profiles") or not profiling_requested():
+        return
+    g.request_profile = RequestProfile()
+    g.request_profile.start()
+
+@profiles_bp.after_app_request
+def stop_request_profile(response):
+    request_profile = g.pop("request_profile", None)
+    if request_profile is not None:
+        meta = request_profile.stop({
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+        })
+        response.headers["X-Profile-Id"] = meta["profile_id"]
+    return response
+
+@profiles_bp.teardown_app_request
+def discard_request_profile(exc):
+    # Only left over when the request failed before after_request ran
+    request_profile = g.pop("request_profile", None)
+    if request_profile is not None:
+        request_profile.stop({"method": request.method, "path": request.path, "status": 500})
+
+@profiles_bp.route("/api/profiles", methods=["GET"])
+def list_profiles_controller():
+    """
+    Lists stored request profiles, newest first.
+    """
+    if not current_app.config.get("PROFILING_ENABLED"):
+        return jsonify({"error": "Profiling is disabled"}), 404
+    return jsonify({"profiles": list_profiles()}), 200
+
+@profiles_bp.route("/api/profiles/<profile_id>", methods=["GET"])
+def download_profile_controller(profile_id):
+    """
+    Downloads a stored profile in pstats format (load with pstats, snakeviz, etc.).
+    With ?format=text, returns the top entries as text instead; "sort" and "limit" tune the report.
+    """
+    if not current_app.config.get("PROFILING_ENABLED"):
+        return jsonify({"error": "Profiling is disabled"}), 404
+
+    if request.args.get("format") == "text":
+        limit = request.args.get("limit", "50")
+        if not limit.isdigit():
+            return jsonify({"error": "'limit' must be a positive integer"}), 400
+        try:
+            report = profile_report(profile_id, sort=request.args.get("sort", "cumulative"), limit=int(limit))
+        except KeyError:
+            return jsonify({"error": "Invalid 'sort' key"}), 400
+        if report is None:
+            return jsonify({"error": "Profile not found"}), 404
+        return Response(report, mimetype="text/plain")
+
+    path = profile_path(profile_id)
+    if path is None:
+        return jsonify({"error": "Profile not found"}), 404
+    return send_file(path.resolve(), as_attachment=True, download_name=f"{profile_id}.prof",
+                     mimetype="application/octet-stream")
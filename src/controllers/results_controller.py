@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+from flask import Blueprint, request, jsonify
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.services.result_set_service import summarize_result_set, list_result_files, DEFAULT_PAGE_SIZE
+
+results_bp = Blueprint("results_bp", __name__)
+
+@results_bp.route("/api/results/<result_id>", methods=["GET"])
+def result_summary_controller(result_id):
+    """
+    Returns the summary of a stored unzip or filter result set.
+    """
+    summary = summarize_result_set(result_id)
+    if summary is None:
+        return jsonify({"error": "Result set not found"}), 404
+    return jsonify(summary), 200
+
+@results_bp.route("/api/results/<result_id>/files", methods=["GET"])
+def result_files_controller(result_id):
+    """
+    Lists the files of a stored result set one page at a time.
+    Query parameters:
+      - "cursor": the "next_cursor" value from the previous page (omit for the first page).
+      - "limit": page size (default 1000, at most 10000).
+    """
+    cursor = request.args.get("cursor")
+    limit = request.args.get("limit", DEFAULT_PAGE_SIZE)
+    if (cursor is not None and not cursor.isdigit()) or not str(limit).isdigit() or int(limit) <= 0:
+        return jsonify({"error": "'cursor' and 'limit' must be non-negative integers"}), 400
+
+    page = list_result_files(result_id, cursor=cursor, limit=int(limit))
+    if page is None:
+        return jsonify({"error": "Result set not found"}), 404
+    return jsonify(page), 200
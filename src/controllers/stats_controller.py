@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+from flask import Blueprint, request, jsonify
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+DATASETS = {
+    "unprocessed": "data/divisioned/unprocessed_dataset.jsonl",
+    "processed": "data/processed/processed_dataset.jsonl",
+}
+
+stats_bp = Blueprint("stats_bp", __name__)
+
+@stats_bp.route("/api/dataset/stats", methods=["GET"])
+def dataset_stats_controller():
+    """
+    Reports statistics of a dataset without downloading it: record counts per division and
+    submission, content length and line-count histograms and percentiles, the most common
+    names and duplicate-content rates.
+    Query parameters:
+      - "dataset": "unprocessed" (default) or "processed".
+    Reports are cached per dataset content hash ("cached" tells whether this one was).
+    """
+    # Deferred so that NumPy is only imported once stats are requested
+    from src.services.stats_service import dataset_stats
+
+    dataset = request.args.get("dataset", "unprocessed")
+    if dataset not in DATASETS:
+        return jsonify({"error": "Invalid 'dataset', must be 'unprocessed' or 'processed'"}), 400
+
+    dataset_file = Path(DATASETS[dataset])
+    if not dataset_file.exists():
+        return jsonify({"error": f"The {dataset} dataset was not found, create it first"}), 404
+
+    try:
+        return jsonify(dataset_stats(dataset_file)), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
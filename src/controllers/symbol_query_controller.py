@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+from flask import Blueprint, request, jsonify, Response
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.services.symbol_index_service import query_symbols, symbols_to_jsonl, SYMBOL_INDEX_PATH
+
+DEFAULT_LIMIT = 1000
+
+symbol_query_bp = Blueprint("symbol_query_bp", __name__)
+
+@symbol_query_bp.route("/api/dataset/query", methods=["POST"])
+def symbol_query_controller():
+    """
+    Queries the symbol index built during "method" and "class" extraction.
+    The request JSON may contain any of:
+      - "name": exact simple or qualified name (e.g. "calculateComplexity" or "Visitor.visit").
+      - "pattern": glob over the qualified name (e.g. "*Service.get*").
+      - "content": full-text query over the symbol content.
+      - "kind": "method" or "class".
+      - "submission": restrict to one submission.
+      - "limit": maximum number of matches (default 1000, null for no limit).
+      - "format": "json" (default) or "jsonl" to download the matches as a JSONL file.
+    """
+    req_data = request.get_json()
+    if not req_data:
+        return jsonify({"error": "Missing JSON request body"}), 400
+
+    criteria = {key: req_data.get(key) for key in ("name", "pattern", "content", "kind", "submission")}
+    if not any(criteria.values()):
+        return jsonify({"error": "Provide at least one of 'name', 'pattern', 'content', 'kind' or 'submission'"}), 400
+    if criteria["kind"] not in (None, "method", "class"):
+        return jsonify({"error": "Invalid 'kind', must be 'method' or 'class'"}), 400
+
+    limit = req_data.get("limit", DEFAULT_LIMIT)
+    if limit is not None and (not isinstance(limit, int) or limit <= 0):
+        return jsonify({"error": "'limit' must be a positive integer"}), 400
+
+    output_format = req_data.get("format", "json")
+    if output_format not in ("json", "jsonl"):
+        return jsonify({"error": "Invalid 'format', must be 'json' or 'jsonl'"}), 400
+
+    if not Path(SYMBOL_INDEX_PATH).exists():
+        return jsonify({"error": "Symbol index not found, run a method or class extraction first"}), 404
+
+    try:
+        symbols = query_symbols(SYMBOL_INDEX_PATH, limit=limit, **criteria)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+    if output_format == "jsonl":
+        return Response(
+            symbols_to_jsonl(symbols),
+            mimetype="application/jsonl",
+            headers={"Content-Disposition": "attachment; filename=query_results.jsonl"}
+        )
+    return jsonify({"count": len(symbols), "results": symbols}), 200
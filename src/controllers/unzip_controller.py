@@ -3,7 +3,9 @@ import shutil
 from pathlib import Path
 from flask import Blueprint, request, jsonify
 from werkzeug.utils import secure_filename
-from src.services.unzip_service import recursive_unzip
+from src.services.unzip_service import recursive_unzip, find_archives, manifest_path
+from src.services.result_set_service import store_result_set, summarize_result_set, iter_tree_files
+from src.services.view_service import delete_views_of
 
 RAW_DATA_DIR = Path("data/raw")
 UNZIPPED_DATA_DIR = Path("data/unzipped")
@@ -19,10 +21,25 @@ def clear_directory(directory: Path):
 @unzip_bp.route("/unzip", methods=["POST"])
 def unzip_controller():
     """
-    Receives a zip file via a JSON multipart/form-data request.
+    Receives a zip or tar (.tar, .tar.gz, .tar.bz2) file via a JSON multipart/form-data request.
     It clears RAW_DATA_DIR, saves the uploaded file into RAW_DATA_DIR, 
-    then recursively unzips all zip files from RAW_DATA_DIR into UNZIPPED_DATA_DIR.
+    then recursively unzips all archives from RAW_DATA_DIR into UNZIPPED_DATA_DIR.
+    Responds with a summary of the extracted files; the full list is paged through
+    /api/results/<result_id>/files.
+
+    With the form field incremental=1, UNZIPPED_DATA_DIR is kept and only members that are new
+    or changed since the last upload are extracted; members the archive no longer contains are
+    removed. The response then also carries the extracted/unchanged/removed counts.
+    Either way, selection views over UNZIPPED_DATA_DIR are deleted since it was rewritten.
+    Answers 409 while the ingestion watcher (scripts/run_watcher.py) runs, as it reads RAW_DATA_DIR
+    and writes into UNZIPPED_DATA_DIR.
     """
+    # Deferred: the ingestion stack is only needed for this check
+    from src.services.ingestion_service import watcher_running
+
+    if watcher_running():
+        return jsonify({"error": "The ingestion watcher is running; stop it before uploading"}), 409
+
     if "file" not in request.files:
         return jsonify({"error": "No file part in the request"}), 400
 
@@ -34,21 +51,34 @@ def unzip_controller():
         RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
     clear_directory(RAW_DATA_DIR)
 
+    incremental = request.form.get("incremental", "0").lower() in ("1", "true")
     if not UNZIPPED_DATA_DIR.exists():
         UNZIPPED_DATA_DIR.mkdir(parents=True, exist_ok=True)
-    clear_directory(UNZIPPED_DATA_DIR)
+    if not incremental:
+        clear_directory(UNZIPPED_DATA_DIR)
+        # The manifest describes the cleared tree; a stale one would make the next incremental
+        # upload compute removals from files that no longer exist
+        manifest_path(UNZIPPED_DATA_DIR).unlink(missing_ok=True)
 
     filename = secure_filename(uploaded_file.filename)
     save_path = RAW_DATA_DIR / filename
     uploaded_file.save(str(save_path))
 
-    zip_files = list(RAW_DATA_DIR.glob("*.zip"))
+    zip_files = find_archives(RAW_DATA_DIR)
     if not zip_files:
-        return jsonify({"error": "No zip files found in RAW_DATA_DIR"}), 400
+        return jsonify({"error": "No zip or tar files found in RAW_DATA_DIR"}), 400
 
-    unzipped_files = recursive_unzip(zip_files, UNZIPPED_DATA_DIR)
+    stats = {"extracted": 0, "unchanged": 0, "removed": 0}
+    recursive_unzip(zip_files, UNZIPPED_DATA_DIR, incremental=incremental, stats=stats)
+    delete_views_of(UNZIPPED_DATA_DIR)
+    # Summarize the whole tree: recursive_unzip only returns the top-level members, not the
+    # contents of nested per-student archives
+    result_id = store_result_set("unzip", iter_tree_files(UNZIPPED_DATA_DIR), UNZIPPED_DATA_DIR)
 
-    return jsonify({
+    response = {
         "message": "Unzipping completed successfully.",
-        "unzipped_files": unzipped_files
-    }), 200
+        "summary": summarize_result_set(result_id)
+    }
+    if incremental:
+        response["incremental"] = stats
+    return jsonify(response), 200
@@ -0,0 +1,39 @@
+import sys
+from pathlib import Path
+from flask import Blueprint, jsonify
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.services.view_service import list_views, load_view, delete_view, summarize_view
+
+views_bp = Blueprint("views_bp", __name__)
+
+@views_bp.route("/api/views", methods=["GET"])
+def list_views_controller():
+    """
+    Lists the selection views created by filename filtering, newest first.
+    """
+    return jsonify({"views": list_views()}), 200
+
+@views_bp.route("/api/views/<name>", methods=["GET"])
+def view_controller(name):
+    """
+    Returns a view's summary (base folder, parent view, filter and number of files).
+    """
+    try:
+        return jsonify(summarize_view(load_view(name))), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+
+@views_bp.route("/api/views/<name>", methods=["DELETE"])
+def delete_view_controller(name):
+    """
+    Deletes a view. The files it selected are untouched, so this fully reverts the filter.
+    """
+    try:
+        deleted = delete_view(name)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not deleted:
+        return jsonify({"error": f"View not found: {name}"}), 404
+    return jsonify({"message": f"View {name} deleted"}), 200
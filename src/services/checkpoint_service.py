@@ -0,0 +1,149 @@
+import os
+import json
+import time
+from pathlib import Path
+
+CHECKPOINT_EVERY_FILES = 100
+CHECKPOINT_EVERY_SECONDS = 30
+
+
+class CheckpointedWriter:
+    """
+    Writes a JSONL dataset in resumable, atomically committed form.
+
+    Records go to <dataset>.partial. After every completed source file the writer may checkpoint:
+    it fsyncs the partial output and an append-only log of completed files (<dataset>.done), then
+    atomically records both byte offsets in <dataset>.checkpoint.json. On a clean exit the partial
+    file is moved over the dataset with os.replace, so the dataset is never left truncated.
+
+    If a run dies, the next writer opened with the same key truncates the partial output back to
+    the last checkpoint and reports already completed files through is_done(), so the caller only
+    processes the rest. A different key (e.g. other division or changed sources) starts over.
+
+    Params:
+      dataset_file (str or Path): Final dataset path.
+      key (dict): JSON-serializable description of the run; must match for a resume.
+      resume (bool): Set to False to always start over.
+      finalize (callable): Optional finalize(partial_file, dataset_file) that writes the dataset
+          from the complete partial output (e.g. PII scrubbing) instead of a plain rename. It
+          runs after a final checkpoint, so if it dies the next run only repeats finalize.
+    """
+
+    def __init__(self, dataset_file, key, resume=True, every_files=CHECKPOINT_EVERY_FILES,
+                 every_seconds=CHECKPOINT_EVERY_SECONDS, finalize=None):
+        self.dataset_file = Path(dataset_file)
+        self.partial_file = self.dataset_file.with_name(self.dataset_file.name + ".partial")
+        self.done_file = self.dataset_file.with_name(self.dataset_file.name + ".done")
+        self.checkpoint_file = self.dataset_file.with_name(self.dataset_file.name + ".checkpoint.json")
+        self.key = json.loads(json.dumps(key, default=str))
+        self.resume = resume
+        self.every_files = every_files
+        self.every_seconds = every_seconds
+        self.finalize = finalize
+        self.completed = set()
+        self.resumed_files = 0
+        self._files_since_checkpoint = 0
+        self._last_checkpoint = time.monotonic()
+        self._safe_records_offset = 0
+        self._safe_done_offset = 0
+
+    def __enter__(self):
+        checkpoint = self._load_checkpoint() if self.resume else None
+        if checkpoint is None:
+            for path in (self.partial_file, self.done_file, self.checkpoint_file):
+                path.unlink(missing_ok=True)
+            records_offset = done_offset = 0
+        else:
+            records_offset, done_offset = checkpoint["records_offset"], checkpoint["done_offset"]
+            # Drop anything written after the last checkpoint
+            for path, offset in ((self.partial_file, records_offset), (self.done_file, done_offset)):
+                with path.open("r+b") as f:
+                    f.truncate(offset)
+            with self.done_file.open("r", encoding="utf-8") as f:
+                self.completed = {line.rstrip("\n") for line in f if line.strip()}
+            self.resumed_files = len(self.completed)
+
+        self._records = self.partial_file.open("ab")
+        self._done = self.done_file.open("ab")
+        self._safe_records_offset = records_offset
+        self._safe_done_offset = done_offset
+        return self
+
+    def _load_checkpoint(self):
+        if not (self.checkpoint_file.exists() and self.partial_file.exists() and self.done_file.exists()):
+            return None
+        try:
+            with self.checkpoint_file.open("r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if checkpoint.get("key") != self.key:
+            return None
+        if self.partial_file.stat().st_size < checkpoint["records_offset"] \
+                or self.done_file.stat().st_size < checkpoint["done_offset"]:
+            return None
+        return checkpoint
+
+    def is_done(self, relative_path):
+        return str(relative_path) in self.completed
+
+    def write(self, line):
+        self._records.write(line.encode("utf-8"))
+
+    def file_done(self, relative_path):
+        """
+        Marks a source file as fully written; checkpoints when the file or time budget is reached.
+        """
+        relative_path = str(relative_path)
+        self.completed.add(relative_path)
+        self._done.write((relative_path + "\n").encode("utf-8"))
+        self._safe_records_offset = self._records.tell()
+        self._safe_done_offset = self._done.tell()
+        self._files_since_checkpoint += 1
+        if self._files_since_checkpoint >= self.every_files \
+                or time.monotonic() - self._last_checkpoint >= self.every_seconds:
+            self.checkpoint()
+
+    def checkpoint(self):
+        for f in (self._records, self._done):
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_file = self.checkpoint_file.with_name(self.checkpoint_file.name + ".tmp")
+        with tmp_file.open("w", encoding="utf-8") as f:
+            json.dump({
+                "key": self.key,
+                "records_offset": self._safe_records_offset,
+                "done_offset": self._safe_done_offset,
+                "completed_files": len(self.completed),
+            }, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.checkpoint_file)
+        self._files_since_checkpoint = 0
+        self._last_checkpoint = time.monotonic()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            # Keep progress up to the last completed file for the next run
+            try:
+                self.checkpoint()
+            finally:
+                self._records.close()
+                self._done.close()
+            return False
+
+        if self.finalize is None:
+            self._records.flush()
+            os.fsync(self._records.fileno())
+            self._records.close()
+            self._done.close()
+            os.replace(self.partial_file, self.dataset_file)
+        else:
+            self.checkpoint()
+            self._records.close()
+            self._done.close()
+            self.finalize(self.partial_file, self.dataset_file)
+            self.partial_file.unlink(missing_ok=True)
+        self.done_file.unlink(missing_ok=True)
+        self.checkpoint_file.unlink(missing_ok=True)
+        return False
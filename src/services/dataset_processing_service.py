@@ -1,73 +1,215 @@
+import os
 import json
+import mmap
+import shutil
+import tempfile
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
-def process_dataset(input_filepath, dataset_division, filter_tuple, destination_folder):
+from src.services.storage_service import LocalStorage
+from src.services.profiling_service import worker_profile_dir, run_profiled
+
+DATASET_DIVISIONS = ("file", "method", "class")
+MIN_RANGE_BYTES = 8 * 1024 * 1024  # Smaller inputs are not worth splitting further
+
+def process_dataset(input_filepath, dataset_division, filter_tuple, destination_folder, storage=None, workers=None,
+                    feature_thresholds=None):
     """
     Processes an unprocessed dataset JSONL file and filters the data based on the dataset_division and filter.
-    
+
     Args:
         input_filepath (str or Path): Path to the unprocessed dataset file (JSONL format).
         dataset_division (str): One of "file", "method", or "class".
         filter_tuple (tuple): Tuple of (filter_type, filters), where filter_type is either 'in' or 'out'
                               and filters is a list of strings for matching.
         destination_folder (str or Path): Folder where the processed dataset will be stored.
-    
+        storage: Storage backend (see storage_service) that input_filepath and destination_folder
+                 refer to. Defaults to the local filesystem.
+        workers (int): With more than one worker and local storage, the input is split into
+                       newline-aligned byte ranges that are filtered in parallel processes
+                       (see process_dataset_parallel). The output is identical to the serial path.
+        feature_thresholds (dict): Optional bounds on the quality features stored by method and class
+                                   extraction, e.g. {"cyclomatic_complexity": {"min": 2}, "is_trivial": {"max": 0}}.
+                                   Bounds are inclusive and booleans compare as 0/1. Records without
+                                   the feature are dropped.
+
     Returns:
-        str: The path to the processed dataset file.
+        str: The path (or URI) to the processed dataset file.
     """
     filter_type, filters = filter_tuple
     if filter_type not in ['in', 'out']:
         raise ValueError("filter_type must be either 'in' or 'out'.")
+    if dataset_division not in DATASET_DIVISIONS:
+        raise ValueError("dataset_division must be one of 'file', 'method', or 'class'.")
+    feature_thresholds = validate_feature_thresholds(dataset_division, feature_thresholds)
+
+    storage = storage or LocalStorage()
+    output_key = Path(destination_folder) / "processed_dataset.jsonl"
 
-    input_filepath = Path(input_filepath)
-    destination_folder = Path(destination_folder)
-    destination_folder.mkdir(parents=True, exist_ok=True)
-    output_filepath = destination_folder / "processed_dataset.jsonl"
+    if workers is not None and workers > 1 and isinstance(storage, LocalStorage):
+        return process_dataset_parallel(
+            storage.path(input_filepath), dataset_division, filter_tuple, storage, output_key, workers,
+            feature_thresholds
+        )
 
-    with input_filepath.open("r", encoding="utf-8") as infile, output_filepath.open("w", encoding="utf-8") as outfile:
+    filters = set(filters)
+    with storage.open_read(input_filepath, encoding="utf-8") as infile, \
+            storage.open_write(output_key, encoding="utf-8") as outfile:
         for line in infile:
             try:
                 record = json.loads(line)
             except json.JSONDecodeError:
                 continue
 
-            keep = False
-
-            if dataset_division == "file":
-                # Expected record format: {"filepath": ..., "filename": ..., "content": ...}
-                filename = record.get("filename", "")
-                if filter_type == "in":
-                    if filename in filters:
-                        keep = True
-                else:  # filter_type == "out"
-                    if filename not in filters:
-                        keep = True
-
-            elif dataset_division == "method":
-                # Expected record format: {"filepath": ..., "method": {"name": ..., "content": ...}}
-                method = record.get("method", {})
-                method_name = method.get("name", "")
-                if filter_type == "in":
-                    if method_name in filters:
-                        keep = True
-                else:  # filter_type == "out"
-                    if method_name not in filters:
-                        keep = True
-
-            elif dataset_division == "class":
-                # Expected record format: {"filepath": ..., "class": {"name": ..., "content": ...}}
-                cls = record.get("class", {})
-                class_name = cls.get("name", "")
-                if filter_type == "in":
-                    if class_name in filters:
-                        keep = True
-                else:  # filter_type == "out"
-                    if class_name not in filters:
-                        keep = True
-            else:
-                raise ValueError("dataset_division must be one of 'file', 'method', or 'class'.")
-
-            if keep:
+            if record_passes_filter(record, dataset_division, filter_type, filters) \
+                    and record_meets_thresholds(record, dataset_division, feature_thresholds):
                 outfile.write(json.dumps(record) + "\n")
 
-    return str(output_filepath)
+    return storage.uri(output_key)
+
+
+def record_passes_filter(record, dataset_division, filter_type, filters):
+    """
+    Returns True if the record should be kept for the given division and (filter_type, filters).
+    """
+    if dataset_division == "file":
+        # Expected record format: {"filepath": ..., "filename": ..., "content": ...}
+        name = record.get("filename", "")
+    elif dataset_division == "method":
+        # Expected record format: {"filepath": ..., "method": {"name": ..., "content": ...}}
+        name = record.get("method", {}).get("name", "")
+    elif dataset_division == "class":
+        # Expected record format: {"filepath": ..., "class": {"name": ..., "content": ...}}
+        name = record.get("class", {}).get("name", "")
+    else:
+        raise ValueError("dataset_division must be one of 'file', 'method', or 'class'.")
+
+    if filter_type == "in":
+        return name in filters
+    return name not in filters  # filter_type == "out"
+
+
+def validate_feature_thresholds(dataset_division, feature_thresholds):
+    """
+    Checks a {feature: {"min": number, "max": number}} mapping and returns it (None when empty).
+    """
+    # Deferred: quality_service pulls in the Java parser, which plain filtering does not need
+    from src.services.quality_service import QUALITY_FEATURES
+
+    if not feature_thresholds:
+        return None
+    if not isinstance(feature_thresholds, dict):
+        raise ValueError("feature thresholds must map feature names to bounds.")
+    if dataset_division not in ("method", "class"):
+        raise ValueError("feature thresholds only apply to the 'method' and 'class' divisions.")
+    for feature, bounds in feature_thresholds.items():
+        if feature not in QUALITY_FEATURES:
+            raise ValueError(f"Unknown feature '{feature}', must be one of {', '.join(QUALITY_FEATURES)}.")
+        if not isinstance(bounds, dict) or not bounds or set(bounds) - {"min", "max"}:
+            raise ValueError(f"Bounds of '{feature}' must be an object with 'min' and/or 'max'.")
+        for value in bounds.values():
+            if not isinstance(value, (int, float)):
+                raise ValueError(f"Bounds of '{feature}' must be numbers.")
+    return feature_thresholds
+
+
+def record_meets_thresholds(record, dataset_division, feature_thresholds):
+    """
+    Returns True if the record's stored quality features are within feature_thresholds.
+    Only the "features" field is read, never the content.
+    """
+    if not feature_thresholds:
+        return True
+    symbol = record.get(dataset_division)
+    features = symbol.get("features") if isinstance(symbol, dict) else None
+    if not features:
+        return False
+    for feature, bounds in feature_thresholds.items():
+        value = features.get(feature)
+        if value is None:
+            return False
+        if "min" in bounds and value < bounds["min"]:
+            return False
+        if "max" in bounds and value > bounds["max"]:
+            return False
+    return True
+
+
+def split_byte_ranges(input_path, parts):
+    """
+    Splits a file into at most `parts` contiguous (start, end) byte ranges whose boundaries
+    fall just after a newline, so every line belongs to exactly one range.
+    """
+    size = os.path.getsize(input_path)
+    if size == 0:
+        return []
+    parts = max(1, min(parts, -(-size // MIN_RANGE_BYTES)))
+    boundaries = [0]
+    with open(input_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for i in range(1, parts):
+            newline = mm.find(b"\n", max(size * i // parts, boundaries[-1]))
+            if newline == -1 or newline + 1 >= size:
+                break
+            if newline + 1 > boundaries[-1]:
+                boundaries.append(newline + 1)
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def filter_byte_range(input_path, start, end, dataset_division, filter_tuple, part_path, feature_thresholds=None):
+    """
+    Worker: filters the lines in [start, end) of input_path, read through mmap so only the
+    path and offsets cross the process boundary, and writes the kept records to part_path.
+
+    Returns:
+        int: Number of records kept.
+    """
+    filter_type, filters = filter_tuple
+    filters = set(filters)
+    kept = 0
+    with open(input_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+            open(part_path, "w", encoding="utf-8") as outfile:
+        mm.seek(start)
+        while mm.tell() < end:
+            line = mm.readline()
+            try:
+                record = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            if record_passes_filter(record, dataset_division, filter_type, filters) \
+                    and record_meets_thresholds(record, dataset_division, feature_thresholds):
+                outfile.write(json.dumps(record) + "\n")
+                kept += 1
+    return kept
+
+
+def process_dataset_parallel(input_path, dataset_division, filter_tuple, storage, output_key, workers,
+                             feature_thresholds=None):
+    """
+    Parallel variant of process_dataset: filters newline-aligned byte ranges of a local input
+    file in a process pool and concatenates the per-range outputs in order. When the request is
+    profiled, each range is profiled in its worker too (see profiling_service.run_profiled).
+    """
+    ranges = split_byte_ranges(input_path, workers)
+    output_path = storage.path(output_key)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(dir=output_path.parent, prefix=".parts_") as parts_dir:
+        part_paths = [Path(parts_dir) / f"{index:05d}.jsonl" for index in range(len(ranges))]
+        profile_dir = worker_profile_dir()
+        task = (filter_byte_range,) if profile_dir is None else (run_profiled, profile_dir, filter_byte_range)
+        with ProcessPoolExecutor(max_workers=min(workers, max(1, len(ranges)))) as executor:
+            futures = [
+                executor.submit(*task, str(input_path), start, end, dataset_division,
+                                filter_tuple, str(part_path), feature_thresholds)
+                for (start, end), part_path in zip(ranges, part_paths)
+            ]
+            for future in futures:
+                future.result()
+
+        with storage.open_write(output_key) as outfile:
+            for part_path in part_paths:
+                with part_path.open("rb") as part:
+                    shutil.copyfileobj(part, outfile, 1024 * 1024)
+
+    return storage.uri(output_key)
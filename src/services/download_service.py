@@ -0,0 +1,98 @@
+import os
+import gzip
+import shutil
+import hashlib
+import tempfile
+from pathlib import Path
+
+from src.services.fingerprint_service import file_content_hash
+
+DOWNLOAD_CACHE_DIR = "data/index/downloads"
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+ENCODING_SUFFIXES = {"zstd": ".zst", "gzip": ".gz"}
+
+
+def zstd_available():
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def negotiate_encoding(accept_encoding):
+    """
+    Picks the content encoding for a download from an Accept-Encoding header: zstd when the
+    client accepts it (and zstandard, listed in requirements.txt, is importable), then gzip, else None.
+    """
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        token, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if token:
+            accepted[token.lower()] = quality
+
+    def allowed(encoding):
+        return accepted.get(encoding, accepted.get("*", 0.0)) > 0
+
+    if allowed("zstd") and zstd_available():
+        return "zstd"
+    if allowed("gzip"):
+        return "gzip"
+    return None
+
+
+def _compress(source, target, encoding):
+    with source.open("rb") as src, target.open("wb") as raw:
+        if encoding == "gzip":
+            # mtime=0 keeps the compressed bytes (and so Range offsets) stable across rebuilds
+            with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=GZIP_LEVEL, mtime=0) as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+        else:
+            import zstandard
+            with zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw, closefd=False) as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+
+
+def prepare_download(dataset_path, accept_encoding=None, cache_dir=DOWNLOAD_CACHE_DIR):
+    """
+    Resolves what to send for a dataset download.
+
+    The dataset's content hash is the ETag, so an unchanged dataset validates with 304 however
+    often it is regenerated. Compressed variants are built once per content hash in cache_dir
+    (one folder per dataset path, never next to the dataset) and reused; each encoding gets its
+    own ETag, as Range offsets refer to the encoded bytes.
+
+    Returns:
+      tuple: (path to send, content encoding or None, etag)
+    """
+    dataset_path = Path(dataset_path)
+    content_hash = file_content_hash(dataset_path)[:32]
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding is None:
+        return dataset_path, None, content_hash
+
+    path_key = hashlib.sha256(str(dataset_path.resolve()).encode("utf-8")).hexdigest()[:32]
+    variants_dir = Path(cache_dir) / path_key
+    variants_dir.mkdir(parents=True, exist_ok=True)
+    variant = variants_dir / f"{dataset_path.name}.{content_hash}{ENCODING_SUFFIXES[encoding]}"
+    if not variant.exists():
+        fd, tmp_path = tempfile.mkstemp(dir=variants_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            _compress(dataset_path, Path(tmp_path), encoding)
+            os.replace(tmp_path, variant)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        # Variants of older contents of the same dataset are no longer reachable
+        for stale in variants_dir.glob(f"{dataset_path.name}.*{ENCODING_SUFFIXES[encoding]}"):
+            if stale != variant:
+                stale.unlink(missing_ok=True)
+    return variant, encoding, f"{content_hash}-{ENCODING_SUFFIXES[encoding][1:]}"
@@ -1,10 +1,27 @@
 import os
 import json
 import ast
+import hashlib
+import shutil
 import javalang
 from pathlib import Path
 
-def extract_data_from_division(source_path, division, dest_path):
+from src.services.parse_worker_service import ParseWorkerPool, PARSE_TIMEOUT_SECONDS
+from src.services.symbol_index_service import index_dataset_file, delete_symbols_under, submission_from_filepath
+from src.services.checkpoint_service import CheckpointedWriter
+from src.services.fingerprint_service import fingerprint_paths
+from src.services.line_frequency_service import CountMinSketch, BoilerplateLineFilter
+from src.services.quality_service import java_quality_features, python_quality_features
+from src.services.pii_scrub_service import scrub_dataset_file, load_roster, PIIScrubber
+
+PARSEABLE_EXTENSIONS = (".py", ".java", ".cpp")
+MAX_PARSE_FILE_BYTES = 1024 * 1024  # Files larger than this are skipped instead of parsed
+SKIP_REPORT_FILENAME = "skip_report.jsonl"
+
+def extract_data_from_division(source_path, division, dest_path, parse_timeout=PARSE_TIMEOUT_SECONDS,
+                               max_file_bytes=MAX_PARSE_FILE_BYTES, workers=None, index_path=None, storage=None,
+                               resume=True, line_frequency_threshold=None, line_sampling="drop", scrub_pii=False,
+                               roster_path=None, selection=None):
     """
     Extracts data from source_path based on the specified division and writes a JSONL dataset
     to dest_path/dataset.jsonl. The division can be:
@@ -17,6 +34,32 @@ def extract_data_from_division(source_path, division, dest_path):
       source_path (str or Path): Directory with files (and subdirectories) to process.
       division (str): "file", "line", "method", or "class".
       dest_path (str or Path): Destination folder where dataset.jsonl will be stored.
+      parse_timeout (float): Per-file parse budget in seconds for the "method" and "class" divisions.
+      max_file_bytes (int): Files larger than this are not parsed for the "method" and "class" divisions.
+      workers (int): Number of parse worker processes (defaults to the CPU count).
+      index_path (str or Path): If given, "method" and "class" datasets are also loaded into the
+                                SQLite symbol index at this path (see symbol_index_service).
+      storage: If given, the finished (scrubbed) dataset is uploaded to this storage backend
+               (see storage_service) under the same relative path. Extraction itself always
+               reads source_path and writes dest_path on the local filesystem.
+      resume (bool): Resume an interrupted extraction of the same source and division from its last
+                     checkpoint instead of starting over (see checkpoint_service).
+      line_frequency_threshold (int): "line" division only. Lines occurring more often than this
+                                      across the corpus are treated as boilerplate.
+      line_sampling (str): "drop" removes boilerplate lines, "sample" keeps about
+                           line_frequency_threshold copies of each.
+      scrub_pii (bool): Redact emails, labelled student IDs and @author names from every record,
+                        and pseudonymize submissions in filepaths (skip report included), before
+                        the dataset is published or indexed (see pii_scrub_service).
+      roster_path (str or Path): With scrub_pii, a roster CSV whose names, Andrew IDs and emails
+                                 are redacted as well.
+      selection (list): Only extract these paths relative to source_path, e.g. the "paths" of a
+                        selection view over source_path (see view_service). Defaults to the whole tree.
+
+    The dataset is written to a partial file that is checkpointed periodically and only moved over
+    dest_path/unprocessed_dataset.jsonl once complete, so an interrupted run never leaves it truncated.
+    Files that are skipped while parsing (too large, timed out, crashed) are recorded in
+    dest_path/skip_report.jsonl.
 
     Returns:
       str: The path to the created dataset file.
@@ -25,104 +68,366 @@ def extract_data_from_division(source_path, division, dest_path):
     dest_path = Path(dest_path)
     dest_path.mkdir(parents=True, exist_ok=True)
     dataset_file = dest_path / "unprocessed_dataset.jsonl"
+    parse_options = {"timeout": parse_timeout, "max_file_bytes": max_file_bytes, "workers": workers}
+    line_options = {"line_frequency_threshold": line_frequency_threshold, "line_sampling": line_sampling}
+    skip_report = []
+    roster = (load_roster(roster_path) if roster_path else ()) if scrub_pii else None
+    finalize = pii_scrub_finalizer(roster, workers) if scrub_pii else None
+
+    write_division_dataset(source_path, division, dataset_file, skip_report, parse_options, resume, line_options,
+                           selection, finalize)
+    if scrub_pii:
+        scrub_skip_report(skip_report, PIIScrubber(roster))
+
+    write_skip_report(dest_path / SKIP_REPORT_FILENAME, skip_report)
+    if index_path is not None and division in ("method", "class"):
+        index_dataset_file(dataset_file, division, index_path)
+    if storage is not None:
+        storage.upload_file(dataset_file, dataset_file)
+    return str(dataset_file)
+
 
+def write_division_dataset(source_path, division, dataset_file, skip_report, parse_options, resume=True,
+                           line_options=None, selection=None, finalize=None):
+    """
+    Writes the JSONL dataset for one division of source_path (or of its selection) to dataset_file.
+    finalize is handed to the CheckpointedWriter (e.g. pii_scrub_finalizer).
+    """
     if division == "file":
-        create_dataset_from_files(source_path, dataset_file)
+        create_dataset_from_files(source_path, dataset_file, resume, selection=selection, finalize=finalize)
     elif division == "line":
-        create_dataset_from_lines(source_path, dataset_file)
+        create_dataset_from_lines(source_path, dataset_file, resume, selection=selection, finalize=finalize,
+                                  **(line_options or {}))
     elif division == "method":
-        create_dataset_from_methods(source_path, dataset_file)
+        create_dataset_from_methods(source_path, dataset_file, skip_report, resume, selection=selection,
+                                    finalize=finalize, **parse_options)
     elif division == "class":
-        create_dataset_from_classes(source_path, dataset_file)
+        create_dataset_from_classes(source_path, dataset_file, skip_report, resume, selection=selection,
+                                    finalize=finalize, **parse_options)
     else:
         raise ValueError(f"Unknown division: {division}")
-    return str(dataset_file)
 
 
-def create_dataset_from_files(source_path, dataset_file):
-    with dataset_file.open("w", encoding="utf-8") as out_file:
-        for root, dirs, files in os.walk(source_path):
-            for file in files:
-                file_path = Path(root) / file
-                try:
-                    with file_path.open("r", encoding="utf-8") as f:
-                        content = f.read()
-                    data_point = {
-                        "filepath": str(file_path.relative_to(source_path)),
-                        "filename": file,
-                        "content": content
-                    }
-                    out_file.write(json.dumps(data_point) + "\n")
-                except Exception as e:
-                    print(f"Skipping file {file_path}: {e}")
+def append_to_division_dataset(source_path, subdir, division, dest_path, parse_timeout=PARSE_TIMEOUT_SECONDS,
+                               max_file_bytes=MAX_PARSE_FILE_BYTES, workers=None, index_path=None, scrub_pii=False,
+                               roster_path=None, submission=None, selection=None):
+    """
+    Incrementally extracts only source_path/subdir and appends its records to the existing
+    dest_path/unprocessed_dataset.jsonl (and symbol index), with filepaths relative to source_path
+    exactly as a full extraction would produce them. Records previously extracted from the same
+    subdir are replaced, so re-ingesting an updated submission does not duplicate records.
+    scrub_pii and roster_path redact the appended records as in extract_data_from_division.
+    submission (default: the first component of subdir) is stored on every appended record
+    ("submission") so the symbol index and stats do not have to guess it from the filepath layout.
+    With scrub_pii the submission is pseudonymized in the records, and the records replaced on
+    re-ingestion are found under the pseudonymized subdir. selection (paths relative to subdir,
+    e.g. a view's "paths") restricts the files extracted.
 
+    Returns:
+      int: The number of records appended.
+    """
+    source_path = Path(source_path)
+    dest_path = Path(dest_path)
+    dest_path.mkdir(parents=True, exist_ok=True)
+    dataset_file = dest_path / "unprocessed_dataset.jsonl"
+    subdir = Path(subdir).as_posix().strip("/")
+    if submission is None:
+        submission = subdir.split("/")[0]
+    roster = (load_roster(roster_path) if roster_path else ()) if scrub_pii else None
+    # Records of this subdir are stored (and replaced) under this prefix
+    record_subdir = PIIScrubber(roster).pseudonymize_path(subdir, submission, is_dir=True) if scrub_pii else subdir
+    parse_options = {"timeout": parse_timeout, "max_file_bytes": max_file_bytes, "workers": workers}
+    skip_report = []
 
-def create_dataset_from_lines(source_path, dataset_file):
-    with dataset_file.open("w", encoding="utf-8") as out_file:
-        for root, dirs, files in os.walk(source_path):
-            for file in files:
-                file_path = Path(root) / file
-                try:
-                    with file_path.open("r", encoding="utf-8") as f:
-                        for line in f:
-                            line = line.strip()
-                            if line:  # Only write non-empty lines
-                                data_point = {
-                                    "filepath": str(file_path.relative_to(source_path)),
-                                    "line": line
-                                }
-                                out_file.write(json.dumps(data_point) + "\n")
-                except Exception as e:
-                    print(f"Skipping file {file_path}: {e}")
+    delta_file = dest_path / f".delta_{os.getpid()}.jsonl"
+    prefixed_file = dest_path / f".delta_{os.getpid()}_prefixed.jsonl"
+    try:
+        write_division_dataset(source_path / subdir, division, delta_file, skip_report, parse_options, resume=False,
+                               selection=selection)
+
+        # Re-root the delta's filepaths onto source_path
+        appended = 0
+        with delta_file.open("r", encoding="utf-8") as infile, prefixed_file.open("w", encoding="utf-8") as outfile:
+            for line in infile:
+                record = json.loads(line)
+                record["filepath"] = f"{subdir}/{record['filepath']}"
+                record["submission"] = submission
+                outfile.write(json.dumps(record) + "\n")
+                appended += 1
+        if scrub_pii:
+            scrub_dataset_file(prefixed_file, roster, workers=workers)
+
+        remove_records_under(dataset_file, record_subdir)
+        with prefixed_file.open("rb") as src, dataset_file.open("ab") as dst:
+            shutil.copyfileobj(src, dst)
 
+        if index_path is not None and division in ("method", "class"):
+            delete_symbols_under(index_path, record_subdir)
+            index_dataset_file(prefixed_file, division, index_path, replace=False)
+    finally:
+        for suffix in ("", ".partial", ".done", ".checkpoint.json"):
+            delta_file.with_name(delta_file.name + suffix).unlink(missing_ok=True)
+        prefixed_file.unlink(missing_ok=True)
 
+    for entry in skip_report:
+        entry["filepath"] = f"{subdir}/{entry['filepath']}"
+    if scrub_pii:
+        scrub_skip_report(skip_report, PIIScrubber(roster), submission)
+    with (dest_path / SKIP_REPORT_FILENAME).open("a", encoding="utf-8") as out_file:
+        for entry in skip_report:
+            out_file.write(json.dumps(entry) + "\n")
+    return appended
 
-def create_dataset_from_methods(source_path, dataset_file):
+
+def remove_records_under(dataset_file, subdir):
     """
-    Creates a JSONL dataset where each datapoint represents a method extracted from a file.
-    Each JSON object contains:
-      - "filepath": relative path of the file from source_path
-      - "method": name of the extracted method
+    Rewrites dataset_file without the records whose filepath lies under subdir.
+    Does nothing if the file does not exist or holds no such records.
+    """
+    dataset_file = Path(dataset_file)
+    if not dataset_file.exists():
+        return
+    prefix = subdir.rstrip("/") + "/"
+    needle = json.dumps(prefix)[:-1]  # Cheap pre-check on the raw line before decoding
+    tmp_file = dataset_file.with_name(dataset_file.name + ".tmp")
+    removed = 0
+    with dataset_file.open("r", encoding="utf-8") as infile, tmp_file.open("w", encoding="utf-8") as outfile:
+        for line in infile:
+            if needle in line and json.loads(line).get("filepath", "").startswith(prefix):
+                removed += 1
+                continue
+            outfile.write(line)
+    if removed:
+        os.replace(tmp_file, dataset_file)
+    else:
+        tmp_file.unlink()
+
+
+def checkpoint_key(source_path, division, options=None, selection=None):
+    """
+    Identifies an extraction run for resuming: a checkpoint is only reused for the same division,
+    options, selection and unchanged source tree.
+    """
+    key = {
+        "division": division,
+        "source": str(Path(source_path).resolve()),
+        "source_fingerprint": fingerprint_paths([source_path]),
+        "options": options or {},
+    }
+    if selection is not None:
+        key["selection"] = hashlib.sha256("\n".join(map(str, selection)).encode("utf-8")).hexdigest()
+    return key
+
+
+def iter_source_files(source_path, selection=None):
+    """
+    Yields the files to extract from source_path: every file of the tree, or only the paths of
+    selection (relative to source_path) that still exist.
     """
-    with dataset_file.open("w", encoding="utf-8") as out_file:
+    source_path = Path(source_path)
+    if selection is None:
         for root, dirs, files in os.walk(source_path):
             for file in files:
-                file_path = Path(root) / file
-                try:
-                    parsed = parse_ast_from_file(file_path)
-                    if parsed and "methods" in parsed:
-                        for method in parsed["methods"]:
+                yield Path(root) / file
+        return
+    for relative_path in selection:
+        file_path = source_path / relative_path
+        if file_path.is_file():
+            yield file_path
+
+
+def pii_scrub_finalizer(roster, workers=None):
+    """
+    Returns a CheckpointedWriter finalize step that writes the dataset as the PII-scrubbed copy of
+    the partial output, so unscrubbed records never appear at the dataset's path.
+    """
+    def finalize(partial_file, dataset_file):
+        scrub_dataset_file(partial_file, roster, output_file=dataset_file, workers=workers)
+    return finalize
+
+
+def scrub_skip_report(skip_report, scrubber, submission=None):
+    """
+    Pseudonymizes the submissions in skip report filepaths and redacts the details, in place.
+    """
+    for entry in skip_report:
+        entry_submission = submission or submission_from_filepath(entry["filepath"])
+        entry["filepath"] = scrubber.pseudonymize_path(entry["filepath"], entry_submission)
+        if entry.get("detail"):
+            entry["detail"] = scrubber.scrub(str(entry["detail"]))[0]
+
+
+def write_skip_report(report_file, skip_report):
+    """
+    Writes one JSON object per skipped file: {"filepath": ..., "reason": ..., "detail": ...}.
+    """
+    with Path(report_file).open("w", encoding="utf-8") as out_file:
+        for entry in skip_report:
+            out_file.write(json.dumps(entry) + "\n")
+
+
+def iter_parsed_files(source_path, skip_report, timeout=PARSE_TIMEOUT_SECONDS,
+                      max_file_bytes=MAX_PARSE_FILE_BYTES, workers=None, skip=None, selection=None):
+    """
+    Walks source_path (or its selection) and parses every supported file in isolated worker processes.
+    Yields (file_path, parsed) for files that parsed within the budget. Files that are too
+    large, time out or crash their worker are appended to skip_report instead. Files for which
+    skip(relative_path) is true (e.g. already written before a resume) are not parsed at all.
+    """
+    def candidates():
+        for file_path in iter_source_files(source_path, selection):
+            if file_path.suffix.lower() not in PARSEABLE_EXTENSIONS:
+                continue
+            if skip is not None and skip(file_path.relative_to(source_path)):
+                continue
+            size = file_path.stat().st_size
+            if max_file_bytes is not None and size > max_file_bytes:
+                skip_report.append({
+                    "filepath": str(file_path.relative_to(source_path)),
+                    "reason": "size",
+                    "detail": f"{size} bytes exceeds {max_file_bytes} byte limit"
+                })
+                continue
+            yield file_path
+
+    with ParseWorkerPool(parse_ast_from_file, workers=workers, timeout=timeout) as pool:
+        for file_path, status, payload in pool.imap(candidates()):
+            if status == "ok":
+                yield file_path, payload
+            else:
+                print(f"Skipping file {file_path}: {payload}")
+                skip_report.append({
+                    "filepath": str(file_path.relative_to(source_path)),
+                    "reason": status,
+                    "detail": payload
+                })
+
+
+def create_dataset_from_files(source_path, dataset_file, resume=True, selection=None, finalize=None):
+    key = checkpoint_key(source_path, "file", selection=selection)
+    with CheckpointedWriter(dataset_file, key, resume, finalize=finalize) as out_file:
+        for file_path in iter_source_files(source_path, selection):
+            relative_path = file_path.relative_to(source_path)
+            if out_file.is_done(relative_path):
+                continue
+            try:
+                with file_path.open("r", encoding="utf-8") as f:
+                    content = f.read()
+                data_point = {
+                    "filepath": str(relative_path),
+                    "filename": file_path.name,
+                    "content": content
+                }
+                out_file.write(json.dumps(data_point) + "\n")
+            except Exception as e:
+                print(f"Skipping file {file_path}: {e}")
+            out_file.file_done(relative_path)
+
+
+def build_line_sketch(source_path, selection=None):
+    """
+    First pass of frequency-aware line extraction: counts every stripped, non-empty line of the
+    corpus into a fixed-size CountMinSketch.
+    """
+    sketch = CountMinSketch()
+    for file_path in iter_source_files(source_path, selection):
+        try:
+            with file_path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        sketch.add(line)
+        except Exception:
+            continue  # Reported by the second pass
+    return sketch
+
+
+def create_dataset_from_lines(source_path, dataset_file, resume=True, line_frequency_threshold=None,
+                              line_sampling="drop", selection=None, finalize=None):
+    """
+    Creates a JSONL dataset where each datapoint is a non-empty line of a file.
+    With line_frequency_threshold set, lines estimated (in fixed memory, see line_frequency_service)
+    to occur more often than that across the corpus are dropped or down-sampled per line_sampling.
+    """
+    line_filter = None
+    options = {}
+    if line_frequency_threshold is not None:
+        line_filter = BoilerplateLineFilter(build_line_sketch(source_path, selection), line_frequency_threshold,
+                                            line_sampling)
+        options = {"line_frequency_threshold": line_frequency_threshold, "line_sampling": line_sampling}
+
+    key = checkpoint_key(source_path, "line", options, selection)
+    with CheckpointedWriter(dataset_file, key, resume, finalize=finalize) as out_file:
+        for file_path in iter_source_files(source_path, selection):
+            relative_path = file_path.relative_to(source_path)
+            if out_file.is_done(relative_path):
+                continue
+            try:
+                with file_path.open("r", encoding="utf-8") as f:
+                    for line in f:
+                        line = line.strip()
+                        if line and (line_filter is None or line_filter.keep(str(relative_path), line)):
                             data_point = {
-                                "filepath": str(file_path.relative_to(source_path)),
-                                "method": method
+                                "filepath": str(relative_path),
+                                "line": line
                             }
                             out_file.write(json.dumps(data_point) + "\n")
-                except Exception as e:
-                    print(f"Skipping file {file_path}: {e}")
+            except Exception as e:
+                print(f"Skipping file {file_path}: {e}")
+            out_file.file_done(relative_path)
+
+
+
+def create_dataset_from_methods(source_path, dataset_file, skip_report=None, resume=True, selection=None,
+                                finalize=None, **parse_options):
+    """
+    Creates a JSONL dataset where each datapoint represents a method extracted from a file.
+    Each JSON object contains:
+      - "filepath": relative path of the file from source_path
+      - "method": the extracted method (name, content, span, enclosing class and quality "features")
+    Files are parsed in isolated worker processes (see iter_parsed_files); skipped files are
+    appended to skip_report.
+    """
+    skip_report = [] if skip_report is None else skip_report
+    key = checkpoint_key(source_path, "method", parse_options, selection)
+    with CheckpointedWriter(dataset_file, key, resume, finalize=finalize) as out_file:
+        for file_path, parsed in iter_parsed_files(source_path, skip_report, skip=out_file.is_done, selection=selection,
+                                                   **parse_options):
+            relative_path = file_path.relative_to(source_path)
+            if parsed and "methods" in parsed:
+                for method in parsed["methods"]:
+                    data_point = {
+                        "filepath": str(relative_path),
+                        "method": method
+                    }
+                    out_file.write(json.dumps(data_point) + "\n")
+            out_file.file_done(relative_path)
 
 
-def create_dataset_from_classes(source_path, dataset_file):
+def create_dataset_from_classes(source_path, dataset_file, skip_report=None, resume=True, selection=None,
+                                finalize=None, **parse_options):
     """
     Creates a JSONL dataset where each datapoint represents a class extracted from a file.
     Each JSON object contains:
       - "filepath": relative path of the file from source_path
-      - "class": name of the extracted class
+      - "class": the extracted class (name, content, span and quality "features")
+    Files are parsed in isolated worker processes (see iter_parsed_files); skipped files are
+    appended to skip_report.
     """
-    with dataset_file.open("w", encoding="utf-8") as out_file:
-        for root, dirs, files in os.walk(source_path):
-            for file in files:
-                file_path = Path(root) / file
-                try:
-                    parsed = parse_ast_from_file(file_path)
-                    if parsed and "classes" in parsed:
-                        for cls in parsed["classes"]:
-                            data_point = {
-                                "filepath": str(file_path.relative_to(source_path)),
-                                "class": cls
-                            }
-                            out_file.write(json.dumps(data_point) + "\n")
-                except Exception as e:
-                    print(f"Skipping file {file_path}: {e}")
+    skip_report = [] if skip_report is None else skip_report
+    key = checkpoint_key(source_path, "class", parse_options, selection)
+    with CheckpointedWriter(dataset_file, key, resume, finalize=finalize) as out_file:
+        for file_path, parsed in iter_parsed_files(source_path, skip_report, skip=out_file.is_done, selection=selection,
+                                                   **parse_options):
+            relative_path = file_path.relative_to(source_path)
+            if parsed and "classes" in parsed:
+                for cls in parsed["classes"]:
+                    data_point = {
+                        "filepath": str(relative_path),
+                        "class": cls
+                    }
+                    out_file.write(json.dumps(data_point) + "\n")
+            out_file.file_done(relative_path)
 
 
 def parse_ast_from_file(file_path):
@@ -143,25 +448,51 @@ def parse_ast_from_file(file_path):
 
 def parse_python_file(file_path):
     """
-    Uses Python's ast module to extract method and class names from a Python file.
+    Uses Python's ast module to extract methods and classes from a Python file.
+    Each is returned as a dictionary with "name", "content" (source segment), "start_line",
+    "end_line" and "features" (see quality_service); methods also carry "class", the name of
+    the innermost enclosing class (or None).
     """
     try:
         with file_path.open("r", encoding="utf-8") as f:
             code = f.read()
         tree = ast.parse(code)
+        parents = {child: parent for parent in ast.walk(tree) for child in ast.iter_child_nodes(parent)}
         methods = []
         classes = []
         for node in ast.walk(tree):
+            if not isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+                continue
+            content = ast.get_source_segment(code, node) or ""
+            symbol = {
+                "name": node.name,
+                "content": content,
+                "start_line": node.lineno,
+                "end_line": node.end_lineno,
+                "features": python_quality_features(node, code, content)
+            }
             if isinstance(node, ast.FunctionDef):
-                methods.append(node.name)
-            elif isinstance(node, ast.ClassDef):
-                classes.append(node.name)
+                methods.append({**symbol, "class": get_enclosing_python_class_name(node, parents)})
+            else:
+                classes.append(symbol)
         return {"methods": methods, "classes": classes}
     except Exception as e:
         print(f"Error parsing Python file {file_path}: {e}")
         return None
 
 
+def get_enclosing_python_class_name(node, parents):
+    """
+    Given an ast node and a child -> parent map, returns the name of the innermost enclosing class.
+    """
+    parent = parents.get(node)
+    while parent is not None:
+        if isinstance(parent, ast.ClassDef):
+            return parent.name
+        parent = parents.get(parent)
+    return None
+
+
 def get_index_from_position(code, line, column):
     """
     Convert a (line, column) position to a character index in code.
@@ -193,12 +524,34 @@ def extract_java_block(code, start_index):
         i += 1
     return ""
 
+def get_java_span(code, node, start_index, content):
+    """
+    Returns the 1-indexed line span of a declaration whose block content starts after start_index.
+    """
+    end_index = code.find('{', start_index) + len(content)
+    return {
+        "start_line": node.position.line,
+        "end_line": code.count("\n", 0, end_index) + 1
+    }
+
+def get_enclosing_class_name(path):
+    """
+    Given a javalang filter path, returns the name of the innermost enclosing class declaration.
+    """
+    for parent in reversed(path):
+        if isinstance(parent, javalang.tree.ClassDeclaration):
+            return parent.name
+    return None
+
 def parse_java_file(file_path):
     """
     Parses a Java file using javalang to extract class and method information.
     For each class and method, it returns a dictionary with keys:
       - "name": the identifier (class or method name)
       - "content": the code block (from the first '{' to the matching '}')
+      - "start_line" / "end_line": 1-indexed span from the declaration to the closing brace
+      - "features": quality features computed from the AST (see quality_service.QUALITY_FEATURES)
+    Methods additionally carry "class", the name of the innermost enclosing class (or None).
     
     Returns:
         dict: {
@@ -225,7 +578,9 @@ def parse_java_file(file_path):
             if content != "":
                 classes.append({
                     "name": node.name,
-                    "content": content
+                    "content": content,
+                    **get_java_span(code, node, start_index, content),
+                    "features": java_quality_features(node, content)
                 })
 
         # Extract method declarations
@@ -238,7 +593,10 @@ def parse_java_file(file_path):
             if content != "":
                 methods.append({
                     "name": node.name,
-                    "content": content
+                    "content": content,
+                    "class": get_enclosing_class_name(path),
+                    **get_java_span(code, node, start_index, content),
+                    "features": java_quality_features(node, content)
                 })
 
         return {"methods": methods, "classes": classes}
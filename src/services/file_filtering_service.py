@@ -1,65 +1,39 @@
 import os
 import shutil
 
-copied_files = {}
-
-def file_name_filter(source_folder, filter_list, filter_type):
-    if not os.path.exists(source_folder):
-        raise ValueError("Source folder does not exist")
-
-    if filter_type not in ['in', 'out']:
-        raise ValueError("Invalid filter type")
-    
-    copied_files.clear()
+from src.services.path_matcher_service import DEFAULT_IGNORE, PathMatcher, compile_filter_list, walk_files
 
-    for root, dirs, files in os.walk(source_folder):
-        for file in files:
-            file_path = os.path.join(root, file)
-            if file.startswith('.') or file.startswith('_'):
-                continue
-
-            filename_matches = any(file == filename for filename in filter_list)
-            should_remove = (filter_type == 'in' and not filename_matches) \
-                    or (filter_type == 'out' and filename_matches)
+copied_files = {}
 
-            if should_remove:
-                os.remove(file_path)
-            else:
-                if file in copied_files:
-                    copied_files[file] += 1
-                else:
-                    copied_files[file] = 1
-    return copied_files
+def _split_filter(matcher, filter_type):
+    # (include, exclude) for walk_files
+    return (matcher, None) if filter_type == 'in' else (None, matcher)
 
 
-def file_ext_filter(source_folder, filter_list, filter_type, dest_folder):
+def file_ext_filter(source_folder, filter_list, filter_type, dest_folder, exclude=()):
+    """
+    Copies files from source_folder to dest_folder by extension. filter_list holds file name
+    suffixes (".java") and/or gitignore-style patterns; exclude holds extra patterns that are
+    never copied, e.g. ["target/", "build/"], whose subtrees are pruned from the walk.
+    """
     if not os.path.exists(source_folder):
         raise ValueError("Source folder does not exist")
 
     if filter_type not in ['in', 'out']:
         raise ValueError("Invalid filter type")
-    
-    copied_files.clear()
 
-    for root, dirs, files in os.walk(source_folder):
-        rel_path = os.path.relpath(root, source_folder)
-        dest_path = os.path.join(dest_folder, rel_path)
-
-        for file in files:
-            file_path = os.path.join(root, file)
-
-            extension_matches = any(file.endswith(ext) for ext in filter_list)
-            if file.startswith('.') or file.startswith('_'):
-                continue
-            should_copy = (filter_type == 'in' and extension_matches) \
-                          or (filter_type == 'out' and not extension_matches)
+    copied_files.clear()
 
-            if should_copy:
-                os.makedirs(dest_path, exist_ok=True)
-                dest_file_path = os.path.join(dest_path, file)
-                if file in copied_files:
-                    copied_files[file] += 1
-                else:
-                    copied_files[file] = 1
-                shutil.copy(file_path, dest_file_path)
+    include, excluded = _split_filter(compile_filter_list(filter_list, plain="suffixes"), filter_type)
+    ignore = PathMatcher(DEFAULT_IGNORE + tuple(exclude))
+    created_dirs = set()
+    for file_path, rel_path in walk_files(source_folder, ignore=ignore, include=include, exclude=excluded):
+        dest_file_path = os.path.join(dest_folder, rel_path)
+        dest_path = os.path.dirname(dest_file_path)
+        if dest_path not in created_dirs:
+            os.makedirs(dest_path, exist_ok=True)
+            created_dirs.add(dest_path)
+        file = os.path.basename(file_path)
+        copied_files[file] = copied_files.get(file, 0) + 1
+        shutil.copy(file_path, dest_file_path)
     return copied_files
@@ -0,0 +1,61 @@
+import os
+import hashlib
+from pathlib import Path
+
+
+def fingerprint_paths(paths):
+    """
+    Cheap content fingerprint of files/directories from (relative path, size, mtime) of every file.
+    Missing paths hash as missing.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        path = Path(path)
+        digest.update(str(path).encode())
+        if path.is_file():
+            stat = path.stat()
+            digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+        elif path.is_dir():
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for file in sorted(files):
+                    file_path = Path(root) / file
+                    stat = file_path.stat()
+                    digest.update(f"{file_path.relative_to(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        else:
+            digest.update(b"<missing>")
+    return digest.hexdigest()
+
+
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+HASH_CACHE_DIR = "data/index/hashes"
+
+
+def file_content_hash(path, cache_dir=None):
+    """
+    SHA-256 of a file's content. The digest is cached in cache_dir (default HASH_CACHE_DIR), keyed
+    by the file's absolute path and stamped with its size and mtime, so repeated calls on an
+    unchanged (possibly multi-GB) dataset are free and nothing is written next to the file.
+    """
+    path = Path(path)
+    stat = path.stat()
+    stamp = f"{stat.st_size}:{stat.st_mtime_ns}"
+    path_key = hashlib.sha256(str(path.resolve()).encode("utf-8")).hexdigest()[:32]
+    sidecar = Path(cache_dir or HASH_CACHE_DIR) / f"{path_key}.sha256"
+    try:
+        cached_stamp, cached_digest = sidecar.read_text().split()
+        if cached_stamp == stamp:
+            return cached_digest
+    except (OSError, ValueError):
+        pass
+
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    try:
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        sidecar.write_text(f"{stamp} {digest.hexdigest()}\n")
+    except OSError:
+        pass
+    return digest.hexdigest()
@@ -0,0 +1,242 @@
+import re
+import json
+import time
+import queue
+import shutil
+from pathlib import Path
+
+from src.services.unzip_service import recursive_unzip, archive_type
+from src.services.file_filtering_service import file_ext_filter
+from src.services.view_service import create_name_view, delete_views_of, view_file_counts, VIEWS_DIR
+from src.services.symbol_index_service import SYMBOL_INDEX_PATH
+from src.services.pii_scrub_service import ROSTER_PATH
+
+STATE_FILENAME = ".ingest_state.json"
+# Held by a running watcher; /api/unzip and /api/filter/fileext refuse to clear the folders it
+# writes to while it is. Kept outside data/raw, which /api/unzip clears.
+WATCHER_LOCK_FILE = "data/.ingest_watcher.lock"
+POLL_INTERVAL_SECONDS = 5
+SETTLE_SECONDS = 2  # An archive must be unmodified this long before it is ingested
+
+DEFAULT_INGESTION_CONFIG = {
+    "raw_dir": "data/raw",
+    "unzipped_dir": "data/unzipped",
+    "filtered_dir": "data/file_filtered",
+    "dest_dir": "data/divisioned",
+    "index_path": SYMBOL_INDEX_PATH,
+    "division": "method",
+    "ext_filter": ("in", [".java", ".py"]),
+    "exclude": ["target/", "build/"],  # gitignore-style patterns pruned by the extension filter
+    "name_filter": ("out", []),  # Applied as the selection view "ingest-<archive>" in views_dir
+    "views_dir": VIEWS_DIR,
+    "scrub_pii": True,
+    "roster_path": ROSTER_PATH,  # Used when the file exists
+}
+
+
+def archive_stem(archive_path):
+    # Mirrors recursive_unzip, which extracts foo.tar.gz into <destination>/foo
+    return Path(archive_path).name.split('.')[0]
+
+
+def ingest_view_name(stem):
+    return "ingest-" + re.sub(r"[^A-Za-z0-9_.-]", "_", stem)
+
+
+def ingest_archive(archive_path, config=None):
+    """
+    Runs one archive through the unzip, file-filter and extraction stages and appends its
+    records to the live dataset and symbol index. Only the archive's own subtree is touched,
+    so the cost is proportional to the submission rather than the corpus. Re-ingesting an
+    archive replaces the records it produced before. The name filter selects through a view
+    instead of deleting files, and views over the rewritten subtrees are dropped.
+
+    Params:
+      archive_path (str or Path): A zip or tar archive.
+      config (dict): Overrides for DEFAULT_INGESTION_CONFIG.
+
+    Returns:
+      dict: Summary with the archive name, number of files kept and records appended.
+    """
+    # Deferred: the extraction stack is only needed once an archive actually arrives
+    from src.services.extraction_service import append_to_division_dataset
+
+    config = {**DEFAULT_INGESTION_CONFIG, **(config or {})}
+    stem = archive_stem(archive_path)
+    unzipped_subtree = Path(config["unzipped_dir"]) / stem
+    filtered_subtree = Path(config["filtered_dir"]) / stem
+    if filtered_subtree.exists():
+        shutil.rmtree(filtered_subtree)
+
+    # Incremental: a re-uploaded export only rewrites the members that changed
+    recursive_unzip([archive_path], config["unzipped_dir"], incremental=True)
+
+    ext_type, ext_list = config["ext_filter"]
+    kept = dict(file_ext_filter(unzipped_subtree, ext_list, ext_type, filtered_subtree, exclude=config["exclude"]))
+    filtered_subtree.mkdir(parents=True, exist_ok=True)
+    for rewritten in (unzipped_subtree, filtered_subtree):
+        delete_views_of(rewritten, config["views_dir"])
+
+    selection = None
+    name_type, name_list = config["name_filter"]
+    if name_list:
+        view = create_name_view(ingest_view_name(stem), filtered_subtree, name_list, name_type,
+                                views_dir=config["views_dir"])
+        kept = view_file_counts(view)
+        selection = view["paths"]
+
+    roster_path = config["roster_path"] if config["roster_path"] and Path(config["roster_path"]).exists() else None
+    appended = append_to_division_dataset(
+        config["filtered_dir"], stem, config["division"], config["dest_dir"], index_path=config["index_path"],
+        scrub_pii=config["scrub_pii"], roster_path=roster_path, submission=stem, selection=selection
+    )
+    return {"archive": Path(archive_path).name, "files": sum(kept.values()), "records": appended}
+
+
+def load_state(state_file):
+    state_file = Path(state_file)
+    if not state_file.exists():
+        return {}
+    with state_file.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state_file, state):
+    state_file = Path(state_file)
+    tmp_file = state_file.with_name(state_file.name + ".tmp")
+    with tmp_file.open("w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    tmp_file.replace(state_file)
+
+
+def scan_ready_archives(raw_dir, state, settle_seconds=SETTLE_SECONDS):
+    """
+    Returns (ready, pending): archives in raw_dir that are new or changed since they were last
+    ingested and have been stable for settle_seconds, and those still being written.
+    """
+    ready, pending = [], []
+    now = time.time()
+    for path in sorted(Path(raw_dir).iterdir()):
+        if not path.is_file() or archive_type(path) is None:
+            continue
+        stat = path.stat()
+        fingerprint = {"size": stat.st_size, "mtime": stat.st_mtime}
+        if state.get(path.name) == fingerprint:
+            continue
+        if now - stat.st_mtime < settle_seconds:
+            pending.append(path)
+        else:
+            ready.append((path, fingerprint))
+    return ready, pending
+
+
+def acquire_watcher_lock(lock_file=WATCHER_LOCK_FILE):
+    """
+    Takes the exclusive watcher lock (POSIX flock, released when the process exits) and returns
+    the open lock file. Raises RuntimeError if another watcher holds it.
+    """
+    import fcntl
+
+    lock_file = Path(lock_file)
+    lock_file.parent.mkdir(parents=True, exist_ok=True)
+    handle = lock_file.open("a")
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        handle.close()
+        raise RuntimeError(f"Another watcher is already running (lock: {lock_file})")
+    return handle
+
+
+def watcher_running(lock_file=WATCHER_LOCK_FILE):
+    """
+    True if a watcher currently holds lock_file.
+    """
+    import fcntl
+
+    lock_file = Path(lock_file)
+    if not lock_file.exists():
+        return False
+    with lock_file.open("a") as handle:
+        try:
+            fcntl.flock(handle, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        fcntl.flock(handle, fcntl.LOCK_UN)
+    return False
+
+
+def start_inotify_observer(raw_dir, events):
+    """
+    Starts a watchdog (inotify on Linux) observer that signals `events` on any change in raw_dir.
+    Returns None when watchdog is not installed, in which case callers fall back to polling.
+    """
+    try:
+        from watchdog.observers import Observer
+        from watchdog.events import FileSystemEventHandler
+    except ImportError:
+        return None
+
+    class _Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            events.put(event.src_path)
+
+    observer = Observer()
+    observer.schedule(_Handler(), str(raw_dir), recursive=False)
+    observer.start()
+    return observer
+
+
+def watch_and_ingest(config=None, poll_interval=POLL_INTERVAL_SECONDS, settle_seconds=SETTLE_SECONDS,
+                     stop_event=None, use_inotify=True, on_ingested=None, lock_file=WATCHER_LOCK_FILE):
+    """
+    Watches config["raw_dir"] and ingests every new or changed archive with ingest_archive.
+    Wakes up on inotify events from watchdog (see requirements.txt) and polls every poll_interval
+    seconds if it is unavailable. Ingested archives are tracked by size and mtime in
+    raw_dir/.ingest_state.json so restarts do not reprocess them.
+
+    The watcher shares data/raw, data/unzipped and data/file_filtered with the upload endpoints,
+    which clear them, so it holds lock_file while it runs: a second watcher fails to start, and
+    /api/unzip and /api/filter/fileext answer 409 until it stops.
+
+    Params:
+      stop_event (threading.Event): Stops the loop when set; runs forever otherwise.
+      on_ingested (callable): Called with each ingest_archive summary (defaults to printing it).
+    """
+    config = {**DEFAULT_INGESTION_CONFIG, **(config or {})}
+    lock = acquire_watcher_lock(lock_file)
+    raw_dir = Path(config["raw_dir"])
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    state_file = raw_dir / STATE_FILENAME
+    state = load_state(state_file)
+    on_ingested = on_ingested or (lambda summary: print(json.dumps(summary)))
+
+    events = queue.Queue()
+    observer = start_inotify_observer(raw_dir, events) if use_inotify else None
+    if observer is None:
+        print(f"Polling {raw_dir} every {poll_interval}s")
+
+    try:
+        while stop_event is None or not stop_event.is_set():
+            ready, pending = scan_ready_archives(raw_dir, state, settle_seconds)
+            for path, fingerprint in ready:
+                try:
+                    on_ingested(ingest_archive(path, config))
+                except Exception as e:
+                    print(f"Error ingesting {path}: {e}")
+                # Recorded even on failure so a broken archive is not retried until it changes
+                state[path.name] = fingerprint
+                save_state(state_file, state)
+
+            timeout = settle_seconds if pending else poll_interval
+            try:
+                events.get(timeout=timeout)
+                while not events.empty():
+                    events.get_nowait()
+            except queue.Empty:
+                pass
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
+        lock.close()
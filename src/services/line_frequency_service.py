@@ -0,0 +1,64 @@
+import hashlib
+from array import array
+
+SKETCH_WIDTH = 1 << 20
+SKETCH_DEPTH = 4  # 4 rows x 2^20 uint32 counters = 16 MiB regardless of corpus size
+LINE_SAMPLING_MODES = ("drop", "sample")
+
+
+def _hash64(text):
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class CountMinSketch:
+    """
+    Fixed-memory frequency estimator. estimate() never undercounts; with conservative updates
+    the overcount is bounded by roughly total_count * e / width with high probability.
+    """
+
+    def __init__(self, width=SKETCH_WIDTH, depth=SKETCH_DEPTH):
+        self.width = width
+        self.depth = depth
+        self.rows = [array("I", bytes(4 * width)) for _ in range(depth)]
+
+    def _indexes(self, item):
+        # Double hashing: derive every row's index from two halves of one 64-bit hash
+        h = _hash64(item)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, item):
+        indexes = self._indexes(item)
+        current = min(row[index] for row, index in zip(self.rows, indexes))
+        # Conservative update: only raise the counters that are at the minimum
+        for row, index in zip(self.rows, indexes):
+            if row[index] == current and current < 0xFFFFFFFF:
+                row[index] = current + 1
+
+    def estimate(self, item):
+        return min(row[index] for row, index in zip(self.rows, self._indexes(item)))
+
+
+class BoilerplateLineFilter:
+    """
+    Decides which lines of the line division to keep once a CountMinSketch has seen the corpus.
+    Lines estimated to occur more than threshold times are boilerplate:
+      - "drop": every occurrence is removed.
+      - "sample": each occurrence is kept with probability threshold / estimate, so roughly
+        threshold copies survive. The choice is a hash of (filepath, line), so reruns agree.
+    """
+
+    def __init__(self, sketch, threshold, mode="drop"):
+        if mode not in LINE_SAMPLING_MODES:
+            raise ValueError(f"line sampling mode must be one of {LINE_SAMPLING_MODES}")
+        self.sketch = sketch
+        self.threshold = threshold
+        self.mode = mode
+
+    def keep(self, filepath, line):
+        estimate = self.sketch.estimate(line)
+        if estimate <= self.threshold:
+            return True
+        if self.mode == "drop":
+            return False
+        return _hash64(f"{filepath}\0{line}") % estimate < self.threshold
@@ -0,0 +1,166 @@
+import time
+import multiprocessing
+from multiprocessing.connection import wait
+from pathlib import Path
+
+from src.services.profiling_service import worker_profile_dir, run_profiled
+
+PARSE_TIMEOUT_SECONDS = 10
+STOP_GRACE_SECONDS = 1
+PROFILE_DUMP_SECONDS = 10  # Extra time a profiled worker gets on close to write its stats
+
+
+def _parse_worker(conn, parse_fn, profile_dir=None):
+    """
+    Worker loop: receives file paths over conn, parses them with parse_fn and sends back
+    a (status, payload) tuple. A None path (or a closed pipe) stops the worker.
+    With profile_dir set, the whole loop is profiled (see profiling_service.run_profiled).
+    """
+    if profile_dir is not None:
+        return run_profiled(profile_dir, _parse_worker, conn, parse_fn)
+    while True:
+        try:
+            file_path = conn.recv()
+        except EOFError:
+            break
+        if file_path is None:
+            break
+        try:
+            result = ("ok", parse_fn(Path(file_path)))
+        except Exception as e:
+            result = ("error", str(e))
+        conn.send(result)
+
+
+class _Worker:
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+
+
+class ParseWorkerPool:
+    """
+    A pool of killable parse worker processes.
+
+    Each file is parsed in a separate process with a wall-clock budget. A worker that exceeds
+    the budget (or crashes) is terminated and replaced, and the file is reported back with a
+    "timeout" or "crashed" status instead of stalling the run.
+
+    Params:
+      parse_fn (callable): Module-level function taking a Path and returning the parse result.
+      workers (int): Number of worker processes (defaults to the CPU count).
+      timeout (float): Per-file wall-clock budget in seconds.
+    """
+
+    def __init__(self, parse_fn, workers=None, timeout=PARSE_TIMEOUT_SECONDS):
+        self.parse_fn = parse_fn
+        self.timeout = timeout
+        self.workers = max(1, workers or multiprocessing.cpu_count())
+        self._pool = []
+        # Captured at creation so workers of a profiled request are profiled too
+        self._profile_dir = worker_profile_dir()
+
+    def __enter__(self):
+        self._pool = [self._spawn() for _ in range(self.workers)]
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _spawn(self):
+        parent_conn, child_conn = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_parse_worker, args=(child_conn, self.parse_fn, self._profile_dir), daemon=True
+        )
+        process.start()
+        child_conn.close()
+        return _Worker(process, parent_conn)
+
+    def _kill(self, worker):
+        if worker.process.is_alive():
+            worker.process.kill()
+        worker.process.join()
+        worker.conn.close()
+
+    def _replace(self, worker):
+        self._kill(worker)
+        replacement = self._spawn()
+        self._pool[self._pool.index(worker)] = replacement
+        return replacement
+
+    def close(self):
+        """
+        Stops the workers: each gets a None path and is waited for until it exits (its process
+        sentinel is ready), so profiled workers can dump their stats. Only workers still alive
+        after the grace period, which covers a file in progress when profiling, are killed.
+        """
+        for worker in self._pool:
+            try:
+                worker.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        grace = STOP_GRACE_SECONDS
+        if self._profile_dir is not None:
+            grace += self.timeout + PROFILE_DUMP_SECONDS
+        deadline = time.monotonic() + grace
+        running = {worker.process.sentinel: worker for worker in self._pool}
+        while running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for sentinel in wait(list(running), timeout=remaining):
+                del running[sentinel]
+        for worker in self._pool:
+            self._kill(worker)
+        self._pool = []
+
+    def imap(self, file_paths):
+        """
+        Parses file_paths across the pool and yields (file_path, status, payload) tuples in input order.
+        status is "ok" (payload is the parse result), "error", "timeout" or "crashed"
+        (payload is a description of the failure).
+        """
+        pending = iter(enumerate(file_paths))
+        idle = list(self._pool)
+        busy = {}
+        done = {}
+        next_index = 0
+        exhausted = False
+
+        while True:
+            while idle and not exhausted:
+                try:
+                    index, file_path = next(pending)
+                except StopIteration:
+                    exhausted = True
+                    break
+                worker = idle.pop()
+                worker.conn.send(str(file_path))
+                busy[worker.conn] = (worker, index, file_path, time.monotonic() + self.timeout)
+
+            if busy:
+                nearest_deadline = min(entry[3] for entry in busy.values())
+                ready = wait(list(busy), timeout=max(0, nearest_deadline - time.monotonic()))
+                for conn in ready:
+                    worker, index, file_path, _ = busy.pop(conn)
+                    try:
+                        status, payload = conn.recv()
+                    except (EOFError, OSError):
+                        status, payload = "crashed", f"worker exited with code {worker.process.exitcode}"
+                        worker = self._replace(worker)
+                    done[index] = (file_path, status, payload)
+                    idle.append(worker)
+
+                now = time.monotonic()
+                for conn, (worker, index, file_path, deadline) in list(busy.items()):
+                    if deadline <= now:
+                        del busy[conn]
+                        done[index] = (file_path, "timeout", f"exceeded {self.timeout}s parse budget")
+                        idle.append(self._replace(worker))
+
+            while next_index in done:
+                yield done.pop(next_index)
+                next_index += 1
+
+            if exhausted and not busy and not done:
+                break
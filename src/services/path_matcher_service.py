@@ -0,0 +1,222 @@
+import os
+import re
+
+# Hidden and '_'-prefixed entries are never filtered, copied or removed: editor and VCS folders
+# (.git/, .idea/), macOS metadata (.DS_Store, ._Foo.java, __MACOSX/) and the like
+DEFAULT_IGNORE = (".*", "_*")
+
+GLOB_CHARS = frozenset("*?[\\")
+
+
+def _has_glob(text):
+    return any(char in GLOB_CHARS for char in text)
+
+
+def _translate(pattern):
+    """
+    Translates a gitignore-style glob into a regular expression over '/'-separated paths:
+    '*' and '?' stay within one path component, '**/' matches any number of leading
+    directories and a trailing '/**' everything inside a directory.
+    """
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        char = pattern[i]
+        if char == "*":
+            if pattern.startswith("**", i):
+                if pattern.startswith("**/", i):
+                    out.append("(?:.*/)?")
+                    i += 3
+                else:
+                    out.append(".*")
+                    i += 2
+                continue
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(char))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end + 1
+                continue
+        elif char == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return "".join(out)
+
+
+def _combine(expressions):
+    return re.compile("|".join(f"(?:{expression})" for expression in expressions)) if expressions else None
+
+
+class _Rules:
+    """
+    One group of compiled rules. Exact names are a set lookup, suffixes a set lookup per distinct
+    suffix length, and all remaining globs are folded into one regex each for names and paths, so
+    the cost of a match barely depends on the number of patterns.
+    """
+
+    def __init__(self):
+        self.names = set()
+        self.suffixes = {}  # length -> set of suffixes
+        self.name_globs = []
+        self.path_globs = []
+
+    def add_suffix(self, suffix):
+        self.suffixes.setdefault(len(suffix), set()).add(suffix)
+
+    def compile(self):
+        self.suffix_lengths = sorted(self.suffixes)
+        self.name_regex = _combine(self.name_globs)
+        self.path_regex = _combine(self.path_globs)
+
+    def __bool__(self):
+        return bool(self.names or self.suffixes or self.name_globs or self.path_globs)
+
+    def match(self, name, rel_path):
+        if name in self.names:
+            return True
+        for length in self.suffix_lengths:
+            if name[-length:] in self.suffixes[length]:
+                return True
+        if self.name_regex is not None and self.name_regex.fullmatch(name):
+            return True
+        return self.path_regex is not None and self.path_regex.fullmatch(rel_path) is not None
+
+
+class PathMatcher:
+    """
+    Compiled matcher for paths relative to a tree root (POSIX separators).
+
+    Params:
+      patterns (iterable): gitignore-style globs. A pattern without '/' matches a file or directory
+          name at any depth, one containing '/' is anchored at the root, and a trailing '/'
+          restricts it to directories. Negation ('!') is not supported.
+      names (iterable): Exact file names.
+      suffixes (iterable): File name suffixes such as ".java".
+    """
+
+    def __init__(self, patterns=(), names=(), suffixes=()):
+        self._any = _Rules()  # Files and directories
+        self._files = _Rules()
+        self._dirs = _Rules()
+        self._files.names.update(names)
+        for suffix in suffixes:
+            self._files.add_suffix(suffix)
+        for pattern in patterns:
+            self._add_pattern(pattern)
+        for rules in (self._any, self._files, self._dirs):
+            rules.compile()
+
+    def _add_pattern(self, pattern):
+        pattern = pattern.strip()
+        if not pattern or pattern.startswith("#"):
+            return
+        if pattern.startswith("!"):
+            raise ValueError(f"Negated patterns are not supported: {pattern}")
+        rules = self._any
+        if pattern.endswith("/"):
+            rules = self._dirs
+            pattern = pattern.rstrip("/")
+        if "/" in pattern:
+            rules.path_globs.append(_translate(pattern.lstrip("/")))
+        elif not _has_glob(pattern):
+            rules.names.add(pattern)
+        elif pattern.startswith("*") and pattern[1:] and not _has_glob(pattern[1:]):
+            rules.add_suffix(pattern[1:])
+        else:
+            rules.name_globs.append(_translate(pattern))
+
+    def __bool__(self):
+        return bool(self._any or self._files or self._dirs)
+
+    def match(self, rel_path, is_dir=False):
+        """
+        True if the file (or directory, when is_dir) at rel_path matches one of the rules.
+        """
+        name = rel_path.rsplit("/", 1)[-1]
+        if self._any.match(name, rel_path):
+            return True
+        return (self._dirs if is_dir else self._files).match(name, rel_path)
+
+    def match_path(self, rel_path):
+        """
+        True if the file at rel_path or any of its parent directories matches, for path lists
+        that were not produced by a pruned walk.
+        """
+        parts = rel_path.split("/")
+        for depth in range(1, len(parts)):
+            if self.match("/".join(parts[:depth]), is_dir=True):
+                return True
+        return self.match(rel_path)
+
+
+def compile_filter_list(filter_list, plain="names"):
+    """
+    Compiles a filter list into a PathMatcher. Entries containing glob characters or '/' are
+    gitignore-style patterns; the other entries are exact file names (plain="names") or file
+    name suffixes (plain="suffixes"), as the filename and extension filters have always used them.
+    """
+    if plain not in ("names", "suffixes"):
+        raise ValueError("plain must be 'names' or 'suffixes'")
+    patterns, plain_entries = [], []
+    for entry in filter_list:
+        (patterns if "/" in entry or _has_glob(entry) else plain_entries).append(entry)
+    if plain == "names":
+        return PathMatcher(patterns, names=plain_entries)
+    return PathMatcher(patterns, suffixes=plain_entries)
+
+
+def walk_files(source_folder, ignore=None, include=None, exclude=None, on_drop=None):
+    """
+    Walks source_folder and yields (file path, relative POSIX path) of the files to keep.
+    Excluded and ignored directories are pruned, so their subtrees are never descended into.
+
+    Params:
+      ignore (PathMatcher): Files and directories skipped silently.
+      include (PathMatcher): When given, only files that match (or lie in a matching directory) are kept.
+      exclude (PathMatcher): Files and directories dropped.
+      on_drop (callable): Called as on_drop(path, is_dir) for every dropped file and pruned
+          excluded directory (not for ignored ones).
+    """
+    included_dirs = {}  # Relative directory -> whether it matched include (or lies in one that did)
+    for root, dirs, files in os.walk(source_folder):
+        rel_root = os.path.relpath(root, source_folder).replace(os.sep, "/")
+        prefix = "" if rel_root == "." else rel_root + "/"
+        inside_included = included_dirs.pop(rel_root, False)
+
+        kept_dirs = []
+        for directory in dirs:
+            rel_path = prefix + directory
+            if ignore and ignore.match(rel_path, is_dir=True):
+                continue
+            if exclude and exclude.match(rel_path, is_dir=True):
+                if on_drop is not None:
+                    on_drop(os.path.join(root, directory), True)
+                continue
+            kept_dirs.append(directory)
+            if include:
+                included_dirs[rel_path] = inside_included or include.match(rel_path, is_dir=True)
+        dirs[:] = kept_dirs
+
+        for file in files:
+            rel_path = prefix + file
+            if ignore and ignore.match(rel_path):
+                continue
+            dropped = (exclude and exclude.match(rel_path)) \
+                or (include is not None and not inside_included and not include.match(rel_path))
+            if dropped:
+                if on_drop is not None:
+                    on_drop(os.path.join(root, file), False)
+                continue
+            yield os.path.join(root, file), rel_path
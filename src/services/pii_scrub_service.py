@@ -0,0 +1,382 @@
+import os
+import re
+import csv
+import hmac
+import json
+import hashlib
+import keyword
+import builtins
+from pathlib import Path
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from src.services.symbol_index_service import record_submission
+from src.services.profiling_service import worker_profile_dir, run_profiled
+
+ROSTER_PATH = "data/roster.csv"
+MIN_NAME_PART_LENGTH = 3  # Parts of full names shorter than this are too ambiguous to redact on their own
+SCRUB_CHUNK_LINES = 2000
+# Path keys later stages match on (incremental ingestion, symbol index): pseudonymized, not redacted
+SCRUB_KEEP_FIELDS = ("filepath", "submission")
+PSEUDONYM_KEY_ENV = "PII_PSEUDONYM_KEY"  # Optional secret so pseudonyms cannot be recomputed from known IDs
+
+STUDENT_PLACEHOLDER = "[STUDENT]"
+# Name parts that are also keywords or everyday identifiers (lower-cased) are not redacted on their own:
+# a student "Max Long" must not turn `long total = Math.max(a, b);` into placeholders
+JAVA_COMMON_IDENTIFIERS = (
+    "abstract assert boolean break byte case catch char class const continue default do double else enum "
+    "extends final finally float for goto if implements import instanceof int interface long native new "
+    "package private protected public return short static strictfp super switch synchronized this throw "
+    "throws transient try void volatile while var record yield true false null "
+    "object string integer character math system list map set array arrays collections optional stream "
+    "main test node value key item data result count index size name type next first last min max sum "
+    "left right start end input output line file path text number total"
+).split()
+COMMON_IDENTIFIERS = frozenset(
+    [word.lower() for word in keyword.kwlist] + [word.lower() for word in dir(builtins)] + JAVA_COMMON_IDENTIFIERS
+)
+# (placeholder, pattern); when a pattern has a group only the group is replaced, keeping the label
+PII_PATTERNS = (
+    ("[EMAIL]", re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}")),
+    # A label, a ':', '=' or '#' separator, then an ID-shaped token (letters, then optional digits)
+    ("[ID]", re.compile(r"(?i)\b(?:andrew\s*id|student\s*id|andrewid)\s*[:=#]\s*([A-Za-z]+[0-9]*)\b")),
+    ("[STUDENT]", re.compile(r"(?:@author\b|\bauthor\s*:)\s*([^\n*]+?)\s*(?:\*/|$)", re.IGNORECASE | re.MULTILINE)),
+)
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == "_"
+
+
+def _fold(text):
+    # Case-insensitive matching that keeps offsets aligned with the original text
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+class AhoCorasick:
+    """
+    Multi-pattern matcher: finds every occurrence of any of thousands of patterns in a single
+    left-to-right pass over the text, independent of the number of patterns. Case-insensitive
+    unless case_sensitive is set.
+    """
+
+    def __init__(self, patterns, case_sensitive=False):
+        self.case_sensitive = case_sensitive
+        self.goto = [{}]
+        self.fail = [0]
+        self.outputs = [()]  # Lengths of the patterns ending at each state
+        for pattern in patterns:
+            self._add(pattern if case_sensitive else _fold(pattern))
+        self._build()
+
+    def _add(self, pattern):
+        if not pattern:
+            return
+        state = 0
+        for char in pattern:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append(())
+            state = next_state
+        self.outputs[state] = self.outputs[state] + (len(pattern),)
+
+    def _build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+                queue.append(child)
+
+    def find_all(self, text):
+        """
+        Yields (start, end) spans of every pattern occurrence in text.
+        """
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        state = 0
+        for index, char in enumerate(text if self.case_sensitive else _fold(text)):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length in outputs[state]:
+                yield index - length + 1, index + 1
+
+
+# identifiers: whole roster cells (full names, Andrew IDs, emails), matched case-insensitively
+# name_parts: the individual parts of full names, matched case-sensitively
+Roster = namedtuple("Roster", ["identifiers", "name_parts"])
+
+
+def roster_identifiers(rows):
+    """
+    Turns roster rows (names, Andrew IDs, emails) into a Roster. Full names also contribute their
+    individual parts of at least MIN_NAME_PART_LENGTH characters, except parts that are keywords
+    or common identifiers (COMMON_IDENTIFIERS), which would corrupt code.
+    """
+    identifiers = set()
+    name_parts = set()
+    for row in rows:
+        for cell in row:
+            cell = cell.strip()
+            if not cell:
+                continue
+            identifiers.add(cell)
+            parts = cell.split()
+            if len(parts) > 1:
+                name_parts.update(part for part in parts if len(part) >= MIN_NAME_PART_LENGTH
+                                  and part.lower() not in COMMON_IDENTIFIERS)
+    return Roster(identifiers, name_parts - identifiers)
+
+
+def _roster_args(roster):
+    # (identifiers, name_parts) as sorted lists, from a Roster or a plain iterable of identifiers
+    if isinstance(roster, Roster):
+        return sorted(set(roster.identifiers)), sorted(set(roster.name_parts))
+    return sorted(set(roster)), []
+
+
+def load_roster(roster_path=ROSTER_PATH):
+    """
+    Reads a roster: a .csv file with a header row (e.g. name, andrew_id, email), or a plain list with
+    one identifier per line. Every non-empty cell other than the header is an identifier.
+    """
+    roster_path = Path(roster_path)
+    with roster_path.open("r", encoding="utf-8", newline="") as f:
+        rows = csv.reader(f)
+        if roster_path.suffix.lower() == ".csv":
+            next(rows, None)  # Column names such as "name" must not be redacted everywhere
+        return roster_identifiers(rows)
+
+
+class PIIScrubber:
+    """
+    Redacts student identifiers from text: the compiled PII_PATTERNS (emails, labelled IDs, @author
+    tags) first, then every roster identifier (case-insensitive) and name part (case-sensitive)
+    found as a whole word by one Aho-Corasick pass each.
+
+    Params:
+      identifiers (Roster or iterable): A Roster, or plain identifiers matched case-insensitively.
+      name_parts (iterable): Extra identifiers matched case-sensitively.
+    """
+
+    def __init__(self, identifiers=(), name_parts=()):
+        self.identifiers, parts = _roster_args(identifiers)
+        self.name_parts = sorted(set(parts) | set(name_parts))
+        self.automata = []
+        if self.identifiers:
+            self.automata.append(AhoCorasick(self.identifiers))
+        if self.name_parts:
+            self.automata.append(AhoCorasick(self.name_parts, case_sensitive=True))
+        self._path_identifiers = {identifier.lower() for identifier in self.identifiers}
+
+    def scrub(self, text):
+        """
+        Returns (scrubbed text, number of redactions).
+        """
+        redactions = 0
+        for placeholder, pattern in PII_PATTERNS:
+            text, count = pattern.subn(lambda match: _replace_match(match, placeholder), text)
+            redactions += count
+        if not self.automata:
+            return text, redactions
+
+        matches = [span for automaton in self.automata for span in automaton.find_all(text)]
+        spans = []
+        last_end = 0
+        # Leftmost-longest, non-overlapping, whole-word matches
+        for start, end in sorted(matches, key=lambda span: (span[0], -span[1])):
+            if start < last_end:
+                continue
+            if (start > 0 and _is_word_char(text[start - 1])) or (end < len(text) and _is_word_char(text[end])):
+                continue
+            spans.append((start, end))
+            last_end = end
+        if not spans:
+            return text, redactions
+
+        pieces = []
+        position = 0
+        for start, end in spans:
+            pieces.append(text[position:start])
+            pieces.append(STUDENT_PLACEHOLDER)
+            position = end
+        pieces.append(text[position:])
+        return "".join(pieces), redactions + len(spans)
+
+    def pseudonymize_path(self, path, submission, is_dir=False):
+        """
+        Replaces the directory components of a '/'-separated path that are the submission or a
+        roster identifier (whole component, case-insensitive) by their pseudonym. The file name
+        itself is kept unless is_dir is set.
+        """
+        parts = path.split("/")
+        directories = len(parts) if is_dir else len(parts) - 1
+        submission = (submission or "").lower()
+        for i in range(directories):
+            part = parts[i].lower()
+            if part and (part == submission or part in self._path_identifiers):
+                parts[i] = pseudonym(parts[i])
+        return "/".join(parts)
+
+    def scrub_record(self, record):
+        """
+        Scrubs a dataset record: its text through scrub_value, and its filepath and submission
+        through stable pseudonyms so records of one student still group and match together.
+        Returns (scrubbed record, number of redactions).
+        """
+        submission = record_submission(record)
+        record, redactions = self.scrub_value(record)
+        if "filepath" in record:
+            record["filepath"] = self.pseudonymize_path(record["filepath"], submission)
+        if record.get("submission"):
+            record["submission"] = pseudonym(record["submission"])
+        return record, redactions
+
+    def scrub_value(self, value, keep_fields=SCRUB_KEEP_FIELDS):
+        """
+        Scrubs every string inside a JSON value, except dict entries whose key is in keep_fields.
+        Returns (scrubbed value, number of redactions).
+        """
+        if isinstance(value, str):
+            return self.scrub(value)
+        if isinstance(value, list):
+            total = 0
+            items = []
+            for item in value:
+                item, count = self.scrub_value(item, keep_fields)
+                items.append(item)
+                total += count
+            return items, total
+        if isinstance(value, dict):
+            total = 0
+            scrubbed = {}
+            for key, item in value.items():
+                if key not in keep_fields:
+                    item, count = self.scrub_value(item, keep_fields)
+                    total += count
+                scrubbed[key] = item
+            return scrubbed, total
+        return value, 0
+
+
+def pseudonym(value):
+    """
+    Stable pseudonym of a submission or student identifier (case-insensitive), keyed by the
+    PII_PSEUDONYM_KEY environment variable, so the same student always maps to the same token.
+    """
+    key = os.environ.get(PSEUDONYM_KEY_ENV, "").encode("utf-8")
+    return "student-" + hmac.new(key, value.lower().encode("utf-8"), hashlib.sha256).hexdigest()[:12]
+
+
+def _replace_match(match, placeholder):
+    if not match.re.groups:
+        return placeholder
+    text, offset = match.group(0), match.start(0)
+    return text[:match.start(1) - offset] + placeholder + text[match.end(1) - offset:]
+
+
+# --- Parallel scrubbing -----------------------------------------------------------------------
+
+_worker_scrubber = None
+
+
+def _init_worker(identifiers, name_parts):
+    global _worker_scrubber
+    _worker_scrubber = PIIScrubber(identifiers, name_parts)
+
+
+def _scrub_lines(lines):
+    output = []
+    redactions = 0
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        record, count = _worker_scrubber.scrub_record(record)
+        output.append(json.dumps(record) + "\n")
+        redactions += count
+    return "".join(output), len(output), redactions
+
+
+def _scrub_texts(texts):
+    return [_worker_scrubber.scrub(text)[0] for text in texts]
+
+
+def _ordered_parallel_map(fn, chunks, roster, workers):
+    """
+    Applies fn to chunks in worker processes (each building its scrubber once) and yields the
+    results in input order, keeping at most a few chunks in flight so memory stays bounded.
+    Chunks are profiled in their worker when the request is profiled.
+    """
+    workers = max(1, workers or os.cpu_count() or 1)
+    roster_args = _roster_args(roster)
+    if workers == 1:
+        _init_worker(*roster_args)
+        for chunk in chunks:
+            yield fn(chunk)
+        return
+    profile_dir = worker_profile_dir()
+    task = (fn,) if profile_dir is None else (run_profiled, profile_dir, fn)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=roster_args) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(*task, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def scrub_dataset_file(dataset_file, identifiers=(), output_file=None, workers=None, chunk_lines=SCRUB_CHUNK_LINES):
+    """
+    Scrubs every record of a JSONL dataset in parallel over chunks of lines, preserving record
+    order. Writes to output_file, or replaces dataset_file when output_file is None.
+
+    Returns:
+        dict: {"records": records written, "redactions": number of redacted spans}
+    """
+    dataset_file = Path(dataset_file)
+    target = Path(output_file) if output_file is not None else dataset_file
+    tmp_file = target.with_name(target.name + ".scrub.tmp")
+    stats = {"records": 0, "redactions": 0}
+    with dataset_file.open("r", encoding="utf-8") as infile, tmp_file.open("w", encoding="utf-8") as outfile:
+        for text, records, redactions in _ordered_parallel_map(
+                _scrub_lines, _chunks(infile, chunk_lines), identifiers, workers):
+            outfile.write(text)
+            stats["records"] += records
+            stats["redactions"] += redactions
+    os.replace(tmp_file, target)
+    return stats
+
+
+def scrub_texts(texts, identifiers=(), workers=None, chunk_size=64):
+    """
+    Scrubs a list of free-form texts (e.g. code/feedback pairs) in parallel, preserving order.
+    """
+    scrubbed = []
+    for chunk in _ordered_parallel_map(_scrub_texts, _chunks(texts, chunk_size), identifiers, workers):
+        scrubbed.extend(chunk)
+    return scrubbed
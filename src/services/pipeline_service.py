@@ -0,0 +1,247 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from src.services.fingerprint_service import fingerprint_paths
+
+CACHE_FILENAME = ".pipeline_cache.json"
+
+
+def _clear(path):
+    path = Path(path)
+    if path.is_dir():
+        shutil.rmtree(path)
+    elif path.exists():
+        path.unlink()
+
+
+def op_unzip(inputs, outputs, params):
+    from src.services.unzip_service import recursive_unzip, find_archives
+    from src.services.view_service import delete_views_of
+
+    _clear(outputs[0])
+    delete_views_of(outputs[0])
+    return len(recursive_unzip(find_archives(inputs[0]), outputs[0]))
+
+
+def op_file_ext_filter(inputs, outputs, params):
+    from src.services.file_filtering_service import file_ext_filter
+    from src.services.view_service import delete_views_of
+
+    _clear(outputs[0])
+    delete_views_of(outputs[0])
+    Path(outputs[0]).mkdir(parents=True, exist_ok=True)
+    return sum(file_ext_filter(inputs[0], params["filter_list"], params["filter_type"], outputs[0],
+                               exclude=params.get("exclude", ())).values())
+
+
+def op_file_name_filter(inputs, outputs, params):
+    from src.services.view_service import create_name_view
+
+    # Selects instead of copying and deleting: the output is the view manifest <views_dir>/<name>.json,
+    # which an extraction stage takes as its second input
+    view_path = Path(outputs[0])
+    if view_path.suffix != ".json":
+        raise ValueError(f"file_name_filter output must be a view manifest (.json): {outputs[0]}")
+    view = create_name_view(view_path.stem, inputs[0], params["filter_list"], params["filter_type"],
+                            views_dir=view_path.parent)
+    return len(view["paths"])
+
+
+def op_extraction(inputs, outputs, params):
+    from src.services.extraction_service import extract_data_from_division
+    from src.services.view_service import load_view
+
+    options = {key: value for key, value in params.items() if key != "division"}
+    if len(inputs) > 1:
+        # A view of inputs[0] written by a file_name_filter stage
+        view = load_view(Path(inputs[1]).stem, Path(inputs[1]).parent)
+        if Path(view["base"]).resolve() != Path(inputs[0]).resolve():
+            raise ValueError(f"View {inputs[1]} does not select from {inputs[0]}")
+        options["selection"] = view["paths"]
+    return extract_data_from_division(inputs[0], params["division"], outputs[0], **options)
+
+
+def op_process(inputs, outputs, params):
+    from src.services.dataset_processing_service import process_dataset
+
+    return process_dataset(
+        inputs[0], params["dataset_division"], (params["filter_type"], params["filter_list"]), outputs[0]
+    )
+
+
+OPS = {
+    "unzip": op_unzip,
+    "file_ext_filter": op_file_ext_filter,
+    "file_name_filter": op_file_name_filter,
+    "extraction": op_extraction,
+    "process": op_process,
+}
+
+
+def run_stage(op, inputs, outputs, params):
+    """
+    Executes one stage (in a worker process). Returns the op's result.
+    """
+    return OPS[op](inputs, outputs, params)
+
+
+def load_spec(spec_path):
+    """
+    Loads a pipeline spec from a .json, .yaml or .yml file. YAML requires PyYAML.
+    """
+    spec_path = Path(spec_path)
+    with spec_path.open("r", encoding="utf-8") as f:
+        if spec_path.suffix.lower() in (".yaml", ".yml"):
+            import yaml
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def build_graph(spec):
+    """
+    Validates the spec and returns (stages, dependencies). A stage depends on every stage whose
+    outputs it reads (an output path itself or a file inside it), plus any stage listed in its
+    optional "after" list.
+
+    Spec format:
+      {"stages": {"<name>": {"op": ..., "inputs": [...], "outputs": [...], "params": {...}, "after": [...]}}}
+    """
+    stages = spec.get("stages")
+    if not isinstance(stages, dict) or not stages:
+        raise ValueError("Pipeline spec must define a non-empty 'stages' mapping.")
+
+    producers = {}
+    for name, stage in stages.items():
+        if stage.get("op") not in OPS:
+            raise ValueError(f"Stage '{name}' has unknown op '{stage.get('op')}'. Known ops: {sorted(OPS)}")
+        stage.setdefault("inputs", [])
+        stage.setdefault("outputs", [])
+        stage.setdefault("params", {})
+        for output in stage["outputs"]:
+            key = os.path.normpath(output)
+            if key in producers:
+                raise ValueError(f"Output '{output}' is produced by both '{producers[key]}' and '{name}'.")
+            producers[key] = name
+
+    dependencies = {}
+    for name, stage in stages.items():
+        deps = {producer for i in stage["inputs"] for producer in [_producer_of(i, producers)] if producer}
+        for after in stage.get("after", []):
+            if after not in stages:
+                raise ValueError(f"Stage '{name}' runs after unknown stage '{after}'.")
+            deps.add(after)
+        deps.discard(name)
+        dependencies[name] = deps
+
+    # Reject cycles up front (Kahn's algorithm)
+    remaining = {name: set(deps) for name, deps in dependencies.items()}
+    while remaining:
+        roots = [name for name, deps in remaining.items() if not deps]
+        if not roots:
+            raise ValueError(f"Pipeline has a dependency cycle among: {sorted(remaining)}")
+        for root in roots:
+            del remaining[root]
+        for deps in remaining.values():
+            deps.difference_update(roots)
+
+    return stages, dependencies
+
+
+def _producer_of(path, producers):
+    """
+    Returns the stage whose output is path or a directory containing it (e.g. a dataset file
+    written inside an extraction's output folder), or None.
+    """
+    key = os.path.normpath(path)
+    while True:
+        if key in producers:
+            return producers[key]
+        parent = os.path.dirname(key)
+        if parent == key or not parent:
+            return None
+        key = parent
+
+
+def stage_fingerprint(stage):
+    definition = json.dumps(
+        {key: stage[key] for key in ("op", "inputs", "outputs", "params")}, sort_keys=True, default=str
+    )
+    return hashlib.sha256((definition + fingerprint_paths(stage["inputs"])).encode()).hexdigest()
+
+
+def run_pipeline(spec, cache_file=CACHE_FILENAME, max_workers=None, force=False):
+    """
+    Runs a pipeline spec as a DAG. Independent stages run in parallel worker processes. A stage
+    is skipped ("cached") when its op, params and input fingerprint match the last successful run
+    and its outputs are unchanged since then. A failed stage blocks its dependents only.
+
+    Params:
+      spec (dict): Pipeline spec (see build_graph).
+      cache_file (str or Path): Where stage fingerprints are persisted between runs.
+      max_workers (int): Maximum number of stages running at once (defaults to the CPU count).
+      force (bool): Ignore the cache and run every stage.
+
+    Returns:
+      dict: {"<stage>": {"status": "ran" | "cached" | "failed" | "blocked", ...}}
+    """
+    stages, dependencies = build_graph(spec)
+    cache_file = Path(cache_file)
+    cache = {}
+    if cache_file.exists() and not force:
+        with cache_file.open("r", encoding="utf-8") as f:
+            cache = json.load(f)
+
+    results = {}
+    running = {}
+    pending = set(stages)
+
+    def save_cache():
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with cache_file.open("w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=2)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            for name in sorted(pending):
+                deps = dependencies[name]
+                if any(results.get(dep, {}).get("status") in ("failed", "blocked") for dep in deps):
+                    results[name] = {"status": "blocked"}
+                    pending.discard(name)
+                    continue
+                if not all(dep in results for dep in deps):
+                    continue
+
+                pending.discard(name)
+                stage = stages[name]
+                fingerprint = stage_fingerprint(stage)
+                cached = cache.get(name, {})
+                if cached.get("fingerprint") == fingerprint \
+                        and cached.get("outputs") == fingerprint_paths(stage["outputs"]):
+                    results[name] = {"status": "cached"}
+                    continue
+                future = executor.submit(run_stage, stage["op"], stage["inputs"], stage["outputs"], stage["params"])
+                running[future] = (name, fingerprint, time.perf_counter())
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, fingerprint, start = running.pop(future)
+                elapsed = round(time.perf_counter() - start, 3)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    results[name] = {"status": "failed", "error": str(e), "seconds": elapsed}
+                    cache.pop(name, None)
+                    continue
+                results[name] = {"status": "ran", "result": result, "seconds": elapsed}
+                cache[name] = {"fingerprint": fingerprint, "outputs": fingerprint_paths(stages[name]["outputs"])}
+                save_cache()
+
+    save_cache()
+    return results
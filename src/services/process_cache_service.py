@@ -0,0 +1,177 @@
+import os
+import json
+import time
+import uuid
+import shutil
+import hashlib
+from pathlib import Path
+
+from src.services.fingerprint_service import file_content_hash
+from src.services.dataset_processing_service import process_dataset
+
+PROCESS_CACHE_DIR = "data/processed/cache"
+PROCESS_CACHE_BUDGET_BYTES = 2 * 1024 ** 3
+PROCESSED_FILENAME = "processed_dataset.jsonl"
+META_FILENAME = "meta.json"
+ORPHAN_GRACE_SECONDS = 3600  # Meta-less entries older than this are left over from crashed builds
+
+
+def normalize_filter(filter_tuple):
+    """
+    Canonical form of a (filter_type, filters) tuple: order and repeats in the filter list do not
+    change the result, so ("out", ["b", "a", "a"]) and ("out", ["a", "b"]) share a cache entry.
+    """
+    filter_type, filters = filter_tuple
+    return filter_type, sorted(set(filters))
+
+
+def cache_key(input_hash, dataset_division, filter_tuple, feature_thresholds=None):
+    filter_type, filters = normalize_filter(filter_tuple)
+    spec = json.dumps([input_hash, dataset_division, filter_type, filters, feature_thresholds or {}], sort_keys=True)
+    return hashlib.sha256(spec.encode("utf-8")).hexdigest()
+
+
+def _directory_size(path):
+    return sum(f.stat().st_size for f in Path(path).rglob("*") if f.is_file())
+
+
+def list_cache_entries(cache_dir=PROCESS_CACHE_DIR):
+    """
+    Returns the complete cache entries, least recently used first. An entry is a directory holding
+    the processed dataset and a meta.json whose mtime records the last use.
+    """
+    root = Path(cache_dir)
+    if not root.exists():
+        return []
+    entries = []
+    for meta_file in root.glob(f"*/{META_FILENAME}"):
+        try:
+            last_used = meta_file.stat().st_mtime
+        except OSError:
+            continue  # Evicted concurrently
+        entries.append({"key": meta_file.parent.name, "path": meta_file.parent, "last_used": last_used})
+    return sorted(entries, key=lambda entry: entry["last_used"])
+
+
+def sweep_orphan_entries(cache_dir=PROCESS_CACHE_DIR, grace_seconds=ORPHAN_GRACE_SECONDS):
+    """
+    Deletes directories without a meta.json (builds that crashed before completing) once they are
+    older than grace_seconds, so builds still in progress elsewhere are left alone.
+
+    Returns:
+        list: The names of the deleted directories.
+    """
+    root = Path(cache_dir)
+    if not root.exists():
+        return []
+    cutoff = time.time() - grace_seconds
+    swept = []
+    for path in root.iterdir():
+        try:
+            if not path.is_dir() or (path / META_FILENAME).exists() or path.stat().st_mtime > cutoff:
+                continue
+        except OSError:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        swept.append(path.name)
+    return sorted(swept)
+
+
+def evict_cache_entries(cache_dir=PROCESS_CACHE_DIR, budget_bytes=PROCESS_CACHE_BUDGET_BYTES, keep=()):
+    """
+    Sweeps orphaned builds (see sweep_orphan_entries), then deletes least recently used entries
+    until the cache fits in budget_bytes. Entries in keep are never evicted.
+
+    Returns:
+        list: The evicted cache keys.
+    """
+    sweep_orphan_entries(cache_dir)
+    entries = list_cache_entries(cache_dir)
+    sizes = {entry["key"]: _directory_size(entry["path"]) for entry in entries}
+    total = sum(sizes.values())
+    evicted = []
+    for entry in entries:
+        if total <= budget_bytes:
+            break
+        if entry["key"] in keep:
+            continue
+        shutil.rmtree(entry["path"], ignore_errors=True)
+        total -= sizes[entry["key"]]
+        evicted.append(entry["key"])
+    return evicted
+
+
+def _publish(cached_file, destination_folder):
+    """
+    Points destination_folder/processed_dataset.jsonl at a cached result (hard link, or a copy
+    where links are not supported), replacing the previous file atomically.
+    """
+    destination = Path(destination_folder) / PROCESSED_FILENAME
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    if destination.exists() and os.path.samefile(cached_file, destination):
+        return destination  # Already published; renaming a link onto itself would be a no-op
+    temp_path = destination.with_name(f".{destination.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        try:
+            os.link(cached_file, temp_path)
+        except OSError:
+            shutil.copyfile(cached_file, temp_path)
+        os.replace(temp_path, destination)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+    return destination
+
+
+def cached_process_dataset(input_filepath, dataset_division, filter_tuple, destination_folder,
+                           cache_dir=PROCESS_CACHE_DIR, budget_bytes=PROCESS_CACHE_BUDGET_BYTES, workers=None,
+                           feature_thresholds=None):
+    """
+    Memoized process_dataset. Results are kept side by side in cache_dir, keyed by the input
+    dataset's content hash, the division, the normalized filter spec and the feature thresholds,
+    so a repeated or equivalent request is answered without rescanning the input. The cache is
+    kept under budget_bytes by evicting the least recently used results.
+
+    The result is also published as destination_folder/processed_dataset.jsonl, which keeps
+    pointing at the latest processed dataset. Entries are built in a temporary directory and
+    renamed into place once their meta.json exists, so a crashed build never looks complete.
+
+    Returns:
+        tuple: (path to the processed dataset, True if it was served from the cache)
+    """
+    filter_type, filters = normalize_filter(filter_tuple)
+    key = cache_key(file_content_hash(input_filepath), dataset_division, (filter_type, filters), feature_thresholds)
+    entry_dir = Path(cache_dir) / key
+    meta_file = entry_dir / META_FILENAME
+    cached_file = entry_dir / PROCESSED_FILENAME
+
+    if meta_file.exists() and cached_file.exists():
+        meta_file.touch()
+        return _publish(cached_file, destination_folder), True
+
+    build_dir = entry_dir.with_name(f".{key}.{uuid.uuid4().hex}.tmp")
+    try:
+        process_dataset(input_filepath, dataset_division, (filter_type, filters), build_dir, workers=workers,
+                        feature_thresholds=feature_thresholds)
+        with (build_dir / META_FILENAME).open("w", encoding="utf-8") as f:
+            json.dump({
+                "key": key,
+                "input": str(input_filepath),
+                "dataset_division": dataset_division,
+                "filter_type": filter_type,
+                "filter_list": filters,
+                "feature_thresholds": feature_thresholds,
+                "created_at": time.time(),
+            }, f, indent=2)
+        if entry_dir.exists() and not meta_file.exists():
+            shutil.rmtree(entry_dir, ignore_errors=True)  # Left behind without meta by an older version
+        try:
+            os.rename(build_dir, entry_dir)
+        except OSError:
+            if not meta_file.exists():
+                raise
+            # An identical entry was completed concurrently; keep that one
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
+    evict_cache_entries(cache_dir, budget_bytes, keep={key})
+    return _publish(cached_file, destination_folder), False
@@ -0,0 +1,129 @@
+import io
+import os
+import json
+import time
+import uuid
+import pstats
+import shutil
+import cProfile
+import threading
+from pathlib import Path
+
+PROFILE_DIR = "data/profiles"
+MAX_STORED_PROFILES = 20
+PROFILE_FILENAME = "profile.prof"
+META_FILENAME = "meta.json"
+
+_active = threading.local()
+
+
+def worker_profile_dir():
+    """
+    Returns the directory pool workers started from the current thread should write their
+    profiles to, or None when the current request is not being profiled.
+    """
+    return getattr(_active, "worker_dir", None)
+
+
+def run_profiled(profile_dir, fn, *args):
+    """
+    Runs fn(*args) under cProfile and dumps the stats to profile_dir/worker-<pid>-<id>.prof.
+    Used by pool workers so their work shows up in the request profile; every call gets its own
+    file, so a worker running several pool tasks keeps them all.
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return fn(*args)
+    finally:
+        profiler.disable()
+        profiler.dump_stats(str(Path(profile_dir) / f"worker-{os.getpid()}-{uuid.uuid4().hex}.prof"))
+
+
+class RequestProfile:
+    """
+    Profiles the current thread with cProfile between start() and stop(). Pool workers created
+    in between (see worker_profile_dir) add their own stats, which stop() merges into one
+    profile stored under PROFILE_DIR/<profile_id>/.
+    """
+
+    def __init__(self, profile_root=PROFILE_DIR):
+        self.profile_id = uuid.uuid4().hex
+        self.profile_root = Path(profile_root)
+        self.directory = self.profile_root / self.profile_id
+        self.worker_dir = self.directory / "workers"
+        self._profiler = cProfile.Profile()
+        self._started_at = None
+
+    def start(self):
+        self.worker_dir.mkdir(parents=True, exist_ok=True)
+        _active.worker_dir = str(self.worker_dir)
+        self._started_at = time.time()
+        self._profiler.enable()
+
+    def stop(self, meta=None):
+        self._profiler.disable()
+        _active.worker_dir = None
+
+        stats = pstats.Stats(self._profiler)
+        worker_files = sorted(self.worker_dir.glob("*.prof"))
+        for worker_file in worker_files:
+            stats.add(str(worker_file))
+        stats.dump_stats(str(self.directory / PROFILE_FILENAME))
+        shutil.rmtree(self.worker_dir, ignore_errors=True)
+
+        meta = {
+            "profile_id": self.profile_id,
+            "created_at": self._started_at,
+            "duration_seconds": round(time.time() - self._started_at, 6),
+            "worker_profiles": len(worker_files),
+            **(meta or {}),
+        }
+        with (self.directory / META_FILENAME).open("w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        prune_profiles(self.profile_root)
+        return meta
+
+
+def prune_profiles(profile_root=PROFILE_DIR, keep=MAX_STORED_PROFILES):
+    directories = sorted(
+        (d for d in Path(profile_root).iterdir() if d.is_dir()), key=lambda d: d.stat().st_mtime, reverse=True
+    )
+    for stale in directories[keep:]:
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+def list_profiles(profile_root=PROFILE_DIR):
+    """
+    Returns the metadata of stored profiles, newest first.
+    """
+    profiles = []
+    root = Path(profile_root)
+    if not root.exists():
+        return profiles
+    for meta_file in root.glob(f"*/{META_FILENAME}"):
+        with meta_file.open("r", encoding="utf-8") as f:
+            profiles.append(json.load(f))
+    return sorted(profiles, key=lambda meta: meta["created_at"], reverse=True)
+
+
+def profile_path(profile_id, profile_root=PROFILE_DIR):
+    """
+    Returns the path to a stored profile (pstats format), or None if it does not exist.
+    """
+    if not profile_id.isalnum():
+        return None
+    path = Path(profile_root) / profile_id / PROFILE_FILENAME
+    return path if path.exists() else None
+
+
+def profile_report(profile_id, sort="cumulative", limit=50, profile_root=PROFILE_DIR):
+    """
+    Renders the top `limit` entries of a stored profile as pstats text, or None if it does not exist.
+    """
+    path = profile_path(profile_id, profile_root)
+    if path is None:
+        return None
+    out = io.StringIO()
+    pstats.Stats(str(path), stream=out).sort_stats(sort).print_stats(limit)
+    return out.getvalue()
@@ -0,0 +1,277 @@
+import io
+import ast
+import textwrap
+import tokenize
+import javalang
+
+# Features stored under "features" on every extracted method and class
+QUALITY_FEATURES = (
+    "line_count",
+    "token_count",
+    "cyclomatic_complexity",
+    "nesting_depth",
+    "comment_ratio",
+    "is_trivial",
+)
+
+JAVA_DECISION_NODES = (
+    javalang.tree.IfStatement,
+    javalang.tree.WhileStatement,
+    javalang.tree.DoStatement,
+    javalang.tree.ForStatement,
+    javalang.tree.CatchClause,
+    javalang.tree.TernaryExpression,
+)
+JAVA_NESTING_NODES = (
+    javalang.tree.IfStatement,
+    javalang.tree.WhileStatement,
+    javalang.tree.DoStatement,
+    javalang.tree.ForStatement,
+    javalang.tree.SwitchStatement,
+    javalang.tree.TryStatement,
+    javalang.tree.SynchronizedStatement,
+)
+# match statements only exist on Python 3.10+; the service image runs 3.9
+PYTHON_MATCH_CASE_NODES = (ast.match_case,) if hasattr(ast, "match_case") else ()
+PYTHON_MATCH_NODES = (ast.Match,) if hasattr(ast, "Match") else ()
+PYTHON_DECISION_NODES = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.IfExp, ast.ExceptHandler) + PYTHON_MATCH_CASE_NODES
+PYTHON_NESTING_NODES = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.With, ast.AsyncWith, ast.Try) + PYTHON_MATCH_NODES
+PYTHON_NON_CODE_TOKENS = (
+    tokenize.COMMENT, tokenize.NL, tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT,
+    tokenize.ENDMARKER, tokenize.ENCODING,
+)
+
+
+def _ratio(part, whole):
+    return round(part / whole, 4) if whole else 0.0
+
+
+def _line_count(content):
+    return content.count("\n") + 1 if content else 0
+
+
+def _nonblank_lines(content):
+    return sum(1 for line in content.splitlines() if line.strip())
+
+
+# --- Java -------------------------------------------------------------------------------------
+
+def _java_children(node):
+    for child in node.children:
+        if isinstance(child, javalang.ast.Node):
+            yield child
+        elif isinstance(child, (list, tuple)):
+            for item in child:
+                if isinstance(item, javalang.ast.Node):
+                    yield item
+
+
+def _java_complexity(node):
+    decisions = 0
+    for _, child in node:
+        if isinstance(child, JAVA_DECISION_NODES):
+            decisions += 1
+        elif isinstance(child, javalang.tree.SwitchStatementCase):
+            decisions += len(child.case or [])  # "default:" adds no path
+        elif isinstance(child, javalang.tree.BinaryOperation) and child.operator in ("&&", "||"):
+            decisions += 1
+    return 1 + decisions
+
+
+def _java_nesting(node, depth=0):
+    if isinstance(node, JAVA_NESTING_NODES):
+        depth += 1
+    deepest = depth
+    for child in _java_children(node):
+        # "else if" continues the same chain rather than nesting one level deeper
+        is_else_if = isinstance(node, javalang.tree.IfStatement) and child is node.else_statement \
+            and isinstance(child, javalang.tree.IfStatement)
+        deepest = max(deepest, _java_nesting(child, depth - 1 if is_else_if else depth))
+    return deepest
+
+
+def _java_token_count(content):
+    try:
+        return sum(1 for _ in javalang.tokenizer.tokenize(content))
+    except Exception:
+        return len(content.split())
+
+
+def _java_comment_lines(content):
+    """
+    Counts the lines of Java source that contain (part of) a comment, skipping string and char literals.
+    """
+    lines = set()
+    line = 0
+    i = 0
+    state = None  # None, "line", "block", '"' or "'"
+    while i < len(content):
+        char = content[i]
+        pair = content[i:i + 2]
+        if char == "\n":
+            line += 1
+            if state == "line":
+                state = None
+        elif state is None:
+            if pair == "//":
+                state = "line"
+                lines.add(line)
+            elif pair == "/*":
+                state = "block"
+                lines.add(line)
+                i += 1
+            elif char in "\"'":
+                state = char
+        elif state == "block":
+            lines.add(line)
+            if pair == "*/":
+                state = None
+                i += 1
+        elif state in "\"'":
+            if char == "\\":
+                i += 1
+            elif char == state:
+                state = None
+        i += 1
+    return len(lines)
+
+
+def _is_java_field_reference(expression):
+    if isinstance(expression, javalang.tree.This):
+        selectors = expression.selectors or []
+        return len(selectors) == 1 and isinstance(selectors[0], javalang.tree.MemberReference)
+    return isinstance(expression, javalang.tree.MemberReference) and not expression.selectors
+
+
+def is_trivial_java_method(node):
+    """
+    True for getters (no parameters, body is `return field;`) and setters (one parameter,
+    body is `field = parameter;`).
+    """
+    body = node.body or []
+    if len(body) != 1:
+        return False
+    statement = body[0]
+    if not node.parameters and isinstance(statement, javalang.tree.ReturnStatement):
+        return statement.expression is not None and _is_java_field_reference(statement.expression)
+    if len(node.parameters) == 1 and isinstance(statement, javalang.tree.StatementExpression):
+        assignment = statement.expression
+        return isinstance(assignment, javalang.tree.Assignment) and assignment.type == "=" \
+            and _is_java_field_reference(assignment.expressionl) \
+            and isinstance(assignment.value, javalang.tree.MemberReference) \
+            and assignment.value.member == node.parameters[0].name
+    return False
+
+
+def java_quality_features(node, content):
+    """
+    Quality features of a javalang MethodDeclaration or ClassDeclaration whose source block is content.
+    A class is trivial when all of its methods are getters or setters.
+    """
+    if isinstance(node, javalang.tree.ClassDeclaration):
+        is_trivial = all(is_trivial_java_method(method) for method in node.methods)
+    else:
+        is_trivial = is_trivial_java_method(node)
+    return {
+        "line_count": _line_count(content),
+        "token_count": _java_token_count(content),
+        "cyclomatic_complexity": _java_complexity(node),
+        "nesting_depth": _java_nesting(node),
+        "comment_ratio": _ratio(_java_comment_lines(content), _nonblank_lines(content)),
+        "is_trivial": is_trivial,
+    }
+
+
+# --- Python -----------------------------------------------------------------------------------
+
+def _python_complexity(node):
+    decisions = 0
+    for child in ast.walk(node):
+        if isinstance(child, PYTHON_DECISION_NODES):
+            decisions += 1
+        elif isinstance(child, ast.BoolOp):
+            decisions += len(child.values) - 1
+        elif isinstance(child, ast.comprehension):
+            decisions += 1 + len(child.ifs)
+    return 1 + decisions
+
+
+def _python_nesting(node, depth=0):
+    if isinstance(node, PYTHON_NESTING_NODES):
+        depth += 1
+    deepest = depth
+    for child in ast.iter_child_nodes(node):
+        # "elif" is an If alone in the orelse of its parent If
+        is_elif = isinstance(node, ast.If) and isinstance(child, ast.If) and node.orelse == [child]
+        deepest = max(deepest, _python_nesting(child, depth - 1 if is_elif else depth))
+    return deepest
+
+
+def _python_tokens(code, node):
+    """
+    Returns (token count, comment line count) of node's source, which is dedented first so a
+    method can be tokenized on its own.
+    """
+    segment = ast.get_source_segment(code, node, padded=True) or ""
+    tokens = 0
+    comment_lines = set()
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(textwrap.dedent(segment)).readline):
+            if token.type == tokenize.COMMENT:
+                comment_lines.add(token.start[0])
+            elif token.type not in PYTHON_NON_CODE_TOKENS:
+                tokens += 1
+    except (tokenize.TokenError, IndentationError, SyntaxError):
+        tokens = len(segment.split())
+    return tokens, len(comment_lines)
+
+
+def _statements_without_docstring(body):
+    if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) \
+            and isinstance(body[0].value.value, str):
+        return body[1:]
+    return body
+
+
+def _is_self_attribute(expression):
+    return isinstance(expression, ast.Attribute) and isinstance(expression.value, ast.Name) \
+        and expression.value.id == "self"
+
+
+def is_trivial_python_method(node):
+    """
+    True for getters (only self, body is `return self.field`) and setters (self and one argument,
+    body is `self.field = argument`). A docstring is ignored.
+    """
+    body = _statements_without_docstring(node.body)
+    if len(body) != 1:
+        return False
+    statement = body[0]
+    arguments = [arg.arg for arg in node.args.args]
+    if len(arguments) == 1 and isinstance(statement, ast.Return):
+        return _is_self_attribute(statement.value)
+    if len(arguments) == 2 and isinstance(statement, ast.Assign):
+        return len(statement.targets) == 1 and _is_self_attribute(statement.targets[0]) \
+            and isinstance(statement.value, ast.Name) and statement.value.id == arguments[1]
+    return False
+
+
+def python_quality_features(node, code, content):
+    """
+    Quality features of an ast FunctionDef or ClassDef parsed from code, whose source is content.
+    A class is trivial when all of its methods other than __init__ are getters or setters.
+    """
+    if isinstance(node, ast.ClassDef):
+        methods = [child for child in node.body if isinstance(child, ast.FunctionDef) and child.name != "__init__"]
+        is_trivial = all(is_trivial_python_method(method) for method in methods)
+    else:
+        is_trivial = is_trivial_python_method(node)
+    tokens, comment_lines = _python_tokens(code, node)
+    return {
+        "line_count": _line_count(content),
+        "token_count": tokens,
+        "cyclomatic_complexity": _python_complexity(node),
+        "nesting_depth": _python_nesting(node),
+        "comment_ratio": _ratio(comment_lines, _nonblank_lines(content)),
+        "is_trivial": is_trivial,
+    }
@@ -0,0 +1,174 @@
+import os
+import time
+import uuid
+import sqlite3
+from pathlib import Path
+
+from src.services.symbol_index_service import submission_from_filepath
+
+RESULT_SET_DB_PATH = "data/index/result_sets.db"
+KEEP_RESULT_SETS_PER_KIND = 5  # Older result sets of the same kind are dropped
+SUMMARY_TOP_N = 100  # Largest submissions reported in a summary
+DEFAULT_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 10000
+INSERT_BATCH_SIZE = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS result_sets (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    root TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS result_files (
+    result_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    extension TEXT NOT NULL,
+    submission TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (result_id, seq)
+) WITHOUT ROWID;
+"""
+
+
+def connect(db_path=RESULT_SET_DB_PATH):
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def iter_tree_files(root):
+    """
+    Yields every file under root, for result sets that describe a whole output tree.
+    """
+    for dirpath, dirs, files in os.walk(root):
+        dirs.sort()
+        for file in sorted(files):
+            yield Path(dirpath) / file
+
+
+def store_result_set(kind, file_paths, root, db_path=RESULT_SET_DB_PATH):
+    """
+    Stores the files produced by an unzip or filter run so they can be summarized and paged
+    through without returning them all in one response.
+
+    Params:
+      kind (str): Result set kind, e.g. "unzip", "fileext" or "filename".
+      file_paths (iterable): Paths of the produced files (streamed, never held in memory at once).
+      root (str or Path): Directory the paths are reported relative to.
+
+    Returns:
+      str: The result set id.
+    """
+    root = Path(root)
+    result_id = uuid.uuid4().hex
+
+    def rows():
+        for seq, file_path in enumerate(file_paths):
+            file_path = Path(file_path)
+            try:
+                relative_path = file_path.relative_to(root)
+            except ValueError:
+                relative_path = file_path
+            try:
+                size = file_path.stat().st_size
+            except OSError:
+                size = 0
+            yield (result_id, seq, relative_path.as_posix(), file_path.suffix.lower(),
+                   submission_from_filepath(relative_path), size)
+
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.execute("INSERT INTO result_sets (id, kind, root, created_at) VALUES (?, ?, ?, ?)",
+                         (result_id, kind, str(root), time.time()))
+            batch = []
+            for row in rows():
+                batch.append(row)
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    conn.executemany("INSERT INTO result_files VALUES (?, ?, ?, ?, ?, ?)", batch)
+                    batch = []
+            if batch:
+                conn.executemany("INSERT INTO result_files VALUES (?, ?, ?, ?, ?, ?)", batch)
+
+            stale = [row["id"] for row in conn.execute(
+                "SELECT id FROM result_sets WHERE kind = ? ORDER BY created_at DESC LIMIT -1 OFFSET ?",
+                (kind, KEEP_RESULT_SETS_PER_KIND)
+            )]
+            for stale_id in stale:
+                conn.execute("DELETE FROM result_files WHERE result_id = ?", (stale_id,))
+                conn.execute("DELETE FROM result_sets WHERE id = ?", (stale_id,))
+    finally:
+        conn.close()
+    return result_id
+
+
+def summarize_result_set(result_id, db_path=RESULT_SET_DB_PATH):
+    """
+    Returns counts by extension, the SUMMARY_TOP_N largest submissions by file count and totals,
+    or None if the result set does not exist.
+    """
+    conn = connect(db_path)
+    try:
+        meta = conn.execute("SELECT kind, created_at FROM result_sets WHERE id = ?", (result_id,)).fetchone()
+        if meta is None:
+            return None
+        totals = conn.execute(
+            "SELECT COUNT(*) AS files, COALESCE(SUM(size), 0) AS bytes, COUNT(DISTINCT submission) AS submissions "
+            "FROM result_files WHERE result_id = ?", (result_id,)
+        ).fetchone()
+        by_extension = {
+            row["extension"] or "<none>": {"files": row["files"], "bytes": row["bytes"]}
+            for row in conn.execute(
+                "SELECT extension, COUNT(*) AS files, SUM(size) AS bytes FROM result_files "
+                "WHERE result_id = ? GROUP BY extension ORDER BY files DESC", (result_id,)
+            )
+        }
+        by_submission = {
+            row["submission"]: {"files": row["files"], "bytes": row["bytes"]}
+            for row in conn.execute(
+                "SELECT submission, COUNT(*) AS files, SUM(size) AS bytes FROM result_files "
+                "WHERE result_id = ? GROUP BY submission ORDER BY files DESC LIMIT ?", (result_id, SUMMARY_TOP_N)
+            )
+        }
+        return {
+            "result_id": result_id,
+            "kind": meta["kind"],
+            "created_at": meta["created_at"],
+            "total_files": totals["files"],
+            "total_bytes": totals["bytes"],
+            "total_submissions": totals["submissions"],
+            "by_extension": by_extension,
+            "by_submission": by_submission,
+        }
+    finally:
+        conn.close()
+
+
+def list_result_files(result_id, cursor=None, limit=DEFAULT_PAGE_SIZE, db_path=RESULT_SET_DB_PATH):
+    """
+    Returns one page of a result set using keyset pagination: {"files": [...], "next_cursor": ...}.
+    Pass next_cursor back as cursor to get the following page; it is None on the last page.
+    Returns None if the result set does not exist.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    after = int(cursor) if cursor is not None else -1
+    conn = connect(db_path)
+    try:
+        if conn.execute("SELECT 1 FROM result_sets WHERE id = ?", (result_id,)).fetchone() is None:
+            return None
+        rows = conn.execute(
+            "SELECT seq, path, submission, size FROM result_files WHERE result_id = ? AND seq > ? "
+            "ORDER BY seq LIMIT ?", (result_id, after, limit + 1)
+        ).fetchall()
+    finally:
+        conn.close()
+    page = rows[:limit]
+    return {
+        "files": [{"path": row["path"], "submission": row["submission"], "size": row["size"]} for row in page],
+        "next_cursor": str(page[-1]["seq"]) if len(rows) > limit else None,
+    }
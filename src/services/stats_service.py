@@ -0,0 +1,189 @@
+import json
+import hashlib
+from pathlib import Path
+from collections import Counter
+
+import numpy as np
+
+from src.services.fingerprint_service import file_content_hash
+from src.services.symbol_index_service import record_submission
+
+STATS_CACHE_DIR = "data/index/stats"
+STATS_VERSION = 1  # Bump when the report layout changes so cached reports are recomputed
+STATS_BATCH_SIZE = 50000
+PERCENTILES = (50, 75, 90, 95, 99)
+TOP_NAMES = 20
+# Log-scale bins shared by every batch: [0, 1), [1, 2), [2, 4), ... so batch histograms simply add up
+HISTOGRAM_EDGES = np.array([0] + [2 ** i for i in range(32)], dtype=np.int64)
+
+
+def record_division(record):
+    """
+    Infers the division of a dataset record from its keys.
+    """
+    if "method" in record:
+        return "method"
+    if "class" in record:
+        return "class"
+    if "line" in record:
+        return "line"
+    return "file"
+
+
+def record_name_and_content(record, division):
+    """
+    Returns (name, content) of a record; lines have no name.
+    """
+    if division == "line":
+        return None, record.get("line", "")
+    if division == "file":
+        return record.get("filename"), record.get("content", "")
+    symbol = record.get(division)
+    if not isinstance(symbol, dict):
+        return str(symbol), ""
+    return symbol.get("name"), symbol.get("content", "")
+
+
+def _content_hash(content):
+    return int.from_bytes(hashlib.blake2b(content.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class _Distribution:
+    """
+    Accumulates a numeric distribution batch by batch: the log-scale histogram is summed per
+    batch, and the compact int32 batches are kept for exact percentiles at the end.
+    """
+
+    def __init__(self):
+        self.histogram = np.zeros(len(HISTOGRAM_EDGES) - 1, dtype=np.int64)
+        self.batches = []
+
+    def add(self, values):
+        values = np.asarray(values, dtype=np.int64)
+        self.histogram += np.histogram(values, bins=HISTOGRAM_EDGES)[0]
+        self.batches.append(values.astype(np.int32))
+
+    def report(self):
+        values = np.concatenate(self.batches) if self.batches else np.zeros(0, dtype=np.int32)
+        if values.size == 0:
+            return {"count": 0}
+        last_bin = int(np.nonzero(self.histogram)[0][-1]) + 1
+        return {
+            "count": int(values.size),
+            "min": int(values.min()),
+            "max": int(values.max()),
+            "mean": round(float(values.mean()), 3),
+            "percentiles": {f"p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))},
+            "histogram": {
+                "edges": HISTOGRAM_EDGES[:last_bin + 1].tolist(),
+                "counts": self.histogram[:last_bin].tolist(),
+            },
+        }
+
+
+def compute_dataset_stats(dataset_path, batch_size=STATS_BATCH_SIZE):
+    """
+    Computes statistics of a dataset JSONL file in one streaming pass. Lengths, line counts and
+    content hashes are buffered in batches of batch_size records and folded in with NumPy, so
+    memory stays at a few bytes per record.
+
+    Returns:
+        dict: Record counts per division and submission, content length (characters) and line
+              count distributions, the most common names and duplicate-content rates.
+    """
+    divisions = Counter()
+    submissions = Counter()
+    names = Counter()
+    lengths, line_counts = _Distribution(), _Distribution()
+    hashes = {}  # division -> list of uint64 arrays
+    invalid_lines = 0
+
+    batch_lengths, batch_lines, batch_hashes = [], [], {}
+
+    def flush():
+        if batch_lengths:
+            lengths.add(batch_lengths)
+            line_counts.add(batch_lines)
+        for division, values in batch_hashes.items():
+            hashes.setdefault(division, []).append(np.array(values, dtype=np.uint64))
+        batch_lengths.clear()
+        batch_lines.clear()
+        batch_hashes.clear()
+
+    with Path(dataset_path).open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                invalid_lines += 1
+                continue
+
+            division = record_division(record)
+            name, content = record_name_and_content(record, division)
+            content = content or ""
+            divisions[division] += 1
+            submissions[record_submission(record)] += 1
+            if name:
+                names[name] += 1
+
+            batch_lengths.append(len(content))
+            batch_lines.append(content.count("\n") + 1 if content else 0)
+            batch_hashes.setdefault(division, []).append(_content_hash(content))
+            if len(batch_lengths) >= batch_size:
+                flush()
+    flush()
+
+    duplicates = {}
+    all_hashes = []
+    for division, arrays in hashes.items():
+        values = np.concatenate(arrays)
+        all_hashes.append(values)
+        duplicates[division] = _duplicate_report(values)
+    overall = _duplicate_report(np.concatenate(all_hashes) if all_hashes else np.zeros(0, dtype=np.uint64))
+
+    return {
+        "records": sum(divisions.values()),
+        "invalid_lines": invalid_lines,
+        "divisions": dict(divisions),
+        "submissions": {
+            "count": len(submissions),
+            "records": dict(sorted(submissions.items())),
+        },
+        "content_length": lengths.report(),
+        "line_count": line_counts.report(),
+        "top_names": [{"name": name, "count": count} for name, count in names.most_common(TOP_NAMES)],
+        "duplicates": {"overall": overall, "by_division": duplicates},
+    }
+
+
+def _duplicate_report(hash_values):
+    total = int(hash_values.size)
+    unique = int(np.unique(hash_values).size)
+    return {
+        "records": total,
+        "unique": unique,
+        "duplicate_rate": round((total - unique) / total, 6) if total else 0.0,
+    }
+
+
+def dataset_stats(dataset_path, cache_dir=STATS_CACHE_DIR):
+    """
+    Returns compute_dataset_stats for dataset_path, cached in cache_dir by the dataset's content
+    hash so repeated requests against an unchanged dataset do not rescan it.
+    """
+    digest = file_content_hash(dataset_path)
+    cache_file = Path(cache_dir) / f"{digest}.v{STATS_VERSION}.json"
+    if cache_file.exists():
+        with cache_file.open("r", encoding="utf-8") as f:
+            stats = json.load(f)
+        stats["cached"] = True
+        return stats
+
+    stats = {"dataset": str(dataset_path), "sha256": digest, **compute_dataset_stats(dataset_path)}
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = cache_file.with_name(cache_file.name + ".tmp")
+    with temp_file.open("w", encoding="utf-8") as f:
+        json.dump(stats, f)
+    temp_file.replace(cache_file)
+    stats["cached"] = False
+    return stats
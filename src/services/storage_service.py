@@ -0,0 +1,346 @@
+import io
+import os
+import uuid
+import shutil
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+
+STORAGE_URI_ENV = "DATASET_STORAGE_URI"
+S3_PART_SIZE = 8 * 1024 * 1024  # S3 requires at least 5 MiB for every part but the last
+S3_MAX_CONCURRENCY = 8
+
+
+class LocalStorage:
+    """
+    Storage backend over the local filesystem. Keys are paths relative to root
+    (absolute paths are used as-is), so the default root "." maps keys onto the data/ tree.
+    """
+
+    def __init__(self, root="."):
+        self.root = Path(root)
+
+    def path(self, key):
+        return self.root / str(key)
+
+    def uri(self, key):
+        return str(self.path(key))
+
+    def exists(self, key):
+        return self.path(key).exists()
+
+    def list(self, prefix=""):
+        base = self.path(prefix)
+        if base.is_file():
+            return [str(prefix)]
+        if not base.exists():
+            return []
+        return sorted(str(Path(prefix) / p.relative_to(base)) for p in base.rglob("*") if p.is_file())
+
+    def delete(self, key):
+        self.path(key).unlink(missing_ok=True)
+
+    def open_read(self, key, encoding=None):
+        if encoding is None:
+            return self.path(key).open("rb")
+        return self.path(key).open("r", encoding=encoding)
+
+    @contextmanager
+    def open_write(self, key, encoding=None):
+        """
+        Writes to a temporary file next to the target and moves it into place on success,
+        so readers never observe a partially written object.
+        """
+        target = self.path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+        try:
+            mode = "wb" if encoding is None else "w"
+            with os.fdopen(fd, mode, encoding=encoding) as f:
+                yield f
+            os.replace(tmp_path, target)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def upload_file(self, local_path, key):
+        if Path(local_path).resolve() == self.path(key).resolve():
+            return self.uri(key)
+        with Path(local_path).open("rb") as src, self.open_write(key) as dst:
+            shutil.copyfileobj(src, dst)
+        return self.uri(key)
+
+
+class _StreamingBodyReader(io.RawIOBase):
+    """Adapts an S3 StreamingBody (read(n) only) to the raw IO interface."""
+
+    def __init__(self, body):
+        self._body = body
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._body.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        self._body.close()
+        super().close()
+
+
+class MultipartUploadWriter(io.RawIOBase):
+    """
+    Writable stream that uploads to S3 in parts as data arrives. Up to max_concurrency parts
+    are in flight at once, so memory stays bounded at roughly (max_concurrency + 1) * part_size.
+    Objects smaller than one part are sent with a single put_object.
+    """
+
+    def __init__(self, client, bucket, key, part_size=S3_PART_SIZE, max_concurrency=S3_MAX_CONCURRENCY):
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self._buffer = bytearray()
+        self._futures = []
+        self._upload_id = None
+        self._aborted = False
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if self._aborted:
+            raise ValueError("write to an aborted upload")
+        self._buffer += data
+        while len(self._buffer) >= self.part_size:
+            part = bytes(self._buffer[:self.part_size])
+            del self._buffer[:self.part_size]
+            self._submit(part)
+        return len(data)
+
+    def _submit(self, data):
+        if self._upload_id is None:
+            response = self.client.create_multipart_upload(Bucket=self.bucket, Key=self.key)
+            self._upload_id = response["UploadId"]
+        part_number = len(self._futures) + 1
+        self._slots.acquire()
+        self._futures.append(self._executor.submit(self._upload_part, part_number, data))
+
+    def _upload_part(self, part_number, data):
+        try:
+            response = self.client.upload_part(
+                Bucket=self.bucket, Key=self.key, UploadId=self._upload_id, PartNumber=part_number, Body=data
+            )
+            return {"PartNumber": part_number, "ETag": response["ETag"]}
+        finally:
+            self._slots.release()
+
+    def abort(self):
+        self._aborted = True
+        for future in self._futures:
+            future.cancel()
+        self._executor.shutdown(wait=True)
+        if self._upload_id is not None:
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self._upload_id)
+            self._upload_id = None
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self._aborted:
+                return
+            if self._upload_id is None:
+                self.client.put_object(Bucket=self.bucket, Key=self.key, Body=bytes(self._buffer))
+            else:
+                if self._buffer:
+                    self._submit(bytes(self._buffer))
+                parts = [future.result() for future in self._futures]
+                self.client.complete_multipart_upload(
+                    Bucket=self.bucket, Key=self.key, UploadId=self._upload_id, MultipartUpload={"Parts": parts}
+                )
+            self._buffer = bytearray()
+        except BaseException:
+            self.abort()
+            raise
+        finally:
+            self._executor.shutdown(wait=True)
+            super().close()
+
+
+class S3Storage:
+    """
+    Storage backend over an S3 bucket. Keys are placed under prefix. Writes stream through
+    concurrent multipart uploads; reads stream the object body.
+
+    Params:
+      bucket (str): Bucket name.
+      prefix (str): Key prefix inside the bucket.
+      client: A boto3 S3 client (or compatible stand-in such as LocalBucketClient).
+    """
+
+    def __init__(self, bucket, prefix="", client=None, part_size=S3_PART_SIZE, max_concurrency=S3_MAX_CONCURRENCY):
+        if client is None:
+            import boto3
+            client = boto3.client("s3")
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.client = client
+        self.part_size = part_size
+        self.max_concurrency = max_concurrency
+
+    def object_key(self, key):
+        return str(PurePosixPath(self.prefix, str(key).lstrip("/"))) if self.prefix else str(key).lstrip("/")
+
+    def uri(self, key):
+        return f"s3://{self.bucket}/{self.object_key(key)}"
+
+    def exists(self, key):
+        object_key = self.object_key(key)
+        response = self.client.list_objects_v2(Bucket=self.bucket, Prefix=object_key, MaxKeys=1)
+        return any(item["Key"] == object_key for item in response.get("Contents", []))
+
+    def list(self, prefix=""):
+        object_prefix = self.object_key(prefix) if str(prefix) else self.prefix
+        keys = []
+        kwargs = {"Bucket": self.bucket, "Prefix": object_prefix}
+        while True:
+            response = self.client.list_objects_v2(**kwargs)
+            keys.extend(item["Key"] for item in response.get("Contents", []))
+            if not response.get("IsTruncated"):
+                break
+            kwargs["ContinuationToken"] = response["NextContinuationToken"]
+        if self.prefix:
+            keys = [key[len(self.prefix) + 1:] for key in keys]
+        return sorted(keys)
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=self.object_key(key))
+
+    def open_read(self, key, encoding=None):
+        body = self.client.get_object(Bucket=self.bucket, Key=self.object_key(key))["Body"]
+        stream = io.BufferedReader(_StreamingBodyReader(body), buffer_size=1024 * 1024)
+        if encoding is None:
+            return stream
+        return io.TextIOWrapper(stream, encoding=encoding)
+
+    @contextmanager
+    def open_write(self, key, encoding=None):
+        writer = MultipartUploadWriter(
+            self.client, self.bucket, self.object_key(key), self.part_size, self.max_concurrency
+        )
+        stream = writer if encoding is None else io.TextIOWrapper(
+            io.BufferedWriter(writer, buffer_size=1024 * 1024), encoding=encoding, newline=""
+        )
+        try:
+            yield stream
+        except BaseException:
+            writer.abort()
+            try:
+                stream.close()
+            except ValueError:
+                pass
+            raise
+        stream.close()
+
+    def upload_file(self, local_path, key):
+        with Path(local_path).open("rb") as src, self.open_write(key) as dst:
+            shutil.copyfileobj(src, dst, self.part_size)
+        return self.uri(key)
+
+
+class LocalBucketClient:
+    """
+    Minimal filesystem-emulated stand-in for the boto3 S3 client, implementing the calls used by
+    S3Storage. Objects live under root/<bucket>/<key>; in-progress multipart uploads under
+    root/.multipart/<upload_id>/. Useful for tests and offline development.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def _object_path(self, bucket, key):
+        return self.root / bucket / key
+
+    def _upload_dir(self, upload_id):
+        return self.root / ".multipart" / upload_id
+
+    def put_object(self, Bucket, Key, Body):
+        path = self._object_path(Bucket, Key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = Body.encode("utf-8") if isinstance(Body, str) else Body
+        path.write_bytes(data)
+        return {"ETag": hashlib.md5(data).hexdigest()}
+
+    def get_object(self, Bucket, Key):
+        path = self._object_path(Bucket, Key)
+        if not path.is_file():
+            raise FileNotFoundError(f"s3://{Bucket}/{Key}")
+        return {"Body": path.open("rb"), "ContentLength": path.stat().st_size}
+
+    def delete_object(self, Bucket, Key):
+        self._object_path(Bucket, Key).unlink(missing_ok=True)
+        return {}
+
+    def list_objects_v2(self, Bucket, Prefix="", MaxKeys=1000, ContinuationToken=None):
+        bucket_root = self.root / Bucket
+        keys = sorted(
+            str(PurePosixPath(*p.relative_to(bucket_root).parts))
+            for p in bucket_root.rglob("*") if p.is_file()
+        ) if bucket_root.exists() else []
+        keys = [key for key in keys if key.startswith(Prefix)]
+        start = int(ContinuationToken or 0)
+        page = keys[start:start + MaxKeys]
+        response = {
+            "Contents": [{"Key": key, "Size": self._object_path(Bucket, key).stat().st_size} for key in page],
+            "IsTruncated": start + MaxKeys < len(keys),
+        }
+        if response["IsTruncated"]:
+            response["NextContinuationToken"] = str(start + MaxKeys)
+        return response
+
+    def create_multipart_upload(self, Bucket, Key):
+        upload_id = uuid.uuid4().hex
+        self._upload_dir(upload_id).mkdir(parents=True)
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        (self._upload_dir(UploadId) / f"{PartNumber:05d}").write_bytes(Body)
+        return {"ETag": hashlib.md5(Body).hexdigest()}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        upload_dir = self._upload_dir(UploadId)
+        path = self._object_path(Bucket, Key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as out:
+            for part in sorted(MultipartUpload["Parts"], key=lambda p: p["PartNumber"]):
+                out.write((upload_dir / f"{part['PartNumber']:05d}").read_bytes())
+        shutil.rmtree(upload_dir)
+        return {"Bucket": Bucket, "Key": Key}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        shutil.rmtree(self._upload_dir(UploadId), ignore_errors=True)
+        return {}
+
+
+def get_storage(uri=None):
+    """
+    Returns the storage backend for uri (defaults to the DATASET_STORAGE_URI environment variable):
+      - "s3://bucket/prefix": S3Storage
+      - anything else: LocalStorage rooted at that path (defaults to the current directory)
+    Backends are used by dataset processing (input and output) and to upload finished datasets;
+    unzip, filtering and extraction work on local paths only.
+    """
+    uri = uri or os.environ.get(STORAGE_URI_ENV, ".")
+    if uri.startswith("s3://"):
+        bucket, _, prefix = uri[len("s3://"):].partition("/")
+        return S3Storage(bucket, prefix)
+    return LocalStorage(uri)
@@ -0,0 +1,204 @@
+import json
+import sqlite3
+from pathlib import Path
+
+SYMBOL_INDEX_PATH = "data/index/symbols.db"
+INDEX_BATCH_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS symbols (
+    id INTEGER PRIMARY KEY,
+    qualified_name TEXT NOT NULL,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    filepath TEXT NOT NULL,
+    submission TEXT,
+    start_line INTEGER,
+    end_line INTEGER,
+    content TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_symbols_name ON symbols(name);
+CREATE INDEX IF NOT EXISTS idx_symbols_qualified_name ON symbols(qualified_name);
+CREATE INDEX IF NOT EXISTS idx_symbols_kind ON symbols(kind);
+CREATE INDEX IF NOT EXISTS idx_symbols_submission ON symbols(submission);
+CREATE VIRTUAL TABLE IF NOT EXISTS symbols_fts USING fts5(content, content='symbols', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS symbols_ai AFTER INSERT ON symbols BEGIN
+    INSERT INTO symbols_fts(rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS symbols_ad AFTER DELETE ON symbols BEGIN
+    INSERT INTO symbols_fts(symbols_fts, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+"""
+
+COLUMNS = ("qualified_name", "name", "kind", "filepath", "submission", "start_line", "end_line", "content")
+
+
+def connect(db_path=SYMBOL_INDEX_PATH):
+    """
+    Opens (and creates if needed) the symbol index at db_path.
+    """
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def submission_from_filepath(filepath):
+    """
+    Derives the submission a file belongs to from its path relative to the filtered tree.
+    The unzip stage lays files out as <export>/<submission>/..., so the second component is
+    used when present and the first one otherwise.
+    """
+    parts = Path(filepath).parts
+    if len(parts) > 2:
+        return parts[1]
+    return parts[0] if parts else ""
+
+
+def record_submission(record):
+    """
+    Returns the submission of a dataset record: the explicit "submission" field written by
+    incremental ingestion, whose layout differs, or else the one derived from its filepath.
+    """
+    return record.get("submission") or submission_from_filepath(record.get("filepath", ""))
+
+
+def symbol_from_record(record, kind):
+    """
+    Converts a dataset record of the "method" or "class" division into a symbol row dict.
+    Returns None for records that carry no symbol.
+    """
+    symbol = record.get(kind)
+    if not symbol:
+        return None
+    if isinstance(symbol, str):
+        # Datasets extracted by older versions only report names for Python files
+        symbol = {"name": symbol}
+
+    name = symbol.get("name", "")
+    owner = symbol.get("class")
+    filepath = record.get("filepath", "")
+    return {
+        "qualified_name": f"{owner}.{name}" if owner else name,
+        "name": name,
+        "kind": kind,
+        "filepath": filepath,
+        "submission": record_submission(record),
+        "start_line": symbol.get("start_line"),
+        "end_line": symbol.get("end_line"),
+        "content": symbol.get("content", ""),
+    }
+
+
+def index_dataset_file(dataset_file, division, db_path=SYMBOL_INDEX_PATH, replace=True):
+    """
+    Streams a "method" or "class" JSONL dataset into the symbol index. With replace=True any
+    symbols of the same kind indexed from a previous extraction are removed first; with
+    replace=False the symbols are appended (incremental ingestion).
+
+    Returns:
+        int: The number of symbols indexed.
+    """
+    if division not in ("method", "class"):
+        raise ValueError("Only the 'method' and 'class' divisions can be indexed.")
+
+    conn = connect(db_path)
+    insert = f"INSERT INTO symbols ({', '.join(COLUMNS)}) VALUES ({', '.join('?' for _ in COLUMNS)})"
+    count = 0
+    try:
+        with conn:
+            if replace:
+                conn.execute("DELETE FROM symbols WHERE kind = ?", (division,))
+            batch = []
+            with Path(dataset_file).open("r", encoding="utf-8") as infile:
+                for line in infile:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    row = symbol_from_record(record, division)
+                    if row is None:
+                        continue
+                    batch.append(tuple(row[column] for column in COLUMNS))
+                    if len(batch) >= INDEX_BATCH_SIZE:
+                        conn.executemany(insert, batch)
+                        count += len(batch)
+                        batch = []
+            if batch:
+                conn.executemany(insert, batch)
+                count += len(batch)
+        conn.execute("PRAGMA optimize")
+    finally:
+        conn.close()
+    return count
+
+
+def delete_symbols_under(db_path, filepath_prefix):
+    """
+    Removes every symbol whose filepath lies under filepath_prefix (a directory relative to the
+    extraction source).
+    """
+    prefix = filepath_prefix.rstrip("/") + "/"
+    conn = connect(db_path)
+    try:
+        with conn:
+            # substr comparison instead of LIKE so '_' and '%' in paths are taken literally
+            conn.execute("DELETE FROM symbols WHERE substr(filepath, 1, ?) = ?", (len(prefix), prefix))
+    finally:
+        conn.close()
+
+
+def query_symbols(db_path=SYMBOL_INDEX_PATH, name=None, pattern=None, content=None, kind=None,
+                  submission=None, limit=None):
+    """
+    Queries the symbol index. All given criteria must match:
+      - name: exact match on the simple or qualified name (e.g. "calculateComplexity" or "Visitor.visit").
+      - pattern: glob over the qualified name (e.g. "*Service.get*").
+      - content: FTS5 full-text query over the symbol content.
+      - kind: "method" or "class".
+      - submission: exact submission name.
+
+    Returns:
+        list: Matching symbols as dicts, ordered by filepath and start line.
+    """
+    clauses = []
+    params = []
+    if name:
+        clauses.append("(s.name = ? OR s.qualified_name = ?)")
+        params.extend([name, name])
+    if pattern:
+        clauses.append("s.qualified_name GLOB ?")
+        params.append(pattern)
+    if content:
+        clauses.append("s.id IN (SELECT rowid FROM symbols_fts WHERE symbols_fts MATCH ?)")
+        params.append(content)
+    if kind:
+        clauses.append("s.kind = ?")
+        params.append(kind)
+    if submission:
+        clauses.append("s.submission = ?")
+        params.append(submission)
+
+    sql = f"SELECT {', '.join('s.' + column for column in COLUMNS)} FROM symbols s"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY s.filepath, s.start_line"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+
+    conn = connect(db_path)
+    try:
+        return [dict(row) for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
+
+
+def symbols_to_jsonl(symbols):
+    """
+    Yields each symbol as a JSONL line, suitable for streaming responses.
+    """
+    for symbol in symbols:
+        yield json.dumps(symbol) + "\n"
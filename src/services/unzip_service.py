@@ -1,20 +1,247 @@
 import os
+import json
+import zlib
+import shutil
+import tarfile
 import zipfile
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 
-def recursive_unzip(zip_files, destination):
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2")
+ARCHIVE_SUFFIXES = (".zip",) + TAR_SUFFIXES
+MANIFEST_SUFFIX = ".manifest.json"  # data/unzipped -> data/unzipped.manifest.json, outside the extracted tree
+CRC_CHUNK_SIZE = 1024 * 1024
+
+
+def archive_type(path):
+    """
+    Returns "zip" or "tar" based on the file name, or None if the file is not a supported archive.
+    """
+    name = str(path).lower()
+    if name.endswith(".zip"):
+        return "zip"
+    if name.endswith(TAR_SUFFIXES):
+        return "tar"
+    return None
+
+
+def find_archives(directory):
+    """
+    Lists the supported archives (zip, tar, tar.gz, tar.bz2) directly inside directory.
+    """
+    return sorted(p for p in Path(directory).iterdir() if p.is_file() and archive_type(p))
+
+
+def safe_member_path(member_name):
+    """
+    Normalizes an archive member name to a relative path that cannot escape the destination.
+    Returns None for names with nothing left after normalization.
+    """
+    parts = [part for part in PurePosixPath(member_name.replace("\\", "/")).parts if part not in ("/", "", ".", "..")]
+    return Path(*parts) if parts else None
+
+
+def extract_tar(tar_path, destination, previous=None, entries=None, stats=None):
+    """
+    Extracts a tar, tar.gz or tar.bz2 archive in one sequential streaming pass (no seeks),
+    writing regular files under destination. Links and special files are skipped.
+
+    With previous/entries (incremental mode, see recursive_unzip), members whose size and mtime
+    match the manifest entry of an untouched existing file are not rewritten.
+
+    Returns:
+        list: The relative member names that were extracted (POSIX separators).
+    """
+    extracted = []
+    with tarfile.open(tar_path, mode="r|*") as tf:
+        for member in tf:
+            if not member.isfile():
+                continue
+            relative_path = safe_member_path(member.name)
+            if relative_path is None:
+                continue
+            target = Path(destination) / relative_path
+            name = relative_path.as_posix()
+            extracted.append(name)
+            if entries is not None:
+                signature = [member.size, int(member.mtime)]
+                if member_unchanged(target, signature, (previous or {}).get(name)):
+                    entries[name] = previous[name]
+                    _count(stats, "unchanged")
+                    continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with tf.extractfile(member) as src, target.open("wb") as dst:
+                shutil.copyfileobj(src, dst)
+            if entries is not None:
+                entries[name] = _manifest_entry(target, signature)
+                _count(stats, "extracted")
+    return extracted
+
+
+def extract_zip_incremental(zip_path, destination, previous=None, entries=None, stats=None, incremental=True):
+    """
+    Extracts only the members of a zip archive that are new or changed under destination.
+    Each member's size and CRC32 come from the central directory, so unchanged members are
+    recognised without decompressing anything: either from their manifest entry (previous) when
+    the file on disk is untouched since it was written, or by checksumming the existing file.
+    With incremental=False every member is written and only its manifest entry is recorded.
+
+    Returns:
+        list: The relative member names of the archive (POSIX separators).
+    """
+    member_names = []
+    entries = {} if entries is None else entries
+    with zipfile.ZipFile(zip_path, 'r') as zf:
+        for member in zf.infolist():
+            if member.is_dir():
+                continue
+            relative_path = safe_member_path(member.filename)
+            if relative_path is None:
+                continue
+            target = Path(destination) / relative_path
+            name = relative_path.as_posix()
+            member_names.append(name)
+            signature = [member.file_size, member.CRC]
+            if incremental and member_unchanged(target, signature, (previous or {}).get(name), crc=member.CRC):
+                entries[name] = _manifest_entry(target, signature)
+                _count(stats, "unchanged")
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with zf.open(member) as src, target.open("wb") as dst:
+                shutil.copyfileobj(src, dst)
+            entries[name] = _manifest_entry(target, signature)
+            _count(stats, "extracted")
+    return member_names
+
+
+def member_unchanged(target, signature, previous_entry, crc=None):
+    """
+    Returns True if target already holds the member described by signature.
+    A manifest entry is trusted while the file's size and mtime still match what was recorded;
+    otherwise a zip member (crc given) is compared against the file's size and CRC32.
+    """
+    try:
+        stat = target.stat()
+    except OSError:
+        return False
+    if previous_entry is not None and previous_entry["signature"] == signature \
+            and previous_entry["stat"] == [stat.st_size, stat.st_mtime_ns]:
+        return True
+    if crc is None or stat.st_size != signature[0]:
+        return False
+    checksum = 0
+    with target.open("rb") as f:
+        for chunk in iter(lambda: f.read(CRC_CHUNK_SIZE), b""):
+            checksum = zlib.crc32(chunk, checksum)
+    return checksum == crc
+
+
+def _manifest_entry(target, signature):
+    stat = target.stat()
+    return {"signature": signature, "stat": [stat.st_size, stat.st_mtime_ns]}
+
+
+def _count(stats, key, amount=1):
+    if stats is not None:
+        stats[key] = stats.get(key, 0) + amount
+
+
+def manifest_path(destination):
+    destination = Path(destination)
+    return destination.with_name(destination.name + MANIFEST_SUFFIX)
+
+
+def load_manifest(destination):
+    """
+    Loads the incremental unzip manifest of destination: {archive key: {"output": ..., "members": {...}}}.
+    """
+    path = manifest_path(destination)
+    if not path.exists():
+        return {}
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(destination, manifest):
+    path = manifest_path(destination)
+    temp_path = path.with_name(path.name + ".tmp")
+    with temp_path.open("w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(temp_path, path)
+
+
+def _archive_key(archive_path, root):
+    # Nested archives are keyed by their path in the extracted tree, top-level ones by file name
+    try:
+        return Path(archive_path).resolve().relative_to(root.resolve()).as_posix()
+    except ValueError:
+        return Path(archive_path).name
+
+
+def _remove_stale(root, manifest, key, current_members, stats):
+    """
+    Deletes the files an archive produced before but no longer contains, including everything
+    extracted from nested archives that were removed.
+    """
+    record = manifest.get(key)
+    if record is None:
+        return
+    output = root / record["output"]
+    for name in set(record["members"]) - set(current_members):
+        target = output / name
+        if target.is_file():
+            target.unlink()
+            _count(stats, "removed")
+        if archive_type(name):
+            nested_key = (output / name).relative_to(root).as_posix()
+            _remove_stale(root, manifest, nested_key, (), stats)
+            manifest.pop(nested_key, None)
+        _prune_empty_dirs(target.parent, output)
+
+
+def _prune_empty_dirs(directory, stop):
+    while directory != stop and stop in directory.parents:
+        try:
+            directory.rmdir()
+        except OSError:
+            break
+        directory = directory.parent
+
+
+def recursive_unzip(zip_files, destination, incremental=False, stats=None):
     """
     Recursively unzips all zip files in the given list and any zip files found within extracted folders.
+    Tar archives (.tar, .tar.gz/.tgz, .tar.bz2/.tbz2) are streamed and laid out the same way, both at
+    the top level and when nested inside other archives.
+
+    In incremental mode only new or changed members are written (see extract_zip_incremental) and
+    files an archive no longer contains are deleted. What each archive produced is recorded in a
+    manifest next to destination (<destination>.manifest.json), so re-extracting a mostly unchanged
+    zip costs about one central-directory read. A full (non-incremental) extraction ignores the
+    previous manifest and replaces it with one describing what it wrote, so a later incremental
+    run can clean up after it; it writes every member without comparing anything on disk.
 
     Args:
-        zip_files (list): A list of paths (str or Path) to zip files to extract.
+        zip_files (list): A list of paths (str or Path) to zip or tar archives to extract.
         destination (str or Path): The root destination directory for extraction.
+        incremental (bool): Sync destination with the archives instead of overwriting every member.
+        stats (dict): Optional; filled with "extracted", "unchanged" and "removed" member counts.
 
     Returns:
-        list: A list of all extracted file paths (as strings).
+        list: A list of all extracted file paths (as strings). In incremental mode unchanged
+              members are included, so the list always describes the archives' full contents.
     """
     destination = Path(destination)
     destination.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(destination) if incremental else {}
+    extracted_files = _recursive_unzip(zip_files, destination, destination, manifest, stats, incremental)
+    save_manifest(destination, manifest)
+    return extracted_files
+
+
+def _recursive_unzip(zip_files, destination, root, manifest, stats, incremental):
     extracted_files = []
 
     # Process each zip file in the list
@@ -32,35 +259,33 @@ def recursive_unzip(zip_files, destination):
         destination_with_filename.mkdir(parents=True, exist_ok=True)
 
         # Update the destination to the new directory
-        if not zip_path.is_file() or zip_path.suffix.lower() != ".zip":
+        kind = archive_type(zip_path)
+        if not zip_path.is_file() or kind is None:
             continue
 
-        # Extract the current zip file
+        # Extract the current archive
         try:
-            with zipfile.ZipFile(zip_path, 'r') as zf:
-                # Extract all files in the current zip file
-                for member in zf.infolist():
-                    # Check if the member is a directory
-                    if member.is_dir():
-                        continue
-
-                    # Extract the member to the destination directory while maintaining the folder structure
-                    zf.extract(member, destination_with_filename)
-                    extracted_files.append(str(destination_with_filename / member.filename))
+            key = _archive_key(zip_path, root)
+            previous = manifest.get(key, {}).get("members")
+            entries = {}
+            if kind == "tar":
+                member_names = extract_tar(zip_path, destination_with_filename, previous, entries, stats)
+            else:
+                member_names = extract_zip_incremental(zip_path, destination_with_filename, previous, entries, stats,
+                                                       incremental)
+            _remove_stale(root, manifest, key, member_names, stats)
+            manifest[key] = {"output": destination_with_filename.relative_to(root).as_posix(), "members": entries}
+            extracted_files.extend(str(destination_with_filename / name) for name in member_names)
         except Exception as e:
             print(f"Error extracting {zip_path}: {e}")
             continue
 
-        # Delete all the .zip files in current folder
-        # for file in os.listdir(destination_with_filename):
-        #     if file.endswith(".zip"):
-        #         os.remove(destination_with_filename / file)
-        # Check extracted files for nested zip files
-        nested_zip_files = [str(destination_with_filename / member.filename) for member in zf.infolist() if member.filename.endswith(".zip")]
+        # Check extracted files for nested archives
+        nested_zip_files = [str(destination_with_filename / name) for name in member_names if archive_type(name)]
         if nested_zip_files:
-            # Recursively unzip any nested zip files 
-            nested_extracted = recursive_unzip(nested_zip_files, destination_with_filename)
+            # Recursively unzip any nested archives
+            nested_extracted = _recursive_unzip(nested_zip_files, destination_with_filename, root, manifest, stats,
+                                                incremental)
             # extracted_files.extend(nested_extracted)
 
     return extracted_files
-
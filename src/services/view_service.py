@@ -0,0 +1,169 @@
+import os
+import re
+import json
+import time
+from pathlib import Path
+from collections import Counter
+
+from src.services.path_matcher_service import DEFAULT_IGNORE, PathMatcher, compile_filter_list, walk_files
+
+VIEWS_DIR = "data/views"
+FILENAME_VIEW = "filename"  # Default view written by the filename filter stage
+VIEW_NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+
+
+def view_file(name, views_dir=VIEWS_DIR):
+    if not isinstance(name, str) or not VIEW_NAME_PATTERN.match(name):
+        raise ValueError(f"Invalid view name: {name!r}")
+    return Path(views_dir) / f"{name}.json"
+
+
+def tree_files(base, include=None, exclude=None):
+    """
+    Lists the files of base relative to it (POSIX separators), in walk order, skipping DEFAULT_IGNORE
+    and pruning the directories exclude matches.
+    """
+    return [rel_path for _, rel_path in walk_files(base, ignore=PathMatcher(DEFAULT_IGNORE), include=include,
+                                                   exclude=exclude)]
+
+
+def create_name_view(name, base, filter_list, filter_type, parent=None, views_dir=VIEWS_DIR):
+    """
+    Creates (or replaces) a named selection view: a manifest of the files of base that match
+    (filter_type "in") or do not match ("out") filter_list. base itself is never modified, so a view
+    can be dropped or rebuilt with another filter at any time without re-running earlier stages.
+
+    Params:
+      name (str): View name (letters, digits, '_', '-' and '.').
+      base (str or Path): The immutable tree the view selects from. Ignored when parent is given.
+      filter_list (list): Exact file names and/or gitignore-style patterns (e.g. "build/", "*Test.java").
+      filter_type (str): "in" to keep matching files, "out" to drop them.
+      parent (str): Name of a view to narrow down instead of the whole base tree, so filters compose.
+
+    Returns:
+      dict: The view manifest ("name", "base", "parent", "filter", "paths", "created_at").
+    """
+    if filter_type not in ['in', 'out']:
+        raise ValueError("Invalid filter type")
+
+    matcher = compile_filter_list(filter_list, plain="names")
+    keep_matching = filter_type == 'in'
+    if parent is not None:
+        parent_view = load_view(parent, views_dir)
+        base = parent_view["base"]
+        paths = [path for path in parent_view["paths"] if matcher.match_path(path) == keep_matching]
+    else:
+        if not os.path.exists(base):
+            raise ValueError("Source folder does not exist")
+        if keep_matching:
+            paths = tree_files(base, include=matcher)
+        else:
+            paths = tree_files(base, exclude=matcher)
+
+    manifest = {
+        "name": name,
+        "base": str(base),
+        "parent": parent,
+        "filter": {"type": filter_type, "list": list(filter_list)},
+        "paths": paths,
+        "created_at": time.time(),
+    }
+    target = view_file(name, views_dir)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = target.with_name(target.name + ".tmp")
+    with tmp_file.open("w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_file, target)
+    return manifest
+
+
+def view_exists(name, views_dir=VIEWS_DIR):
+    return view_file(name, views_dir).exists()
+
+
+def load_view(name, views_dir=VIEWS_DIR):
+    """
+    Returns the manifest of a view. Raises ValueError if it does not exist.
+    """
+    path = view_file(name, views_dir)
+    if not path.exists():
+        raise ValueError(f"View not found: {name}")
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def delete_view(name, views_dir=VIEWS_DIR):
+    """
+    Deletes a view. Views derived from it keep working: manifests store resolved paths.
+    Returns True if the view existed.
+    """
+    path = view_file(name, views_dir)
+    if not path.exists():
+        return False
+    path.unlink()
+    return True
+
+
+def delete_views_of(rewritten, views_dir=VIEWS_DIR):
+    """
+    Deletes every view whose base tree overlaps rewritten (base itself, a subtree of it or a tree
+    containing it), e.g. once unzip or a filter has rebuilt it and their path lists no longer
+    describe it. Returns the names of the deleted views.
+    """
+    root = Path(views_dir)
+    if not root.exists():
+        return []
+    rewritten = Path(rewritten).resolve()
+    deleted = []
+    for path in root.glob("*.json"):
+        with path.open("r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        base = Path(manifest["base"]).resolve()
+        if base == rewritten or rewritten in base.parents or base in rewritten.parents:
+            path.unlink()
+            deleted.append(manifest["name"])
+    return sorted(deleted)
+
+
+def list_views(views_dir=VIEWS_DIR):
+    """
+    Returns a summary of every view (without the path lists), newest first.
+    """
+    root = Path(views_dir)
+    if not root.exists():
+        return []
+    views = []
+    for path in root.glob("*.json"):
+        with path.open("r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        views.append(summarize_view(manifest))
+    return sorted(views, key=lambda view: view["created_at"], reverse=True)
+
+
+def summarize_view(manifest):
+    return {
+        "name": manifest["name"],
+        "base": manifest["base"],
+        "parent": manifest["parent"],
+        "filter": manifest["filter"],
+        "files": len(manifest["paths"]),
+        "created_at": manifest["created_at"],
+    }
+
+
+def view_file_counts(manifest):
+    """
+    Counts the files of a view per file name, like the filters' copied_files result.
+    """
+    return dict(Counter(path.rsplit("/", 1)[-1] for path in manifest["paths"]))
+
+
+def view_files(manifest):
+    """
+    Yields the absolute paths of a view's files that still exist in its base tree.
+    """
+    base = Path(manifest["base"])
+    for path in manifest["paths"]:
+        file_path = base / path
+        if file_path.is_file():
+            yield file_path
@@ -0,0 +1,116 @@
+import json
+import tempfile
+import unittest
+import functools
+from pathlib import Path
+from unittest import mock
+from src.services import extraction_service
+from src.services.checkpoint_service import CheckpointedWriter
+from src.services.extraction_service import extract_data_from_division
+
+
+class TestCheckpointedWriter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+        self.dataset = self.base_dir / "unprocessed_dataset.jsonl"
+        self.key = {"division": "file", "source": "src"}
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_files(self, writer, names, crash_after=None):
+        for name in names:
+            if writer.is_done(name):
+                continue
+            writer.write(json.dumps({"filepath": name}) + "\n")
+            if name == crash_after:
+                raise KeyboardInterrupt  # Dies halfway through the file's records
+            writer.write(json.dumps({"filepath": name, "part": 2}) + "\n")
+            writer.file_done(name)
+
+    def test_resume_skips_completed_files_and_commits_atomically(self):
+        names = [f"f{i}.java" for i in range(10)]
+        with self.assertRaises(KeyboardInterrupt):
+            with CheckpointedWriter(self.dataset, self.key, every_files=3) as writer:
+                self.write_files(writer, names, crash_after="f7.java")
+        self.assertFalse(self.dataset.exists())
+
+        with CheckpointedWriter(self.dataset, self.key, every_files=3) as writer:
+            self.assertEqual(writer.resumed_files, 7)
+            self.write_files(writer, names)
+
+        with self.dataset.open() as f:
+            records = [json.loads(line)["filepath"] for line in f]
+        self.assertEqual(records, [name for name in names for _ in range(2)])
+        self.assertEqual(sorted(p.name for p in self.base_dir.iterdir()), [self.dataset.name])
+
+    def test_changed_key_starts_over(self):
+        with self.assertRaises(KeyboardInterrupt):
+            with CheckpointedWriter(self.dataset, self.key, every_files=1) as writer:
+                self.write_files(writer, ["a", "b"], crash_after="b")
+        with CheckpointedWriter(self.dataset, {**self.key, "division": "line"}) as writer:
+            self.assertEqual(writer.resumed_files, 0)
+
+    def test_failed_finalize_never_publishes_and_only_finalize_repeats(self):
+        def crash(partial_file, dataset_file):
+            raise KeyboardInterrupt
+
+        def upper(partial_file, dataset_file):
+            Path(dataset_file).write_text(Path(partial_file).read_text().upper())
+
+        names = ["a", "b", "c"]
+        with self.assertRaises(KeyboardInterrupt):
+            with CheckpointedWriter(self.dataset, self.key, finalize=crash) as writer:
+                self.write_files(writer, names)
+        self.assertFalse(self.dataset.exists())
+
+        with CheckpointedWriter(self.dataset, self.key, finalize=upper) as writer:
+            self.assertEqual(writer.resumed_files, 3)
+            self.write_files(writer, names)
+        self.assertIn('"FILEPATH": "C"', self.dataset.read_text())
+        self.assertEqual(sorted(p.name for p in self.base_dir.iterdir()), [self.dataset.name])
+
+    def test_interrupted_extraction_resumes_from_checkpoint(self):
+        source = self.base_dir / "source"
+        source.mkdir()
+        for name in ["A.java", "B.java", "C.java", "D.java", "E.java"]:
+            (source / name).write_text(f"class {name[0]} {{}}")
+        files = sorted(source.iterdir())
+        dest = self.base_dir / "divisioned"
+
+        def interrupted(source_path, selection=None):
+            yield from files[:3]
+            raise KeyboardInterrupt
+
+        with mock.patch.object(extraction_service, "CheckpointedWriter",
+                               functools.partial(CheckpointedWriter, every_files=1)):
+            with mock.patch.object(extraction_service, "iter_source_files", interrupted):
+                with self.assertRaises(KeyboardInterrupt):
+                    extract_data_from_division(source, "file", dest)
+            self.assertFalse((dest / "unprocessed_dataset.jsonl").exists())
+
+            with mock.patch.object(CheckpointedWriter, "write", autospec=True,
+                                   side_effect=CheckpointedWriter.write) as write:
+                dataset = extract_data_from_division(source, "file", dest)
+
+        rewritten = sorted(json.loads(call.args[1])["filename"] for call in write.call_args_list)
+        self.assertEqual(rewritten, ["D.java", "E.java"])
+        with open(dataset) as f:
+            self.assertEqual(sorted(json.loads(line)["filename"] for line in f),
+                             ["A.java", "B.java", "C.java", "D.java", "E.java"])
+
+    def test_extraction_commits_only_the_dataset(self):
+        source = self.base_dir / "source"
+        source.mkdir()
+        for name in ["A.java", "B.java"]:
+            (source / name).write_text(f"class {name[0]} {{}}")
+        dest = self.base_dir / "divisioned"
+        dataset = extract_data_from_division(source, "file", dest)
+        with open(dataset) as f:
+            self.assertEqual(sorted(json.loads(line)["filename"] for line in f), ["A.java", "B.java"])
+        self.assertEqual(sorted(p.name for p in dest.iterdir()), ["skip_report.jsonl", "unprocessed_dataset.jsonl"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from src.services import dataset_processing_service
+from src.services.dataset_processing_service import process_dataset, split_byte_ranges
+
+
+class TestParallelDatasetProcessing(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+        self.input_file = self.base_dir / "unprocessed_dataset.jsonl"
+        with self.input_file.open("w", encoding="utf-8") as f:
+            for i in range(500):
+                name = ["getId", "setId", "toString", f"solve{i}"][i % 4]
+                f.write(json.dumps({"filepath": f"s{i}/Main.java", "method": {"name": name, "content": "é" * (i % 7)}}) + "\n")
+                if i % 97 == 0:
+                    f.write("not json\n")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read(self, path):
+        return Path(path).read_bytes()
+
+    def test_ranges_are_newline_aligned_and_cover_the_file(self):
+        with mock.patch.object(dataset_processing_service, "MIN_RANGE_BYTES", 1024):
+            ranges = split_byte_ranges(self.input_file, 8)
+        data = self.input_file.read_bytes()
+        self.assertGreater(len(ranges), 1)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], len(data))
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(data[start - 1:start], b"\n")
+
+    def test_parallel_output_matches_serial(self):
+        for filter_tuple in [("out", ["getId", "setId"]), ("in", ["toString"])]:
+            serial = process_dataset(self.input_file, "method", filter_tuple, self.base_dir / "serial")
+            with mock.patch.object(dataset_processing_service, "MIN_RANGE_BYTES", 1024):
+                parallel = process_dataset(self.input_file, "method", filter_tuple, self.base_dir / "parallel", workers=4)
+            self.assertEqual(self.read(serial), self.read(parallel))
+            self.assertEqual(list((self.base_dir / "parallel").iterdir()), [Path(parallel)])
+
+    def test_invalid_division_is_rejected_up_front(self):
+        with self.assertRaises(ValueError):
+            process_dataset(self.input_file, "line", ("in", []), self.base_dir / "out", workers=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
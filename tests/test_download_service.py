@@ -0,0 +1,50 @@
+import gzip
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from src.services import fingerprint_service
+from src.services.download_service import prepare_download, negotiate_encoding
+
+
+class TestDownloadService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+        self.dataset = self.base_dir / "data" / "processed_dataset.jsonl"
+        self.dataset.parent.mkdir()
+        self.dataset.write_text('{"filepath": "A.java"}\n' * 100)
+        self.cache_dir = self.base_dir / "downloads"
+        hashes = mock.patch.object(fingerprint_service, "HASH_CACHE_DIR", str(self.base_dir / "hashes"))
+        hashes.start()
+        self.addCleanup(hashes.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_negotiate_encoding(self):
+        self.assertEqual(negotiate_encoding("gzip, deflate"), "gzip")
+        self.assertIsNone(negotiate_encoding("gzip;q=0, identity"))
+        self.assertIsNone(negotiate_encoding(None))
+
+    def test_etag_follows_content_and_variants_are_reused(self):
+        path, encoding, etag = prepare_download(self.dataset, cache_dir=self.cache_dir)
+        self.assertEqual((path, encoding), (self.dataset, None))
+
+        gz_path, encoding, gz_etag = prepare_download(self.dataset, "gzip", self.cache_dir)
+        self.assertEqual((encoding, gz_etag), ("gzip", f"{etag}-gz"))
+        self.assertEqual(gzip.decompress(gz_path.read_bytes()), self.dataset.read_bytes())
+        mtime = gz_path.stat().st_mtime_ns
+        self.assertEqual(prepare_download(self.dataset, "gzip", self.cache_dir)[0].stat().st_mtime_ns, mtime)
+
+        self.dataset.write_text('{"filepath": "B.java"}\n')
+        new_gz_path, _, new_gz_etag = prepare_download(self.dataset, "gzip", self.cache_dir)
+        self.assertNotEqual(new_gz_etag, gz_etag)
+        self.assertFalse(gz_path.exists())
+        # Variants and hashes live in the caches, not next to the dataset
+        self.assertEqual([p.name for p in self.dataset.parent.iterdir()], [self.dataset.name])
+        self.assertTrue(new_gz_path.is_relative_to(self.cache_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
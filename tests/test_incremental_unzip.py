@@ -0,0 +1,101 @@
+import os
+import shutil
+import zipfile
+import tempfile
+import unittest
+from pathlib import Path
+from src.services.unzip_service import recursive_unzip, manifest_path
+
+
+class TestIncrementalUnzip(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+        self.zip_path = self.base_dir / "export.zip"
+        self.destination = self.base_dir / "unzipped"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_zip(self, members):
+        with zipfile.ZipFile(self.zip_path, "w") as zf:
+            for name, data in members.items():
+                zf.writestr(name, data)
+
+    def test_only_changed_members_are_extracted_and_stale_ones_removed(self):
+        self.write_zip({"alice/Main.java": "class Main {}", "bob/Main.java": "class Main {}", "old/Gone.java": "x"})
+        first = {}
+        recursive_unzip([self.zip_path], self.destination, incremental=True, stats=first)
+        self.assertEqual(first, {"extracted": 3})
+        self.assertTrue(manifest_path(self.destination).exists())
+
+        untouched = self.destination / "export" / "alice" / "Main.java"
+        mtime = untouched.stat().st_mtime_ns
+        self.write_zip({"alice/Main.java": "class Main {}", "bob/Main.java": "class Main { int x; }"})
+        second = {}
+        files = recursive_unzip([self.zip_path], self.destination, incremental=True, stats=second)
+
+        self.assertEqual(second, {"unchanged": 1, "extracted": 1, "removed": 1})
+        self.assertEqual(len(files), 2)
+        self.assertEqual(untouched.stat().st_mtime_ns, mtime)
+        self.assertEqual((self.destination / "export" / "bob" / "Main.java").read_text(), "class Main { int x; }")
+        self.assertFalse((self.destination / "export" / "old").exists())
+
+    def test_incremental_run_cleans_up_after_a_full_extraction(self):
+        self.write_zip({"a/Old.java": "x"})
+        recursive_unzip([self.zip_path], self.destination, incremental=True)
+        shutil.rmtree(self.destination)
+        self.write_zip({"b/Full.java": "y"})
+        recursive_unzip([self.zip_path], self.destination)
+        self.write_zip({"c/New.java": "z"})
+        stats = {}
+        recursive_unzip([self.zip_path], self.destination, incremental=True, stats=stats)
+        self.assertEqual(stats, {"extracted": 1, "removed": 1})
+        files = sorted(p.relative_to(self.destination).as_posix() for p in self.destination.rglob("*") if p.is_file())
+        self.assertEqual(files, ["export/c/New.java"])
+
+    def test_full_extraction_rewrites_every_member(self):
+        self.write_zip({"alice/Main.java": "class Main {}"})
+        recursive_unzip([self.zip_path], self.destination)
+        target = self.destination / "export" / "alice" / "Main.java"
+        os.utime(target, ns=(0, 0))
+
+        stats = {}
+        recursive_unzip([self.zip_path], self.destination, stats=stats)
+        self.assertEqual(stats, {"extracted": 1})
+        self.assertNotEqual(target.stat().st_mtime_ns, 0)
+
+    def test_existing_files_are_verified_by_crc_without_a_manifest(self):
+        self.write_zip({"alice/Main.java": "class Main {}"})
+        recursive_unzip([self.zip_path], self.destination)
+        target = self.destination / "export" / "alice" / "Main.java"
+        os.utime(target, ns=(0, 0))
+
+        stats = {}
+        recursive_unzip([self.zip_path], self.destination, incremental=True, stats=stats)
+        self.assertEqual(stats, {"unchanged": 1})
+        self.assertEqual(target.stat().st_mtime_ns, 0)
+
+        target.write_text("class Main {} ")
+        stats = {}
+        recursive_unzip([self.zip_path], self.destination, incremental=True, stats=stats)
+        self.assertEqual(stats, {"extracted": 1})
+        self.assertEqual(target.read_text(), "class Main {}")
+
+    def test_removed_nested_archive_takes_its_contents_along(self):
+        inner = self.base_dir / "inner.zip"
+        with zipfile.ZipFile(inner, "w") as zf:
+            zf.writestr("src/Visitor.java", "class Visitor {}")
+        self.write_zip({"carol.zip": inner.read_bytes(), "alice/Main.java": "class Main {}"})
+        recursive_unzip([self.zip_path], self.destination, incremental=True)
+        self.assertTrue((self.destination / "export" / "carol" / "src" / "Visitor.java").exists())
+
+        self.write_zip({"alice/Main.java": "class Main {}"})
+        stats = {}
+        recursive_unzip([self.zip_path], self.destination, incremental=True, stats=stats)
+        self.assertEqual(stats, {"unchanged": 1, "removed": 2})
+        self.assertFalse((self.destination / "export" / "carol" / "src").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import json
+import time
+import zipfile
+import tempfile
+import unittest
+from pathlib import Path
+from src.services.ingestion_service import (
+    ingest_archive, scan_ready_archives, watch_and_ingest, acquire_watcher_lock, watcher_running
+)
+from src.services.symbol_index_service import query_symbols
+from src.services.stats_service import compute_dataset_stats
+from src.services.pii_scrub_service import pseudonym
+
+
+class TestIngestionService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+        self.config = {
+            "raw_dir": self.base_dir / "raw",
+            "unzipped_dir": self.base_dir / "unzipped",
+            "filtered_dir": self.base_dir / "file_filtered",
+            "dest_dir": self.base_dir / "divisioned",
+            "index_path": self.base_dir / "symbols.db",
+            "views_dir": self.base_dir / "views",
+            "division": "method",
+            "ext_filter": ("in", [".java"]),
+            "name_filter": ("out", ["Main.java"]),
+            "scrub_pii": False,
+        }
+        self.config["raw_dir"].mkdir()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_submission(self, name, method):
+        path = self.config["raw_dir"] / f"{name}.zip"
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("src/Visitor.java", f"class Visitor {{ int {method}() {{ return 1; }} }}")
+            zf.writestr("src/Main.java", "class Main { void main() { } }")
+            zf.writestr("notes.txt", "ignored")
+        return path
+
+    def read_dataset(self):
+        with (self.config["dest_dir"] / "unprocessed_dataset.jsonl").open() as f:
+            return [json.loads(line) for line in f]
+
+    def test_archives_are_appended_and_replaced(self):
+        ingest_archive(self.make_submission("alice", "visit"), self.config)
+        ingest_archive(self.make_submission("bob", "visit"), self.config)
+        records = self.read_dataset()
+        self.assertEqual([r["filepath"] for r in records], ["alice/src/Visitor.java", "bob/src/Visitor.java"])
+        # The name filter only narrows the selection; filtered files stay on disk
+        self.assertTrue((self.config["filtered_dir"] / "alice" / "src" / "Main.java").exists())
+
+        summary = ingest_archive(self.make_submission("alice", "score"), self.config)
+        self.assertEqual(summary["records"], 1)
+        names = sorted((r["filepath"], r["method"]["name"]) for r in self.read_dataset())
+        self.assertEqual(names, [("alice/src/Visitor.java", "score"), ("bob/src/Visitor.java", "visit")])
+        self.assertEqual(len(query_symbols(self.config["index_path"], name="Visitor.visit")), 1)
+
+    def test_records_carry_the_archive_as_submission(self):
+        ingest_archive(self.make_submission("alice", "visit"), self.config)
+        self.assertEqual([r["submission"] for r in self.read_dataset()], ["alice"])
+        symbols = query_symbols(self.config["index_path"], name="Visitor.visit")
+        self.assertEqual([s["submission"] for s in symbols], ["alice"])
+        stats = compute_dataset_stats(self.config["dest_dir"] / "unprocessed_dataset.jsonl")
+        self.assertEqual(stats["submissions"]["records"], {"alice": 1})
+
+    def test_scrubbed_archives_are_replaced_under_their_pseudonym(self):
+        self.config["scrub_pii"] = True
+        ingest_archive(self.make_submission("alice", "visit"), self.config)
+        ingest_archive(self.make_submission("alice", "score"), self.config)
+        records = self.read_dataset()
+        self.assertEqual([(r["filepath"], r["submission"]) for r in records],
+                         [(f"{pseudonym('alice')}/src/Visitor.java", pseudonym("alice"))])
+        self.assertEqual(query_symbols(self.config["index_path"], name="Visitor.visit"), [])
+
+    def test_scan_waits_for_archives_to_settle(self):
+        path = self.make_submission("carol", "visit")
+        ready, pending = scan_ready_archives(self.config["raw_dir"], {}, settle_seconds=60)
+        self.assertEqual((ready, pending), ([], [path]))
+
+        old = time.time() - 120
+        os.utime(path, (old, old))
+        ready, pending = scan_ready_archives(self.config["raw_dir"], {}, settle_seconds=60)
+        self.assertEqual([p for p, _ in ready], [path])
+        ready, _ = scan_ready_archives(self.config["raw_dir"], {path.name: ready[0][1]}, settle_seconds=60)
+        self.assertEqual(ready, [])
+
+    def test_watcher_holds_a_lock_while_running(self):
+        lock_file = self.base_dir / "watcher.lock"
+        self.assertFalse(watcher_running(lock_file))
+        lock = acquire_watcher_lock(lock_file)
+        try:
+            self.assertTrue(watcher_running(lock_file))
+            with self.assertRaises(RuntimeError):
+                watch_and_ingest(self.config, lock_file=lock_file, use_inotify=False)
+        finally:
+            lock.close()
+        self.assertFalse(watcher_running(lock_file))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from src.services.line_frequency_service import CountMinSketch
+from src.services.extraction_service import extract_data_from_division
+
+
+class TestLineFrequencyService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+        self.source = self.base_dir / "source"
+        for i in range(40):
+            path = self.source / "export" / f"student{i}" / "Main.java"
+            path.parent.mkdir(parents=True)
+            path.write_text(f"import java.util.*;\nclass Main {{\n    int score = {i};\n}}\n")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def extract_lines(self, **options):
+        dataset = extract_data_from_division(self.source, "line", self.base_dir / "out", **options)
+        with open(dataset) as f:
+            return [json.loads(line)["line"] for line in f]
+
+    def test_sketch_never_undercounts(self):
+        sketch = CountMinSketch(width=64, depth=3)
+        for i in range(500):
+            sketch.add(f"line {i % 50}")
+        self.assertTrue(all(sketch.estimate(f"line {i}") >= 10 for i in range(50)))
+
+    def test_drop_mode_removes_boilerplate_only(self):
+        lines = self.extract_lines(line_frequency_threshold=5)
+        self.assertEqual(len(lines), 40)
+        self.assertTrue(all(line.startswith("int score") for line in lines))
+
+    def test_sample_mode_keeps_a_few_copies(self):
+        lines = self.extract_lines(line_frequency_threshold=5, line_sampling="sample")
+        self.assertEqual(sum(1 for line in lines if line.startswith("int score")), 40)
+        self.assertLess(lines.count("}"), 20)
+        self.assertGreater(lines.count("}"), 0)
+        self.assertEqual(lines, self.extract_lines(line_frequency_threshold=5, line_sampling="sample"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import time
+import tempfile
+import unittest
+from pathlib import Path
+from src.services.parse_worker_service import ParseWorkerPool
+
+
+def slow_or_fast_parse(file_path):
+    # Module-level so it can be handed to worker processes
+    if file_path.name.startswith("slow"):
+        time.sleep(30)
+    if file_path.name.startswith("bad"):
+        raise ValueError("unparseable")
+    return {"name": file_path.name}
+
+
+class TestParseWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+        self.files = []
+        for name in ["a.java", "slow.java", "bad.java", "b.java"]:
+            path = self.base_dir / name
+            path.write_text("class A {}")
+            self.files.append(path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_timeouts_are_reported_and_order_is_kept(self):
+        start = time.monotonic()
+        with ParseWorkerPool(slow_or_fast_parse, workers=2, timeout=1) as pool:
+            results = list(pool.imap(self.files))
+        self.assertLess(time.monotonic() - start, 10)
+
+        self.assertEqual([r[0] for r in results], self.files)
+        statuses = [r[1] for r in results]
+        self.assertEqual(statuses, ["ok", "timeout", "error", "ok"])
+        self.assertEqual(results[0][2], {"name": "a.java"})
+
+    def test_pool_recovers_after_timeout(self):
+        with ParseWorkerPool(slow_or_fast_parse, workers=1, timeout=1) as pool:
+            results = list(pool.imap(self.files))
+        self.assertEqual(results[-1][1], "ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import tempfile
+import unittest
+from pathlib import Path
+from src.services.path_matcher_service import PathMatcher, compile_filter_list, walk_files
+from src.services.file_filtering_service import file_ext_filter
+from src.services.view_service import create_name_view
+
+
+class TestPathMatcherService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+        self.root = self.base_dir / "unzipped"
+        for rel_path in ["alice/src/Main.java", "alice/src/Shape.java", "alice/src/ShapeTest.java",
+                         "alice/README.md", "alice/target/classes/Shape.java", "alice/build/gen/Gen.java",
+                         "alice/.DS_Store", "alice/.git/config.java", "__MACOSX/alice/._Shape.java",
+                         "bob/app.py", "bob/notes.txt"]:
+            path = self.root / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(rel_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _tree(self, root):
+        return sorted(p.relative_to(root).as_posix() for p in root.rglob("*") if p.is_file())
+
+    def test_gitignore_semantics(self):
+        matcher = PathMatcher(["*.md", "target/", "/bob/*.txt", "src/**/*Test.java", "[ab]pp.py"])
+        self.assertTrue(matcher.match("alice/README.md"))
+        self.assertTrue(matcher.match("alice/target", is_dir=True))
+        self.assertFalse(matcher.match("alice/target"))  # Directory-only pattern
+        self.assertTrue(matcher.match("bob/notes.txt"))
+        self.assertFalse(matcher.match("alice/bob/notes.txt"))  # Anchored at the root
+        self.assertTrue(matcher.match("src/ShapeTest.java"))
+        self.assertTrue(matcher.match("src/a/b/ShapeTest.java"))
+        self.assertTrue(matcher.match("bob/app.py"))
+        self.assertTrue(matcher.match_path("alice/target/classes/Shape.java"))
+        self.assertFalse(matcher.match_path("alice/src/Shape.java"))
+        with self.assertRaises(ValueError):
+            PathMatcher(["!keep.java"])
+
+    def test_plain_entries_keep_their_meaning(self):
+        suffixes = compile_filter_list([".java", "*.md"], plain="suffixes")
+        self.assertTrue(suffixes.match("x/Shape.java"))
+        self.assertTrue(suffixes.match("README.md"))
+        self.assertFalse(suffixes.match("java", is_dir=True))
+        names = compile_filter_list(["Main.java"], plain="names")
+        self.assertTrue(names.match("a/Main.java"))
+        self.assertFalse(names.match("a/NotMain.java"))
+
+    def test_excluded_directories_are_never_descended(self):
+        visited = []
+        dropped = []
+        exclude = PathMatcher(["target/", "build/"])
+        for _, rel_path in walk_files(self.root, ignore=PathMatcher([".*", "_*"]), exclude=exclude,
+                                      on_drop=lambda path, is_dir: dropped.append((Path(path).name, is_dir))):
+            visited.append(rel_path)
+        self.assertEqual(sorted(dropped), [("build", True), ("target", True)])
+        self.assertFalse(any("target" in p or "build" in p or "MACOSX" in p or ".git" in p for p in visited))
+
+    def test_ext_filter_prunes_excluded_subtrees(self):
+        dest = self.base_dir / "filtered"
+        copied = file_ext_filter(self.root, [".java"], "in", dest, exclude=["target/", "build/"])
+        self.assertEqual(self._tree(dest), ["alice/src/Main.java", "alice/src/Shape.java", "alice/src/ShapeTest.java"])
+        self.assertEqual(copied, {"Main.java": 1, "Shape.java": 1, "ShapeTest.java": 1})
+
+    def test_name_view_drops_matching_subtrees_without_deleting(self):
+        before = self._tree(self.root)
+        view = create_name_view("names", self.root, ["Main.java", "*Test.java", "build/"], "out",
+                                views_dir=self.base_dir / "views")
+        self.assertEqual(self._tree(self.root), before)
+        self.assertNotIn("alice/src/Main.java", view["paths"])
+        self.assertNotIn("alice/src/ShapeTest.java", view["paths"])
+        self.assertFalse(any(p.startswith("alice/build/") for p in view["paths"]))
+        self.assertIn("alice/target/classes/Shape.java", view["paths"])
+        self.assertNotIn("alice/.git/config.java", view["paths"])  # Ignored entries are never selected
+
+
+if __name__ == "__main__":
+    unittest.main()
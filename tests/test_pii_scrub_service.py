@@ -0,0 +1,87 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from src.services.pii_scrub_service import (
+    AhoCorasick, PIIScrubber, load_roster, pseudonym, scrub_dataset_file, scrub_texts
+)
+from src.services.extraction_service import extract_data_from_division
+
+
+class TestPIIScrubService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+        self.roster = self.base_dir / "roster.csv"
+        self.roster.write_text("name,andrew_id,email\nJane Doe,jdoe,jane@example.org\nAl Li,ali,ali@example.org\n")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_automaton_finds_overlapping_patterns(self):
+        automaton = AhoCorasick(["he", "she", "his", "HERS"])
+        self.assertEqual(sorted(automaton.find_all("uShers")), [(1, 4), (2, 4), (2, 6)])
+
+    def test_scrubs_roster_and_patterns_on_word_boundaries(self):
+        scrubber = PIIScrubber(load_roster(self.roster))
+        text, redactions = scrubber.scrub(
+            "/** @author Someone Else */\n"
+            "// Andrew ID: xyz9, mail zed@andrew.cmu.edu\n"
+            "// reviewed by JDOE and Jane Doe; Doesn't matter, Alice keeps ali's code\n"
+        )
+        self.assertEqual(text, (
+            "/** @author [STUDENT] */\n"
+            "// Andrew ID: [ID], mail [EMAIL]\n"
+            "// reviewed by [STUDENT] and [STUDENT]; Doesn't matter, Alice keeps [STUDENT]'s code\n"
+        ))
+        self.assertEqual(redactions, 6)
+
+    def test_name_parts_do_not_corrupt_code(self):
+        self.roster.write_text("name,andrew_id,email\nMax Long,mlong,max@example.org\nJane Doe,jdoe,jane@example.org\n")
+        scrubber = PIIScrubber(load_roster(self.roster))
+        code = "long total = Math.max(a, b); Long boxed = total; String doe = jane;"
+        self.assertEqual(scrubber.scrub(code), (code, 0))
+        self.assertEqual(scrubber.scrub("// by max long, reviewed by Jane")[0], "// by [STUDENT], reviewed by [STUDENT]")
+
+    def test_id_label_needs_a_separator(self):
+        scrubber = PIIScrubber()
+        for text in ["// student id is fine", "// the student identifier", "// andrew id -> none"]:
+            self.assertEqual(scrubber.scrub(text), (text, 0))
+        self.assertEqual(scrubber.scrub("# Student ID = abc12")[0], "# Student ID = [ID]")
+
+    def test_dataset_scrub_keeps_order_and_pseudonymizes_filepaths(self):
+        dataset = self.base_dir / "dataset.jsonl"
+        with dataset.open("w") as f:
+            for i in range(50):
+                f.write(json.dumps({"filepath": f"export/jdoe/{i}.java", "method": {"name": f"m{i}", "content": "// jdoe"}}) + "\n")
+        stats = scrub_dataset_file(dataset, load_roster(self.roster), workers=2, chunk_lines=7)
+        self.assertEqual(stats, {"records": 50, "redactions": 50})
+        with dataset.open() as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([r["method"]["name"] for r in records], [f"m{i}" for i in range(50)])
+        self.assertEqual(records[3]["filepath"], f"export/{pseudonym('jdoe')}/3.java")
+        self.assertEqual(pseudonym("JDoe"), pseudonym("jdoe"))
+        self.assertEqual(records[3]["method"]["content"], "// [STUDENT]")
+
+        self.assertEqual(scrub_texts(["by jane@example.org", "Jane"], ["Jane"], workers=2), ["by [EMAIL]", "[STUDENT]"])
+
+    def test_extraction_scrubs_records(self):
+        source = self.base_dir / "source" / "export" / "jdoe"
+        source.mkdir(parents=True)
+        (source / "Main.java").write_text("/** @author Jane Doe */\nclass Main {\n    void run() { /* jdoe */ }\n}\n")
+        (source / "Huge.java").write_text("class Huge {}\n" + "// padding\n" * 100)
+        dataset = extract_data_from_division(self.base_dir / "source", "method", self.base_dir / "out",
+                                             workers=1, scrub_pii=True, roster_path=self.roster,
+                                             max_file_bytes=500)
+        with open(dataset) as f:
+            record = json.loads(f.readline())
+        self.assertEqual(record["method"]["content"], "{ /* [STUDENT] */ }")
+        self.assertEqual(record["filepath"], f"export/{pseudonym('jdoe')}/Main.java")
+        self.assertNotIn("jdoe", json.dumps(record))
+        skip_report = (self.base_dir / "out" / "skip_report.jsonl").read_text()
+        self.assertIn(f"export/{pseudonym('jdoe')}/Huge.java", skip_report)
+        self.assertNotIn("jdoe", skip_report)
+
+
+if __name__ == "__main__":
+    unittest.main()
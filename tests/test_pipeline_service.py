@@ -0,0 +1,85 @@
+import json
+import zipfile
+import tempfile
+import unittest
+from pathlib import Path
+from src.services.pipeline_service import run_pipeline, build_graph
+
+
+class TestPipelineService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+        raw = self.base_dir / "raw"
+        raw.mkdir()
+        with zipfile.ZipFile(raw / "export.zip", "w") as zf:
+            zf.writestr("alice/Main.java", "class Main { void main() { } }")
+            zf.writestr("alice/README.md", "readme")
+        self.cache_file = self.base_dir / "cache.json"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def spec(self, file_filter_list):
+        d = self.base_dir
+        return {"stages": {
+            "unzip": {"op": "unzip", "inputs": [str(d / "raw")], "outputs": [str(d / "unzipped")]},
+            "java": {"op": "file_ext_filter", "inputs": [str(d / "unzipped")], "outputs": [str(d / "java")],
+                     "params": {"filter_type": "in", "filter_list": [".java"]}},
+            "docs": {"op": "file_ext_filter", "inputs": [str(d / "unzipped")], "outputs": [str(d / "docs")],
+                     "params": {"filter_type": "in", "filter_list": file_filter_list}},
+            "files": {"op": "extraction", "inputs": [str(d / "java")], "outputs": [str(d / "divisioned")],
+                      "params": {"division": "file"}},
+        }}
+
+    def test_stages_are_cached_until_inputs_or_params_change(self):
+        results = run_pipeline(self.spec([".md"]), cache_file=self.cache_file, max_workers=2)
+        self.assertEqual({r["status"] for r in results.values()}, {"ran"})
+        with (self.base_dir / "divisioned" / "unprocessed_dataset.jsonl").open() as f:
+            self.assertEqual([json.loads(line)["filename"] for line in f], ["Main.java"])
+
+        results = run_pipeline(self.spec([".md", ".txt"]), cache_file=self.cache_file, max_workers=2)
+        statuses = {name: r["status"] for name, r in results.items()}
+        self.assertEqual(statuses, {"unzip": "cached", "java": "cached", "docs": "ran", "files": "cached"})
+
+    def test_name_filter_stage_selects_through_a_view(self):
+        d = self.base_dir
+        spec = self.spec([".md"])
+        with zipfile.ZipFile(d / "raw" / "export.zip", "a") as zf:
+            zf.writestr("alice/Shape.java", "class Shape { }")
+        spec["stages"]["names"] = {"op": "file_name_filter", "inputs": [str(d / "java")],
+                                   "outputs": [str(d / "views" / "no_main.json")],
+                                   "params": {"filter_type": "out", "filter_list": ["Main.java"]}}
+        spec["stages"]["files"]["inputs"].append(str(d / "views" / "no_main.json"))
+        results = run_pipeline(spec, cache_file=self.cache_file, max_workers=2)
+        self.assertEqual(results["names"], {"status": "ran", "result": 1, "seconds": results["names"]["seconds"]})
+        self.assertEqual(results["files"]["status"], "ran")
+        with (d / "divisioned" / "unprocessed_dataset.jsonl").open() as f:
+            self.assertEqual([json.loads(line)["filename"] for line in f], ["Shape.java"])
+        self.assertTrue((d / "java" / "export" / "alice" / "Main.java").exists())
+
+    def test_inputs_nested_under_an_output_depend_on_its_producer(self):
+        _, dependencies = build_graph({"stages": {
+            "methods": {"op": "extraction", "inputs": ["data/in"], "outputs": ["data/divisioned/method"],
+                        "params": {"division": "method"}},
+            "process": {"op": "process", "inputs": ["data/divisioned/method/unprocessed_dataset.jsonl"],
+                        "outputs": ["data/processed"]},
+            "sibling": {"op": "unzip", "inputs": ["data/divisioned/methods_old"], "outputs": ["data/x"]},
+        }})
+        self.assertEqual(dependencies, {"methods": set(), "process": {"methods"}, "sibling": set()})
+
+    def test_cycles_and_duplicate_outputs_are_rejected(self):
+        with self.assertRaises(ValueError):
+            build_graph({"stages": {
+                "a": {"op": "unzip", "inputs": ["x"], "outputs": ["y"]},
+                "b": {"op": "unzip", "inputs": ["y"], "outputs": ["x"]},
+            }})
+        with self.assertRaises(ValueError):
+            build_graph({"stages": {
+                "a": {"op": "unzip", "outputs": ["y"]},
+                "b": {"op": "unzip", "outputs": ["y"]},
+            }})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from src.services import process_cache_service, fingerprint_service
+from src.services.process_cache_service import cached_process_dataset, list_cache_entries, _directory_size
+
+
+class TestProcessCacheService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+        self.input_file = self.base_dir / "unprocessed_dataset.jsonl"
+        with self.input_file.open("w", encoding="utf-8") as f:
+            for name in ["getId", "setId", "solve", "toString"]:
+                f.write(json.dumps({"filepath": "s/Main.java", "method": {"name": name, "content": "{}"}}) + "\n")
+        self.destination = self.base_dir / "processed"
+        self.cache_dir = self.base_dir / "cache"
+        hashes = mock.patch.object(fingerprint_service, "HASH_CACHE_DIR", str(self.base_dir / "hashes"))
+        hashes.start()
+        self.addCleanup(hashes.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def process(self, filter_tuple, **kwargs):
+        return cached_process_dataset(self.input_file, "method", filter_tuple, self.destination,
+                                      cache_dir=self.cache_dir, **kwargs)
+
+    def names(self, path):
+        with open(path) as f:
+            return [json.loads(line)["method"]["name"] for line in f]
+
+    def test_equivalent_filters_hit_the_cache(self):
+        path, hit = self.process(("out", ["setId", "getId"]))
+        self.assertFalse(hit)
+        self.assertEqual(self.names(path), ["solve", "toString"])
+
+        with mock.patch.object(process_cache_service, "process_dataset") as process_dataset:
+            path, hit = self.process(("out", ["getId", "setId", "getId"]))
+            process_dataset.assert_not_called()
+        self.assertTrue(hit)
+        self.assertEqual(path, self.destination / "processed_dataset.jsonl")
+        self.assertEqual(self.names(path), ["solve", "toString"])
+
+    def test_repeated_hits_republish_cleanly(self):
+        for _ in range(3):
+            path, _ = self.process(("out", ["getId"]))
+            self.assertEqual(self.names(path), ["setId", "solve", "toString"])
+        self.assertEqual([p.name for p in self.destination.iterdir()], ["processed_dataset.jsonl"])
+
+    def test_results_live_side_by_side_and_follow_the_input(self):
+        self.process(("in", ["solve"]))
+        path, _ = self.process(("in", ["toString"]))
+        self.assertEqual(self.names(path), ["toString"])
+        path, hit = self.process(("in", ["solve"]))
+        self.assertTrue(hit)
+        self.assertEqual(self.names(path), ["solve"])
+
+        with self.input_file.open("a", encoding="utf-8") as f:
+            f.write(json.dumps({"filepath": "t/Main.java", "method": {"name": "solve", "content": "{ }"}}) + "\n")
+        path, hit = self.process(("in", ["solve"]))
+        self.assertFalse(hit)
+        self.assertEqual(self.names(path), ["solve", "solve"])
+
+    def test_least_recently_used_results_are_evicted(self):
+        self.process(("in", ["solve"]))
+        self.process(("in", ["getId"]))
+        self.process(("in", ["solve"]))  # Refreshes the "solve" entry
+        entry_size = max(_directory_size(entry["path"]) for entry in list_cache_entries(self.cache_dir))
+        self.process(("in", ["setId"]), budget_bytes=2 * entry_size + 10)
+
+        kept = {json.loads((entry["path"] / "meta.json").read_text())["filter_list"][0]
+                for entry in list_cache_entries(self.cache_dir)}
+        self.assertEqual(kept, {"solve", "setId"})
+
+    def test_crashed_builds_are_never_served_and_get_swept(self):
+        def crash(input_filepath, dataset_division, filter_tuple, destination_folder, **kwargs):
+            Path(destination_folder).mkdir(parents=True)
+            (Path(destination_folder) / "processed_dataset.jsonl").write_text("partial")
+            raise KeyboardInterrupt
+
+        with mock.patch.object(process_cache_service, "process_dataset", side_effect=crash):
+            with self.assertRaises(KeyboardInterrupt):
+                self.process(("in", ["solve"]))
+        self.assertEqual(list(self.cache_dir.iterdir()), [])
+
+        orphan = self.cache_dir / ".killed.tmp"  # A build whose process was killed outright
+        orphan.mkdir()
+        os.utime(orphan, (0, 0))
+        recent = self.cache_dir / ".in_progress.tmp"
+        recent.mkdir()
+        path, hit = self.process(("in", ["solve"]))
+        self.assertFalse(hit)
+        self.assertEqual(self.names(path), ["solve"])
+        self.assertFalse(orphan.exists())
+        self.assertTrue(recent.exists())
+        self.assertEqual(len(list_cache_entries(self.cache_dir)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
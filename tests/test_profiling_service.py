@@ -0,0 +1,82 @@
+import time
+import pstats
+import cProfile
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from src.services.parse_worker_service import ParseWorkerPool
+from src.services.profiling_service import RequestProfile, list_profiles, profile_path
+from src.services.dataset_processing_service import process_dataset
+from src.services.pii_scrub_service import scrub_texts
+
+
+def count_words(file_path):
+    # Module-level so it can be handed to worker processes
+    return len(file_path.read_text().split())
+
+
+class TestProfilingService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+        self.profile_root = self.base_dir / "profiles"
+        self.file = self.base_dir / "A.java"
+        self.file.write_text("class A { }")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_profile_includes_pool_worker_work(self):
+        profile = RequestProfile(self.profile_root)
+        profile.start()
+        with ParseWorkerPool(count_words, workers=1) as pool:
+            results = list(pool.imap([self.file]))
+        meta = profile.stop({"path": "/api/dataset/extraction"})
+
+        self.assertEqual(results[0][2], 4)
+        self.assertEqual(meta["worker_profiles"], 1)
+        self.assertEqual([p["profile_id"] for p in list_profiles(self.profile_root)], [profile.profile_id])
+
+        stats = pstats.Stats(str(profile_path(profile.profile_id, self.profile_root)))
+        profiled_functions = {name for _, _, name in stats.stats}
+        self.assertIn("count_words", profiled_functions)
+
+    def test_close_waits_for_slow_worker_dumps(self):
+        dump_stats = cProfile.Profile.dump_stats
+
+        def slow_dump(profiler, path):
+            time.sleep(2)
+            dump_stats(profiler, path)
+
+        profile = RequestProfile(self.profile_root)
+        profile.start()
+        # Forked workers inherit the patch
+        with mock.patch.object(cProfile.Profile, "dump_stats", slow_dump):
+            with ParseWorkerPool(count_words, workers=1) as pool:
+                list(pool.imap([self.file]))
+        meta = profile.stop()
+        self.assertEqual(meta["worker_profiles"], 1)
+
+    def test_profile_includes_filter_and_scrub_pool_work(self):
+        dataset = self.base_dir / "dataset.jsonl"
+        dataset.write_text('{"filepath": "s/A.java", "method": {"name": "run", "content": "{}"}}\n')
+        profile = RequestProfile(self.profile_root)
+        profile.start()
+        process_dataset(dataset, "method", ("out", ["getId"]), self.base_dir / "processed", workers=2)
+        scrub_texts(["by jane@example.org"], workers=2)
+        meta = profile.stop()
+
+        self.assertGreaterEqual(meta["worker_profiles"], 2)
+        stats = pstats.Stats(str(profile_path(profile.profile_id, self.profile_root)))
+        profiled_functions = {name for _, _, name in stats.stats}
+        self.assertIn("filter_byte_range", profiled_functions)
+        self.assertIn("_scrub_texts", profiled_functions)
+
+    def test_unknown_or_unsafe_ids_are_not_found(self):
+        self.assertIsNone(profile_path("missing", self.profile_root))
+        self.assertIsNone(profile_path("../etc", self.profile_root))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from src.services.extraction_service import parse_java_file, parse_python_file
+from src.services.dataset_processing_service import process_dataset
+
+JAVA_SOURCE = """public class Account {
+    private int balance;
+    public int getBalance() { return balance; }
+    public void setBalance(int balance) { this.balance = balance; }
+    public int settle(int[] amounts) {
+        // Sum positive amounts
+        int total = 0;
+        for (int amount : amounts) {
+            if (amount > 0 && amount < 1000) { total += amount; }
+            else if (amount > 5000) { while (total > 0) { total--; } }
+        }
+        String note = "// not a comment";
+        return total > 10 ? total : 0;
+    }
+}
+"""
+
+PYTHON_SOURCE = '''class Account:
+    def get_balance(self):
+        """Returns the balance."""
+        return self.balance
+
+    def settle(self, amounts):
+        total = 0  # running total
+        for amount in amounts:
+            if amount > 0 or amount is None:
+                total += amount
+            elif amount > 5000:
+                with open("log") as f:
+                    f.write(str(amount))
+        return total
+'''
+
+
+class TestQualityService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def parse(self, name, source, parse_fn):
+        path = self.base_dir / name
+        path.write_text(source)
+        return parse_fn(path)
+
+    def test_java_features(self):
+        parsed = self.parse("Account.java", JAVA_SOURCE, parse_java_file)
+        methods = {method["name"]: method["features"] for method in parsed["methods"]}
+        self.assertTrue(methods["getBalance"]["is_trivial"])
+        self.assertTrue(methods["setBalance"]["is_trivial"])
+        settle = methods["settle"]
+        self.assertFalse(settle["is_trivial"])
+        self.assertEqual(settle["cyclomatic_complexity"], 7)  # for, if, &&, else if, while, ?: + 1
+        self.assertEqual(settle["nesting_depth"], 3)  # for > if/else if > while
+        self.assertEqual(settle["line_count"], 10)
+        self.assertEqual(settle["comment_ratio"], 0.1)
+        self.assertGreater(settle["token_count"], 40)
+        self.assertFalse(parsed["classes"][0]["features"]["is_trivial"])
+
+    def test_python_features(self):
+        parsed = self.parse("account.py", PYTHON_SOURCE, parse_python_file)
+        methods = {method["name"]: method for method in parsed["methods"]}
+        self.assertEqual(methods["settle"]["class"], "Account")
+        self.assertTrue(methods["get_balance"]["features"]["is_trivial"])
+        settle = methods["settle"]["features"]
+        self.assertEqual(settle["cyclomatic_complexity"], 5)  # for, if, or, elif + 1
+        self.assertEqual(settle["nesting_depth"], 3)  # for > if/elif > with
+        self.assertEqual(settle["line_count"], 9)
+        self.assertEqual(settle["comment_ratio"], round(1 / 9, 4))
+
+    def test_process_dataset_filters_on_thresholds(self):
+        parsed = self.parse("Account.java", JAVA_SOURCE, parse_java_file)
+        dataset = self.base_dir / "unprocessed_dataset.jsonl"
+        with dataset.open("w") as f:
+            for method in parsed["methods"]:
+                f.write(json.dumps({"filepath": "s/Account.java", "method": method}) + "\n")
+            f.write(json.dumps({"filepath": "s/Old.java", "method": {"name": "legacy", "content": "{}"}}) + "\n")
+
+        thresholds = {"is_trivial": {"max": 0}, "cyclomatic_complexity": {"min": 2}}
+        for workers in (None, 2):
+            output = process_dataset(dataset, "method", ("out", []), self.base_dir / f"out{workers}",
+                                     workers=workers, feature_thresholds=thresholds)
+            with open(output) as f:
+                self.assertEqual([json.loads(line)["method"]["name"] for line in f], ["settle"])
+
+        with self.assertRaises(ValueError):
+            process_dataset(dataset, "method", ("out", []), self.base_dir / "bad", feature_thresholds={"size": {"min": 1}})
+        with self.assertRaises(ValueError):
+            process_dataset(dataset, "file", ("out", []), self.base_dir / "bad", feature_thresholds={"line_count": {"min": 1}})
+
+
+if __name__ == "__main__":
+    unittest.main()
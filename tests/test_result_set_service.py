@@ -0,0 +1,47 @@
+import tempfile
+import unittest
+from pathlib import Path
+from src.services.result_set_service import (
+    store_result_set, summarize_result_set, list_result_files, iter_tree_files
+)
+
+
+class TestResultSetService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+        self.db_path = self.base_dir / "result_sets.db"
+        self.root = self.base_dir / "file_filtered"
+        for submission in ["alice", "bob"]:
+            for name in ["A.java", "B.java", "README.md"]:
+                path = self.root / "export" / submission / name
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text("x" * 10)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_summary_counts_by_extension_and_submission(self):
+        result_id = store_result_set("fileext", iter_tree_files(self.root), self.root, self.db_path)
+        summary = summarize_result_set(result_id, self.db_path)
+        self.assertEqual(summary["total_files"], 6)
+        self.assertEqual(summary["total_bytes"], 60)
+        self.assertEqual(summary["by_extension"][".java"], {"files": 4, "bytes": 40})
+        self.assertEqual(summary["by_submission"]["bob"], {"files": 3, "bytes": 30})
+
+    def test_cursor_pagination_visits_every_file_once(self):
+        result_id = store_result_set("fileext", iter_tree_files(self.root), self.root, self.db_path)
+        seen, cursor = [], None
+        while True:
+            page = list_result_files(result_id, cursor=cursor, limit=4, db_path=self.db_path)
+            seen.extend(f["path"] for f in page["files"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(len(seen), 6)
+        self.assertEqual(seen[0], "export/alice/A.java")
+        self.assertIsNone(list_result_files("missing", db_path=self.db_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from src.services import fingerprint_service
+from src.services.stats_service import compute_dataset_stats, dataset_stats
+
+
+class TestStatsService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+        self.dataset = self.base_dir / "unprocessed_dataset.jsonl"
+        hashes = mock.patch.object(fingerprint_service, "HASH_CACHE_DIR", str(self.base_dir / "hashes"))
+        hashes.start()
+        self.addCleanup(hashes.stop)
+        records = [
+            {"filepath": "export/alice/Main.java", "method": {"name": "getId", "content": "int getId() {\n  return id;\n}"}},
+            {"filepath": "export/bob/Main.java", "method": {"name": "getId", "content": "int getId() {\n  return id;\n}"}},
+            {"filepath": "export/bob/Main.java", "method": {"name": "solve", "content": "void solve() {}"}},
+            {"filepath": "export/carol/Main.java", "class": {"name": "Main", "content": "class Main {}"}},
+        ]
+        with self.dataset.open("w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+            f.write("{truncated\n")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_counts_distributions_and_duplicates(self):
+        stats = compute_dataset_stats(self.dataset, batch_size=2)
+        self.assertEqual(stats["records"], 4)
+        self.assertEqual(stats["invalid_lines"], 1)
+        self.assertEqual(stats["divisions"], {"method": 3, "class": 1})
+        self.assertEqual(stats["submissions"]["records"], {"alice": 1, "bob": 2, "carol": 1})
+        self.assertEqual(stats["line_count"]["max"], 3)
+        self.assertEqual(stats["line_count"]["percentiles"]["p50"], 2.0)
+        self.assertEqual(sum(stats["content_length"]["histogram"]["counts"]), 4)
+        self.assertEqual(stats["top_names"][0], {"name": "getId", "count": 2})
+        self.assertEqual(stats["duplicates"]["by_division"]["method"]["unique"], 2)
+        self.assertEqual(stats["duplicates"]["overall"]["duplicate_rate"], 0.25)
+
+    def test_report_is_cached_by_content_hash(self):
+        cache_dir = self.base_dir / "stats"
+        first = dataset_stats(self.dataset, cache_dir)
+        second = dataset_stats(self.dataset, cache_dir)
+        self.assertFalse(first["cached"])
+        self.assertTrue(second["cached"])
+        self.assertEqual(first["sha256"], second["sha256"])
+
+        with self.dataset.open("a", encoding="utf-8") as f:
+            f.write(json.dumps({"filepath": "export/dave/Main.java", "filename": "Main.java", "content": "x"}) + "\n")
+        third = dataset_stats(self.dataset, cache_dir)
+        self.assertFalse(third["cached"])
+        self.assertEqual(third["divisions"]["file"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
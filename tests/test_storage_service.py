@@ -0,0 +1,62 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from src.services.storage_service import LocalStorage, S3Storage, LocalBucketClient
+from src.services.dataset_processing_service import process_dataset
+
+
+class TestStorageService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+        self.client = LocalBucketClient(self.base_dir / "bucket-root")
+        # Tiny parts so a small payload exercises the concurrent multipart path
+        self.s3 = S3Storage("datasets", prefix="course", client=self.client, part_size=16, max_concurrency=3)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_multipart_upload_round_trip(self):
+        source = self.base_dir / "dataset.jsonl"
+        lines = [json.dumps({"i": i, "content": "x" * i}) + "\n" for i in range(50)]
+        source.write_text("".join(lines))
+
+        uri = self.s3.upload_file(source, "data/divisioned/dataset.jsonl")
+        self.assertEqual(uri, "s3://datasets/course/data/divisioned/dataset.jsonl")
+        self.assertTrue(self.s3.exists("data/divisioned/dataset.jsonl"))
+        self.assertEqual(self.s3.list("data"), ["data/divisioned/dataset.jsonl"])
+        with self.s3.open_read("data/divisioned/dataset.jsonl", encoding="utf-8") as f:
+            self.assertEqual(list(f), lines)
+        self.assertEqual(list((self.base_dir / "bucket-root" / ".multipart").iterdir()), [])
+
+    def test_failed_write_is_aborted(self):
+        with self.assertRaises(RuntimeError):
+            with self.s3.open_write("partial.jsonl", encoding="utf-8") as f:
+                f.write("y" * 100)
+                raise RuntimeError("boom")
+        self.assertFalse(self.s3.exists("partial.jsonl"))
+
+    def test_process_dataset_reads_and_writes_through_storage(self):
+        records = [{"filepath": "A.java", "method": {"name": name, "content": "{}"}} for name in ["getId", "run"]]
+        with self.s3.open_write("data/divisioned/unprocessed_dataset.jsonl", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+
+        uri = process_dataset("data/divisioned/unprocessed_dataset.jsonl", "method", ("out", ["getId"]),
+                              "data/processed", storage=self.s3)
+        self.assertEqual(uri, "s3://datasets/course/data/processed/processed_dataset.jsonl")
+        with self.s3.open_read("data/processed/processed_dataset.jsonl", encoding="utf-8") as f:
+            self.assertEqual([json.loads(line)["method"]["name"] for line in f], ["run"])
+
+    def test_local_storage_write_is_atomic(self):
+        local = LocalStorage(self.base_dir)
+        with self.assertRaises(RuntimeError):
+            with local.open_write("out/file.txt", encoding="utf-8") as f:
+                f.write("partial")
+                raise RuntimeError("boom")
+        self.assertEqual(list((self.base_dir / "out").iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
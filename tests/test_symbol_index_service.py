@@ -0,0 +1,53 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from src.services.symbol_index_service import index_dataset_file, query_symbols
+
+
+class TestSymbolIndexService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+        self.db_path = self.base_dir / "symbols.db"
+        self.dataset = self.base_dir / "unprocessed_dataset.jsonl"
+        records = [
+            {"filepath": "export/alice/Visitor.java",
+             "method": {"name": "calculateComplexity", "class": "Visitor", "content": "{ return depth + 1; }",
+                        "start_line": 3, "end_line": 5}},
+            {"filepath": "export/bob/Visitor.java",
+             "method": {"name": "calculateComplexity", "class": "Visitor", "content": "{ return 0; }",
+                        "start_line": 7, "end_line": 9}},
+            {"filepath": "export/bob/UserService.java",
+             "method": {"name": "getId", "class": "UserService", "content": "{ return id; }",
+                        "start_line": 2, "end_line": 2}},
+        ]
+        with self.dataset.open("w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_index_and_query(self):
+        self.assertEqual(index_dataset_file(self.dataset, "method", self.db_path), 3)
+
+        by_name = query_symbols(self.db_path, name="calculateComplexity")
+        self.assertEqual({s["submission"] for s in by_name}, {"alice", "bob"})
+        self.assertEqual(by_name[0]["qualified_name"], "Visitor.calculateComplexity")
+
+        by_pattern = query_symbols(self.db_path, pattern="*Service.*")
+        self.assertEqual([s["name"] for s in by_pattern], ["getId"])
+
+        by_content = query_symbols(self.db_path, content="depth")
+        self.assertEqual([s["filepath"] for s in by_content], ["export/alice/Visitor.java"])
+
+    def test_reindex_replaces_previous_symbols(self):
+        index_dataset_file(self.dataset, "method", self.db_path)
+        index_dataset_file(self.dataset, "method", self.db_path)
+        self.assertEqual(len(query_symbols(self.db_path, kind="method")), 3)
+        self.assertEqual(len(query_symbols(self.db_path, content="depth")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import io
+import tarfile
+import zipfile
+import tempfile
+import unittest
+from pathlib import Path
+from src.services.unzip_service import recursive_unzip, find_archives
+
+
+def add_tar_member(tf, name, data):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    tf.addfile(info, io.BytesIO(data))
+
+
+class TestTarIngestion(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+        self.destination = self.base_dir / "unzipped"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_tar_gz_matches_zip_layout(self):
+        zip_path = self.base_dir / "export.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr("alice/Main.java", "class Main {}")
+        tar_path = self.base_dir / "export2.tar.gz"
+        with tarfile.open(tar_path, "w:gz") as tf:
+            add_tar_member(tf, "alice/Main.java", b"class Main {}")
+            add_tar_member(tf, "../escape.txt", b"nope")
+
+        recursive_unzip([zip_path, tar_path], self.destination)
+
+        self.assertTrue((self.destination / "export" / "alice" / "Main.java").exists())
+        self.assertEqual((self.destination / "export2" / "alice" / "Main.java").read_text(), "class Main {}")
+        self.assertTrue((self.destination / "export2" / "escape.txt").exists())
+        self.assertFalse((self.destination / "escape.txt").exists())
+
+    def test_tar_nested_inside_zip(self):
+        inner = io.BytesIO()
+        with tarfile.open(fileobj=inner, mode="w:bz2") as tf:
+            add_tar_member(tf, "src/Visitor.java", b"class Visitor {}")
+        zip_path = self.base_dir / "course.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr("bob.tar.bz2", inner.getvalue())
+
+        self.assertEqual(find_archives(self.base_dir), [zip_path])
+        recursive_unzip([zip_path], self.destination)
+
+        self.assertTrue((self.destination / "course" / "bob" / "src" / "Visitor.java").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
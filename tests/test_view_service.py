@@ -0,0 +1,82 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from src.services.view_service import (
+    create_name_view, load_view, delete_view, delete_views_of, list_views, view_exists, view_files, view_file_counts
+)
+from src.services.extraction_service import extract_data_from_division
+
+
+class TestViewService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+        self.views_dir = self.base_dir / "views"
+        self.root = self.base_dir / "file_filtered"
+        for submission in ["alice", "bob"]:
+            for name in ["Main.java", "Shape.java", "README.md", ".hidden"]:
+                path = self.root / submission / name
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(f"// {submission} {name}\n")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _tree(self):
+        return sorted(p.relative_to(self.root).as_posix() for p in self.root.rglob("*") if p.is_file())
+
+    def test_view_selects_without_touching_base(self):
+        before = self._tree()
+        view = create_name_view("no_main", self.root, ["Main.java"], "out", views_dir=self.views_dir)
+        self.assertEqual(self._tree(), before)
+        self.assertEqual(sorted(view["paths"]),
+                         ["alice/README.md", "alice/Shape.java", "bob/README.md", "bob/Shape.java"])
+        self.assertEqual(view_file_counts(view), {"README.md": 2, "Shape.java": 2})
+        self.assertEqual(len(list(view_files(view))), 4)
+
+    def test_parent_views_compose_and_deleting_reverts(self):
+        create_name_view("no_main", self.root, ["Main.java"], "out", views_dir=self.views_dir)
+        child = create_name_view("java", None, ["Shape.java"], "in", parent="no_main", views_dir=self.views_dir)
+        self.assertEqual(sorted(child["paths"]), ["alice/Shape.java", "bob/Shape.java"])
+        self.assertEqual(child["base"], str(self.root))
+        self.assertEqual({v["name"] for v in list_views(self.views_dir)}, {"no_main", "java"})
+
+        self.assertTrue(delete_view("no_main", self.views_dir))
+        self.assertFalse(delete_view("no_main", self.views_dir))
+        self.assertEqual(len(load_view("java", self.views_dir)["paths"]), 2)
+        with self.assertRaises(ValueError):
+            load_view("no_main", self.views_dir)
+
+    def test_rebuilt_base_drops_its_views(self):
+        create_name_view("filename", self.root, ["Main.java"], "out", views_dir=self.views_dir)
+        other = self.base_dir / "other"
+        other.mkdir()
+        create_name_view("elsewhere", other, [], "out", views_dir=self.views_dir)
+        self.assertEqual(delete_views_of(self.root, self.views_dir), ["filename"])
+        self.assertFalse(view_exists("filename", self.views_dir))
+        self.assertTrue(view_exists("elsewhere", self.views_dir))
+
+        create_name_view("filename", self.root, ["Main.java"], "out", views_dir=self.views_dir)
+        create_name_view("alice", self.root / "alice", [], "out", views_dir=self.views_dir)
+        self.assertEqual(delete_views_of(self.root / "alice", self.views_dir), ["alice", "filename"])
+        self.assertEqual(delete_views_of(self.base_dir, self.views_dir), ["elsewhere"])
+
+    def test_invalid_names_and_filters_are_rejected(self):
+        with self.assertRaises(ValueError):
+            create_name_view("../escape", self.root, [], "out", views_dir=self.views_dir)
+        with self.assertRaises(ValueError):
+            create_name_view("ok", self.root, [], "maybe", views_dir=self.views_dir)
+        with self.assertRaises(ValueError):
+            create_name_view("ok", None, [], "in", parent="missing", views_dir=self.views_dir)
+
+    def test_extraction_reads_only_the_view(self):
+        view = create_name_view("shapes", self.root, ["Shape.java"], "in", views_dir=self.views_dir)
+        dataset = extract_data_from_division(self.root, "file", self.base_dir / "out", selection=view["paths"])
+        with open(dataset, "r", encoding="utf-8") as f:
+            filenames = sorted(json.loads(line)["filename"] for line in f)
+        self.assertEqual(filenames, ["Shape.java", "Shape.java"])
+
+
+if __name__ == "__main__":
+    unittest.main()